@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Hot Path Benchmarks
+===================
+
+Scaling benchmarks for the parser, duplicate detection, validation and
+navigation hot paths, run over the synthetic corpus at growing sizes.
+
+Each benchmark reports its best time per corpus size and a scaling exponent
+(slope of log time against log size: ~1.0 is linear, ~2.0 quadratic), so a
+change that turns a linear path quadratic shows up even when the small sizes
+still look fast. Results are written as JSON and can be compared with a
+previous run.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--sizes 100 1000 10000 100000] [--repeat 3]
+                                         [--only check_duplicate ...] [--json out.json]
+                                         [--compare baseline.json]
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import logging
+import platform
+import argparse
+import subprocess
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_laws, near_duplicate, render_text
+from enhanced_bridge_parser import LawParser, DatabaseManager, LAW_INSERT_BATCH_SIZE
+from supabase_integration import DuplicateDetector, LawDataValidator
+from law_navigation_system import LawCrossReferenceEngine
+from local_store import LocalStoreClient
+from stage_metrics import StageMetrics
+from reference_extractor import clear_reference_cache
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DUPLICATE_PROBES = 20
+CLICKABLE_TEXTS = 50
+EXPONENT_TOLERANCE = 0.25
+SLOWDOWN_TOLERANCE = 1.5
+
+
+def best_of(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def seeded_store(laws: List[Dict[str, Any]]) -> LocalStoreClient:
+    client = LocalStoreClient()
+    for start in range(0, len(laws), LAW_INSERT_BATCH_SIZE):
+        client.table('code_laws').insert(laws[start:start + LAW_INSERT_BATCH_SIZE], returning='minimal').execute()
+    return client
+
+
+def bench_extract_laws(laws: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    parser = LawParser()
+    text = render_text(laws)
+    extracted = parser.extract_laws_from_text(text, 'corpus.pdf', 1)
+    seconds = best_of(lambda: parser.extract_laws_from_text(text, 'corpus.pdf', 1), repeat, clear_reference_cache)
+    return {'items': len(laws), 'seconds': seconds, 'chars': len(text), 'extracted': len(extracted)}
+
+
+def bench_find_references(laws: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    parser = LawParser()
+    
+    def run():
+        for law in laws:
+            parser._find_references(law['content'], law['law_number'])
+    
+    # Cold cache: the memo would otherwise turn every repeat into dictionary lookups
+    seconds = best_of(run, repeat, clear_reference_cache)
+    found = sum(len(parser._find_references(law['content'], law['law_number'])) for law in laws)
+    return {'items': len(laws), 'seconds': seconds, 'references': found}
+
+
+def bench_categorize(laws: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    parser = LawParser()
+    
+    def run():
+        for law in laws:
+            parser._categorize_law(law['content'])
+    
+    return {'items': len(laws), 'seconds': best_of(run, repeat)}
+
+
+def bench_check_duplicate(laws: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    # Cost of one check against a corpus of the given size, averaged over a fixed set of probes.
+    # No limiter passed: the detector queries the store unpaced
+    detector = DuplicateDetector(seeded_store(laws))
+    rng = random.Random(len(laws))
+    probes = [near_duplicate(rng.choice(laws), rng) for _ in range(DUPLICATE_PROBES)]
+    
+    def run():
+        for probe in probes:
+            detector.check_duplicate(probe)
+    
+    seconds = best_of(run, repeat)
+    duplicates = sum(detector.check_duplicate(probe).is_duplicate for probe in probes)
+    return {'items': len(laws), 'seconds': seconds, 'probes': len(probes), 'duplicates': duplicates}
+
+
+def bench_clickable_text(laws: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    client = seeded_store(laws)
+    db_manager = DatabaseManager.__new__(DatabaseManager)
+    db_manager.client = client
+    db_manager.metrics = StageMetrics()
+    # No rate limiter: its pacing would hide the cost of the lookups themselves
+    db_manager.limiter = None
+    texts = [law['content'] for law in laws[-CLICKABLE_TEXTS:]]
+    
+    def run():
+        # A fresh engine per run, so every reference is resolved against the store again
+        engine = LawCrossReferenceEngine(db_manager)
+        for offset, text in enumerate(texts):
+            engine.create_clickable_text(text, -offset)
+    
+    client.reset_stats()
+    seconds = best_of(run, repeat, clear_reference_cache)
+    return {'items': len(laws), 'seconds': seconds, 'texts': len(texts),
+            'lookups_per_run': client.get_stats()['requests'] // repeat}
+
+
+def bench_validate(laws: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    validator = LawDataValidator()
+    
+    def run():
+        for law in laws:
+            validator.validate_law_data(law)
+    
+    return {'items': len(laws), 'seconds': best_of(run, repeat)}
+
+
+BENCHMARKS = {
+    'extract_laws_from_text': bench_extract_laws,
+    'find_references': bench_find_references,
+    'categorize_law': bench_categorize,
+    'check_duplicate': bench_check_duplicate,
+    'create_clickable_text': bench_clickable_text,
+    'validate_law_data': bench_validate,
+}
+
+
+def scaling_exponent(rows: List[Dict[str, Any]]) -> Optional[float]:
+    # Least-squares slope of log(seconds) against log(corpus size)
+    points = [(math.log(row['items']), math.log(row['seconds'])) for row in rows if row['seconds'] > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: List[int], repeat: int, names: List[str]) -> Dict[str, Any]:
+    corpus = generate_laws(max(sizes))
+    results = {name: [] for name in names}
+    
+    for size in sizes:
+        laws = corpus[:size]
+        for name in names:
+            row = BENCHMARKS[name](laws, repeat)
+            row['per_item_us'] = row['seconds'] / size * 1e6
+            results[name].append(row)
+            print(f"{name:>24} {size:>8} laws {row['seconds'] * 1000:>12.2f} ms {row['per_item_us']:>10.2f} µs/law")
+    
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': repeat
+        },
+        'results': results,
+        'scaling': {name: scaling_exponent(rows) for name, rows in results.items()}
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    regressions = []
+    
+    print(f"\nComparison with {baseline['meta'].get('revision') or 'baseline'}:")
+    for name, rows in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        
+        old_rows = {row['items']: row for row in baseline['results'][name]}
+        for row in rows:
+            old = old_rows.get(row['items'])
+            if old and old['seconds']:
+                ratio = row['seconds'] / old['seconds']
+                flag = '  <-- slower' if ratio > SLOWDOWN_TOLERANCE else ''
+                print(f"{name:>24} {row['items']:>8} laws {ratio:>8.2f}x{flag}")
+                if flag:
+                    regressions.append(f"{name} at {row['items']} laws is {ratio:.2f}x slower")
+        
+        old_exponent = baseline['scaling'].get(name)
+        new_exponent = current['scaling'].get(name)
+        if old_exponent is not None and new_exponent is not None and new_exponent - old_exponent > EXPONENT_TOLERANCE:
+            regressions.append(f"{name} scales as n^{new_exponent:.2f} (was n^{old_exponent:.2f})")
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot path scaling benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare with a previous JSON result and exit 1 on regressions')
+    args = parser.parse_args()
+    
+    # The modules under test log every store and detector load at INFO
+    logging.disable(logging.INFO)
+    
+    report = run_benchmarks(sorted(args.sizes), args.repeat, args.only or list(BENCHMARKS))
+    
+    print("\nScaling exponents (1.0 = linear in corpus size):")
+    for name, exponent in report['scaling'].items():
+        print(f"{name:>24} {'n/a' if exponent is None else f'{exponent:.2f}':>8}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f))
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
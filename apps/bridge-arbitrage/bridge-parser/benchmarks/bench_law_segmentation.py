@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Law Segmentation Benchmark
+==========================
+
+Before/after benchmark for LawParser.extract_laws_from_text segmentation.
+
+"Before" replays the legacy three-pass segmentation (one re.finditer per
+heading style, lazy DOTALL content, patterns recompiled on every call).
+"After" is the single-pass heading scan used by LawParser today.
+
+Usage:
+    python benchmarks/bench_law_segmentation.py [--sizes 50 200 800] [--repeat 5] [--json out.json]
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import os
+import sys
+import re
+import json
+import time
+import argparse
+from typing import List, Tuple, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_bridge_parser import LawParser
+
+LEGACY_LAW_PATTERNS = [
+    r'(?:Article|Art\.?)\s*(\d+(?:\.\d+)*)\s*[:\-]?\s*(.+?)(?=(?:Article|Art\.?)\s*\d+|$)',
+    r'(\d+(?:\.\d+)+)\s*[:\-]\s*(.+?)(?=\d+(?:\.\d+)+|$)',
+    r'(?:Law|Rule)\s*(\d+(?:[A-Z])?)\s*[:\-]?\s*(.+?)(?=(?:Law|Rule)\s*\d+|$)',
+]
+
+SENTENCES = [
+    "Le joueur fautif doit rectifier sa déclaration avant que son partenaire n'annonce.",
+    "The Director shall award an adjusted score when the non-offending side is damaged.",
+    "Une carte exposée devient une carte pénalisée lorsque le déclarant le demande.",
+    "A player may not look at the face of a card belonging to another player.",
+    "La marque est établie selon le barème en vigueur pour la compétition.",
+]
+
+
+def build_page(law_count: int, lines_per_law: int = 4) -> str:
+    lines = []
+    for index in range(1, law_count + 1):
+        style = index % 3
+        if style == 0:
+            lines.append(f"Article {index}.{index % 7 + 1} : Dispositions générales {index}")
+        elif style == 1:
+            lines.append(f"{index}.{index % 5 + 1} - Modalités d'application")
+        else:
+            lines.append(f"Law {index}B - Procedure")
+        for offset in range(lines_per_law):
+            lines.append(SENTENCES[(index + offset) % len(SENTENCES)])
+    return '\n'.join(lines)
+
+
+def legacy_segment(text: str) -> List[Tuple[str, str]]:
+    segments = []
+    for pattern in LEGACY_LAW_PATTERNS:
+        for match in re.finditer(pattern, text, re.MULTILINE | re.DOTALL | re.IGNORECASE):
+            segments.append((match.group(1).strip(), match.group(2).strip()))
+    return segments
+
+
+def time_call(func, text: str, repeat: int) -> Tuple[float, int]:
+    best = float('inf')
+    result_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+        result_count = len(result)
+    return best, result_count
+
+
+def run_benchmark(sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    parser = LawParser()
+    results = []
+    
+    for size in sizes:
+        text = build_page(size)
+        before, before_count = time_call(legacy_segment, text, repeat)
+        after, after_count = time_call(parser._segment_text, text, repeat)
+        
+        results.append({
+            'laws': size,
+            'chars': len(text),
+            'before_seconds': before,
+            'after_seconds': after,
+            'before_segments': before_count,
+            'after_segments': after_count,
+            'speedup': before / after if after else None
+        })
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Law segmentation before/after benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 800, 3200])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.sizes, args.repeat)
+    
+    print(f"{'laws':>8} {'chars':>10} {'before (ms)':>12} {'after (ms)':>12} {'segments':>14} {'speedup':>8}")
+    for row in results:
+        print(f"{row['laws']:>8} {row['chars']:>10} {row['before_seconds'] * 1000:>12.2f} "
+              f"{row['after_seconds'] * 1000:>12.2f} {row['before_segments']:>6}/{row['after_segments']:<7} "
+              f"{row['speedup']:>7.1f}x")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
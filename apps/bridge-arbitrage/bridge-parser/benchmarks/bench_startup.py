@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark
+======================
+
+Import-time budget for the parser modules and the CLI, measured with
+python -X importtime in fresh interpreters.
+
+Features:
+- Cumulative import time of each entry module against a budget in ms
+- Wall clock of "complete_bridge_parser.py --help" (interpreter startup included)
+- Fails when a heavy optional dependency (PDF libraries, supabase, tqdm,
+  multiprocessing) is loaded at import time instead of on first use
+- Bytecode caching is forced on and a warm-up run fills it, so the numbers
+  match an installed tree rather than a first run
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--json out.json] [--budget-scale 2.0]
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import List, Dict, Any, Tuple
+
+BRIDGE_PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGETS_MS = {
+    'enhanced_bridge_parser': 120,
+    'supabase_integration': 80,
+    'law_navigation_system': 60,
+    'complete_bridge_parser': 150,
+}
+CLI_HELP_BUDGET_MS = 250
+
+# Modules that must only be imported when a PDF is opened, a database connection
+# is made, a progress bar is shown or a process pool is started
+LAZY_MODULES = ['pdfplumber', 'pdfminer', 'PyPDF2', 'supabase', 'postgrest', 'httpx', 'tqdm',
+                'concurrent.futures.process', 'multiprocessing']
+
+
+def interpreter_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = BRIDGE_PARSER_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    # "import time: self [us] | cumulative | imported package"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(cumulative)))
+    return modules
+
+
+def measure_import(module: str, repeat: int) -> Dict[str, Any]:
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+    best = None
+    loaded = []
+    
+    # The first run writes the bytecode cache and is not counted
+    for run in range(repeat + 1):
+        completed = subprocess.run(command, capture_output=True, text=True, env=interpreter_env(),
+                                   cwd=tempfile.gettempdir())
+        if completed.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{completed.stderr.strip()[-2000:]}")
+        
+        modules = parse_importtime(completed.stderr)
+        total = next(cumulative for name, cumulative in reversed(modules) if name == module)
+        loaded = [name for name, _ in modules]
+        if run and (best is None or total < best):
+            best = total
+    
+    eager = sorted({lazy for name in loaded for lazy in LAZY_MODULES
+                    if name == lazy or name.startswith(lazy + '.')})
+    return {'import_ms': round(best / 1000, 2), 'modules': len(loaded), 'eager_heavy_modules': eager}
+
+
+def measure_cli_help(repeat: int) -> float:
+    command = [sys.executable, os.path.join(BRIDGE_PARSER_DIR, 'complete_bridge_parser.py'), '--help']
+    best = float('inf')
+    
+    for run in range(repeat + 1):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, env=interpreter_env(), cwd=tempfile.gettempdir(), check=True)
+        if run:
+            best = min(best, time.perf_counter() - start)
+    
+    return round(best * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget for the parser modules and the CLI")
+    parser.add_argument('--repeat', type=int, default=5, help='Keep the best of this many runs')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='Multiply every budget (slow machines, CI)')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+    
+    results = {}
+    failures = []
+    
+    print(f"{'module':>24} {'import ms':>10} {'budget':>8} {'modules':>8}")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        row = results[module] = measure_import(module, args.repeat)
+        budget *= args.budget_scale
+        print(f"{module:>24} {row['import_ms']:>10.1f} {budget:>8.0f} {row['modules']:>8}")
+        if row['import_ms'] > budget:
+            failures.append(f"import {module} took {row['import_ms']:.1f} ms (budget {budget:.0f} ms)")
+        if row['eager_heavy_modules']:
+            failures.append(f"import {module} loads {', '.join(row['eager_heavy_modules'])}")
+    
+    help_ms = measure_cli_help(args.repeat)
+    help_budget = CLI_HELP_BUDGET_MS * args.budget_scale
+    results['cli_help_ms'] = help_ms
+    print(f"{'CLI --help (wall clock)':>24} {help_ms:>10.1f} {help_budget:>8.0f}")
+    if help_ms > help_budget:
+        failures.append(f"complete_bridge_parser.py --help took {help_ms:.1f} ms (budget {help_budget:.0f} ms)")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
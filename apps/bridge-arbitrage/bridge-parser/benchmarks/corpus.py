@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Synthetic Law Corpus
+====================
+
+Deterministic generator of Code/RNC-style laws for the benchmarks.
+
+Features:
+- French and English law bodies built from bridge vocabulary, so category
+  keywords and cross-references occur at realistic rates
+- Law numbers in every style the parser recognises (Article 12.3, 40.2 -,
+  Law 16B) with references to earlier laws ("voir Article 12", "see Law 16B")
+- Near-duplicates on demand, for the duplicate detector
+- Same seed, same corpus: results stay comparable across commits
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import random
+from typing import List, Dict, Any
+
+FRENCH_SENTENCES = [
+    "Le joueur fautif doit rectifier sa déclaration avant que son partenaire n'annonce.",
+    "Une carte exposée devient une carte pénalisée lorsque le déclarant le demande.",
+    "La marque est établie selon le barème en vigueur pour la compétition.",
+    "Toute enchère insuffisante peut être acceptée par l'adversaire de gauche.",
+    "L'arbitre applique une pénalité lorsque le comportement d'un joueur nuit au tournoi.",
+    "Le pli est ramassé par le camp qui a fourni la carte la plus forte.",
+    "La procédure de réclamation doit être engagée avant la fin de la séance.",
+    "En cas de vulnérabilité, la sanction est doublée conformément au règlement.",
+]
+
+ENGLISH_SENTENCES = [
+    "The Director shall award an adjusted score when the non-offending side is damaged.",
+    "A player may not look at the face of a card belonging to another player.",
+    "An insufficient bid may be accepted by the player on the offender's left.",
+    "The trick is won by the highest card of the suit led unless a trump is played.",
+    "Regulations of the tournament organiser take precedence over this procedure.",
+    "A penalty card must be played at the first legal opportunity.",
+    "Conduct and etiquette are governed by the ethics provisions of the competition.",
+    "The score of each board is recorded before the next round begins.",
+]
+
+FRENCH_CUES = ['voir Article {number}', 'selon la Loi {number}', 'conformément à l\'Article {number}', 'cf. Art. {number}']
+ENGLISH_CUES = ['see Law {number}', 'according to Article {number}', 'as per Rule {number}', 'per Law {number}']
+
+TITLES = [
+    "Dispositions générales", "Enchères insuffisantes", "Cartes pénalisées", "Marque et vulnérabilité",
+    "Procedure after an irregularity", "Claims and concessions", "Tournament regulations", "Conduct and etiquette",
+]
+
+
+def law_number(index: int) -> str:
+    style = index % 3
+    if style == 0:
+        return f"{index // 3 + 1}.{index % 7 + 1}"
+    if style == 1:
+        return f"{index // 3 + 1}{'ABCD'[index % 4]}"
+    return str(index // 3 + 1)
+
+
+def heading(number: str, title: str) -> str:
+    if '.' in number:
+        return f"{number} - {title}"
+    if number[-1].isalpha():
+        return f"Law {number} - {title}"
+    return f"Article {number} : {title}"
+
+
+def _body(rng: random.Random, index: int, numbers: List[str], sentences: int) -> str:
+    french = index % 2 == 0
+    pool = FRENCH_SENTENCES if french else ENGLISH_SENTENCES
+    cues = FRENCH_CUES if french else ENGLISH_CUES
+    parts = []
+    
+    for _ in range(sentences):
+        sentence = rng.choice(pool)
+        # Roughly one sentence in four cites an earlier law
+        if numbers and rng.random() < 0.25:
+            cue = rng.choice(cues).format(number=rng.choice(numbers).split('.')[0])
+            sentence = f"{sentence[:-1]} ({cue})."
+        parts.append(sentence)
+    
+    return ' '.join(parts)
+
+
+def generate_laws(count: int, seed: int = 2017, sentences: int = 5) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    laws = []
+    numbers = []
+    
+    for index in range(count):
+        number = law_number(index)
+        title = f"{TITLES[index % len(TITLES)]} {index}"
+        content = _body(rng, index, numbers[-200:], sentences)
+        laws.append({
+            'law_number': number,
+            'title': title,
+            'content': content,
+            'category': 'general',
+            'source_file': f"corpus_{seed}.pdf",
+            'page_number': index // 8 + 1
+        })
+        numbers.append(number)
+    
+    return laws
+
+
+def near_duplicate(law: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    words = law['content'].split()
+    words[rng.randrange(len(words))] = 'modifié'
+    return dict(law, law_number=f"{law['law_number']}-bis", title=f"{law['title']} (bis)", content=' '.join(words))
+
+
+def render_text(laws: List[Dict[str, Any]]) -> str:
+    return '\n'.join(f"{heading(law['law_number'], law['title'])}\n{law['content']}" for law in laws)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Golden Corpus Regression Harness
+================================
+
+End-to-end performance and accuracy check of EnhancedBridgePDFParser over the
+documents shipped in public/Upload, against stored baselines.
+
+Each document is parsed in a fresh process (cold caches, its own peak RSS) and
+measured for pages/s, laws/s, peak RSS, law count, reference count and a digest
+of the extracted law numbers. The run fails when throughput drops, memory grows
+or the extraction output drifts beyond the thresholds in the baselines file.
+
+test_rnc.pdf is a plain-text fixture rather than a PDF: text documents are split
+on form feeds and fed through the same LawParser page path.
+
+Throughput baselines are machine-specific: refresh them with --update on the
+machine that runs the check.
+
+Usage:
+    python benchmarks/golden_corpus.py [--files "RPI Nov 2021.pdf" ...] [--repeat 1]
+                                       [--baselines golden_baselines.json] [--update]
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import resource
+import subprocess
+from typing import List, Dict, Any
+
+BRIDGE_PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(os.path.dirname(BRIDGE_PARSER_DIR), 'public', 'Upload')
+DEFAULT_BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden_baselines.json')
+
+GOLDEN_CORPUS = ['RPI Nov 2021.pdf', 'test_rnc.pdf', 'RNC 2025-2026.pdf']
+
+DEFAULT_THRESHOLDS = {
+    'max_throughput_drop': 0.25,
+    'max_rss_growth': 0.5,
+    'max_law_count_drift': 0.02,
+    'max_reference_count_drift': 0.05
+}
+
+sys.path.insert(0, BRIDGE_PARSER_DIR)
+
+
+def is_pdf(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(5) == b'%PDF-'
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_file(path: str, repeat: int) -> Dict[str, Any]:
+    import logging
+    logging.disable(logging.INFO)
+    from enhanced_bridge_parser import EnhancedBridgePDFParser, LawParser
+    
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if is_pdf(path):
+            parser = EnhancedBridgePDFParser()
+            laws = parser.parse_pdf_file(path)
+            pages = parser.stats.total_pages
+        else:
+            with open(path, encoding='utf-8') as f:
+                texts = f.read().split('\f')
+            laws = list(LawParser().iter_laws_from_pages(enumerate(texts, 1), os.path.basename(path)))
+            pages = len(texts)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best[0]:
+            best = (seconds, pages, laws)
+    
+    seconds, pages, laws = best
+    law_numbers = '\n'.join(sorted(law.law_number for law in laws))
+    return {
+        'pages': pages,
+        'laws': len(laws),
+        'references': sum(len(law.references) for law in laws),
+        'law_numbers_sha256': hashlib.sha256(law_numbers.encode('utf-8')).hexdigest()[:16],
+        'seconds': round(seconds, 4),
+        'pages_per_sec': round(pages / seconds, 2) if seconds else 0.0,
+        'laws_per_sec': round(len(laws) / seconds, 2) if seconds else 0.0,
+        'peak_rss_mb': round(peak_rss_mb(), 1)
+    }
+
+
+def run_isolated(path: str, repeat: int) -> Dict[str, Any]:
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', path, '--repeat', str(repeat)],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Measuring {os.path.basename(path)} failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def relative_change(current: float, baseline: float) -> float:
+    return (current - baseline) / baseline if baseline else (1.0 if current else 0.0)
+
+
+def check(name: str, current: Dict[str, Any], baseline: Dict[str, Any], thresholds: Dict[str, float]) -> List[str]:
+    failures = []
+    
+    for metric in ('pages_per_sec', 'laws_per_sec'):
+        drop = -relative_change(current[metric], baseline[metric])
+        if baseline[metric] and drop > thresholds['max_throughput_drop']:
+            failures.append(f"{name}: {metric} dropped {drop:.0%} ({baseline[metric]} -> {current[metric]})")
+    
+    growth = relative_change(current['peak_rss_mb'], baseline['peak_rss_mb'])
+    if growth > thresholds['max_rss_growth']:
+        failures.append(f"{name}: peak RSS grew {growth:.0%} ({baseline['peak_rss_mb']} -> {current['peak_rss_mb']} MB)")
+    
+    for metric, limit in (('laws', 'max_law_count_drift'), ('references', 'max_reference_count_drift')):
+        drift = abs(relative_change(current[metric], baseline[metric]))
+        if drift > thresholds[limit]:
+            failures.append(f"{name}: {metric} drifted {drift:.1%} ({baseline[metric]} -> {current[metric]})")
+    
+    if current['pages'] != baseline['pages']:
+        failures.append(f"{name}: page count changed ({baseline['pages']} -> {current['pages']})")
+    
+    if current['law_numbers_sha256'] != baseline['law_numbers_sha256']:
+        failures.append(f"{name}: law numbers changed ({baseline['law_numbers_sha256']} -> {current['law_numbers_sha256']})")
+    
+    return failures
+
+
+def load_baselines(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {'thresholds': dict(DEFAULT_THRESHOLDS), 'files': {}}
+    with open(path) as f:
+        baselines = json.load(f)
+    baselines['thresholds'] = {**DEFAULT_THRESHOLDS, **baselines.get('thresholds', {})}
+    return baselines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden corpus performance and accuracy regression check")
+    parser.add_argument('--files', nargs='+', default=GOLDEN_CORPUS, help='Documents in public/Upload to check')
+    parser.add_argument('--repeat', type=int, default=1, help='Keep the best of this many parses per document')
+    parser.add_argument('--baselines', default=DEFAULT_BASELINES, help='Baselines JSON file')
+    parser.add_argument('--update', action='store_true', help='Record the current results as the new baselines')
+    parser.add_argument('--json', help='Write the current results to this JSON file')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.measure:
+        print(json.dumps(measure_file(args.measure, args.repeat)))
+        return
+    
+    baselines = load_baselines(args.baselines)
+    results = {}
+    failures = []
+    
+    print(f"{'document':>24} {'pages':>6} {'laws':>6} {'refs':>6} {'pages/s':>9} {'laws/s':>9} {'RSS MB':>8}  status")
+    for name in args.files:
+        current = results[name] = run_isolated(os.path.join(UPLOAD_DIR, name), args.repeat)
+        baseline = baselines['files'].get(name)
+        
+        status = 'no baseline' if baseline is None else 'ok'
+        
+        if baseline is not None and not args.update:
+            file_failures = check(name, current, baseline, baselines['thresholds'])
+            failures.extend(file_failures)
+            if file_failures:
+                status = 'FAIL'
+        
+        print(f"{name:>24} {current['pages']:>6} {current['laws']:>6} {current['references']:>6} "
+              f"{current['pages_per_sec']:>9.1f} {current['laws_per_sec']:>9.1f} {current['peak_rss_mb']:>8.1f}  {status}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.update:
+        baselines['files'].update(results)
+        with open(args.baselines, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"📝 Baselines written to {args.baselines}")
+        return
+    
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Code Structure Parser
+=====================
+
+Single-pass state machine that turns the page text of the Code International
+into the hierarchy of the code_laws draft: section / law / chapter / alinea /
+sub-alinea / sub-sub-alinea (e.g. Loi 40B2(a)(iii)).
+
+Features:
+- Streams lines page by page, no second pass over the document
+- Table of contents entries disambiguate chapter headings and ANNEXE numbering
+- "(i)" is read as a sub-alinea letter after "(h)", as a sub-sub-alinea otherwise
+- Page footers ("Code International du Bridge 2017 - 12 -") are ignored
+- Edition-specific headings and footers are matched on any year and can be
+  replaced per document
+- In-memory tree index: parent / ancestors / descendants lookups in O(depth)
+  instead of repeated ilike queries against Supabase
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Pattern, Tuple
+
+LEVELS = ('root', 'section', 'law', 'chapter', 'alinea', 'sub_alinea', 'sub_sub_alinea')
+LAWS_SECTION = 'Lois'
+
+SECTION_HEADINGS = {
+    'PRÉFACE': "PRÉFACE à l'édition française du Code",
+    'TABLE DES MATIÈRES': 'TABLE DES MATIÈRES',
+    'DÉFINITIONS': 'Définitions',
+}
+# Headings that carry the edition year; the section name keeps the year found in the text
+EDITION_HEADINGS = (
+    (re.compile(r'^PRÉFACE AUX LOIS DE (\d{4})$'), 'PRÉFACE AUX LOIS DE {}'),
+    (re.compile(r'^INTRODUCTION AUX LOIS DE (\d{4})$'), 'INTRODUCTION AUX LOIS DE {}'),
+    (re.compile(r'^INDEX CODE (\d{4})$'), 'INDEX Code {}'),
+)
+SECTION_CONTINUATIONS = {
+    'PRÉFACE': "à l'édition française du code",
+}
+TABLE_OF_CONTENTS = 'TABLE DES MATIÈRES'
+
+FOOTER_PATTERN = re.compile(r'^Code International du Bridge \d{4}\s*-\s*\d+\s*-$')
+TOC_ENTRY_PATTERN = re.compile(r'^(.*?)\s*\.{3,}[\s.]*\d[\d\s]*$')
+LAW_HEADING_PATTERN = re.compile(r'^LOI\s+(\d+)\s*[-–]\s*(.+)$')
+ANNEX_HEADING_PATTERN = re.compile(r'^(ANNEXE\s+[IVX]+)\s*[-–]\s*(.+)$')
+CHAPTER_PATTERN = re.compile(r'^([A-Z])\.\s+(\S.*)$')
+NUMBER_PATTERN = re.compile(r'^(\d+)\.(?!\d)\s*(.*)$')
+SUB_PATTERN = re.compile(r'^\(([a-z]+)\)\s*(.*)$')
+REFERENCE_PATTERN = re.compile(
+    r'^(?:(?:lois?|law)\s+)?(\d+)\s*([A-Z])?\s*(?:\.?\s*(\d+))?\s*((?:\(\s*[a-z]+\s*\)\s*){0,2})$',
+    re.IGNORECASE
+)
+
+def _roman(number: int) -> str:
+    numerals = ((10, 'x'), (9, 'ix'), (5, 'v'), (4, 'iv'), (1, 'i'))
+    result = ''
+    for value, numeral in numerals:
+        while number >= value:
+            result += numeral
+            number -= value
+    return result
+
+ROMAN_NUMERALS = [_roman(number) for number in range(1, 40)]
+
+def _normalize_title(title: str) -> str:
+    # PyPDF2 splits words and dot leaders with stray spaces ("l’ Adv.", "choi sie")
+    return ''.join(title.replace('’', "'").lower().split())
+
+def _same_title(first: str, second: str) -> bool:
+    first, second = _normalize_title(first), _normalize_title(second)
+    length = min(len(first), len(second), 30)
+    return length > 0 and first[:length] == second[:length]
+
+def _next_letter(letter: Optional[str], first: str = 'a') -> str:
+    return chr(ord(letter) + 1) if letter else first
+
+def normalize_reference(reference: str) -> str:
+    match = REFERENCE_PATTERN.match(reference.strip())
+    if not match:
+        return reference.strip()
+    
+    law_number, chapter_letter, alinea_number, subs = match.groups()
+    normalized = law_number
+    if chapter_letter:
+        normalized += chapter_letter.upper()
+    if alinea_number:
+        normalized += alinea_number if chapter_letter else f'.{alinea_number}'
+    normalized += ''.join(f'({sub})' for sub in re.findall(r'[a-z]+', subs.lower()))
+    return normalized
+
+@dataclass
+class CodeNode:
+    level: str
+    section_name: str
+    reference: str
+    page_number: int
+    law_number: Optional[str] = None
+    law_name: Optional[str] = None
+    chapter_letter: Optional[str] = None
+    chapter_name: Optional[str] = None
+    alinea_number: Optional[int] = None
+    sub_alinea_letter: Optional[str] = None
+    sub_sub_alinea_reference: Optional[str] = None
+    lines: List[str] = field(default_factory=list, repr=False)
+    children: List['CodeNode'] = field(default_factory=list, repr=False)
+    parent: Optional['CodeNode'] = field(default=None, repr=False)
+    
+    @property
+    def content(self) -> str:
+        return '\n'.join(self.lines).strip()
+    
+    @property
+    def depth(self) -> int:
+        return LEVELS.index(self.level)
+    
+    def add_child(self, level: str, reference: str, page_number: int, **fields) -> 'CodeNode':
+        child = replace(self, level=level, reference=reference, page_number=page_number,
+                        lines=[], children=[], parent=self, **fields)
+        self.children.append(child)
+        return child
+    
+    def ancestors(self) -> Iterator['CodeNode']:
+        node = self.parent
+        while node is not None and node.level != 'root':
+            yield node
+            node = node.parent
+    
+    def iter_descendants(self) -> Iterator['CodeNode']:
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+    
+    def to_record(self, pdf_path: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'section_name': self.section_name,
+            'law_number': self.law_number,
+            'law_name': self.law_name,
+            'chapter_letter': self.chapter_letter,
+            'chapter_name': self.chapter_name,
+            'alinea_number': self.alinea_number,
+            'sub_alinea_letter': self.sub_alinea_letter,
+            'sub_sub_alinea_reference': self.sub_sub_alinea_reference,
+            'content': self.content,
+            'pdf_path': pdf_path,
+            'reference': self.reference,
+            'page_number': self.page_number
+        }
+
+class CodeStructure:
+    def __init__(self, root: CodeNode):
+        self.root = root
+        self.index: Dict[str, CodeNode] = {}
+    
+    def add(self, node: CodeNode):
+        self.index.setdefault(node.reference, node)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def __contains__(self, reference: str) -> bool:
+        return normalize_reference(reference) in self.index
+    
+    def get(self, reference: str) -> Optional[CodeNode]:
+        return self.index.get(normalize_reference(reference))
+    
+    def parent(self, reference: str) -> Optional[CodeNode]:
+        node = self.get(reference)
+        return next(node.ancestors(), None) if node else None
+    
+    def ancestors(self, reference: str) -> List[CodeNode]:
+        node = self.get(reference)
+        return list(node.ancestors()) if node else []
+    
+    def descendants(self, reference: str, level: Optional[str] = None) -> List[CodeNode]:
+        node = self.get(reference)
+        if node is None:
+            return []
+        return [child for child in node.iter_descendants() if level is None or child.level == level]
+    
+    def sections(self) -> List[CodeNode]:
+        return list(self.root.children)
+    
+    def laws(self) -> List[CodeNode]:
+        return [node for node in self.index.values() if node.level == 'law']
+    
+    def iter_nodes(self) -> Iterator[CodeNode]:
+        return self.root.iter_descendants()
+    
+    def to_records(self, pdf_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [node.to_record(pdf_path) for node in self.iter_nodes()]
+
+class CodeStructureParser:
+    def __init__(self, section_headings: Optional[Dict[str, str]] = None,
+                 edition_headings: Optional[Iterable[Tuple[Pattern, str]]] = None,
+                 footer_pattern: Optional[Pattern] = None):
+        self.section_headings = SECTION_HEADINGS if section_headings is None else section_headings
+        self.edition_headings = EDITION_HEADINGS if edition_headings is None else tuple(edition_headings)
+        self.footer_pattern = footer_pattern or FOOTER_PATTERN
+        self.root = CodeNode(level='root', section_name='', reference='', page_number=0)
+        self.structure = CodeStructure(self.root)
+        self._current: Dict[str, CodeNode] = {}
+        self._toc_titles: Dict[Tuple[str, str], str] = {}
+        self._toc_scopes = set()
+        self._toc_scope: Optional[str] = None
+        self._continuation: Optional[str] = None
+    
+    def parse(self, pages: Iterable[Tuple[int, str]]) -> CodeStructure:
+        for page_number, text in pages:
+            self.feed_page(page_number, text)
+        return self.structure
+    
+    def feed_page(self, page_number: int, text: str):
+        for line in text.splitlines():
+            self.feed_line(line, page_number)
+    
+    def feed_line(self, line: str, page_number: int):
+        line = line.strip()
+        if not line or self.footer_pattern.match(line):
+            return
+        
+        continuation, self._continuation = self._continuation, None
+        if continuation and _normalize_title(line) == _normalize_title(continuation):
+            return
+        
+        section_name = self._section_heading(line)
+        if section_name:
+            self._open_section(section_name, page_number)
+            self._continuation = SECTION_CONTINUATIONS.get(line)
+            return
+        
+        section = self._current.get('section')
+        if section and section.section_name == TABLE_OF_CONTENTS and not self._ends_toc(line):
+            self._read_toc_entry(line)
+            section.lines.append(line)
+            return
+        
+        annex = ANNEX_HEADING_PATTERN.match(line)
+        if annex and not TOC_ENTRY_PATTERN.match(line):
+            self._open_section(annex.group(1), page_number).lines.append(annex.group(2))
+            return
+        
+        law = LAW_HEADING_PATTERN.match(line)
+        if law and not TOC_ENTRY_PATTERN.match(line):
+            self._open_law(law.group(1), law.group(2), page_number)
+            return
+        
+        if 'law' in self._current:
+            self._read_law_line(line, page_number)
+        elif section and section.section_name.startswith('ANNEXE'):
+            self._read_annex_line(line, page_number)
+        else:
+            self._deepest().lines.append(line)
+    
+    def _section_heading(self, line: str) -> Optional[str]:
+        if line in self.section_headings:
+            return self.section_headings[line]
+        for pattern, section_name in self.edition_headings:
+            heading = pattern.match(line)
+            if heading:
+                return section_name.format(*heading.groups())
+        return None
+    
+    def _ends_toc(self, line: str) -> bool:
+        # A law heading without page number that the table already listed is the body starting;
+        # one not listed yet may be a TOC entry wrapped before its page number
+        law = LAW_HEADING_PATTERN.match(line)
+        return bool(law) and not TOC_ENTRY_PATTERN.match(line) and (law.group(1), '') in self._toc_titles
+    
+    def _read_toc_entry(self, line: str):
+        entry = TOC_ENTRY_PATTERN.match(line)
+        if not entry:
+            return
+        title = entry.group(1)
+        
+        law = LAW_HEADING_PATTERN.match(title)
+        annex = ANNEX_HEADING_PATTERN.match(title)
+        chapter = CHAPTER_PATTERN.match(title) or NUMBER_PATTERN.match(title)
+        if law:
+            self._toc_scope = law.group(1)
+            self._toc_titles[(self._toc_scope, '')] = law.group(2).strip()
+        elif annex:
+            self._toc_scope = annex.group(1)
+        elif chapter and self._toc_scope:
+            self._toc_titles[(self._toc_scope, chapter.group(1))] = chapter.group(2).strip()
+            self._toc_scopes.add(self._toc_scope)
+        else:
+            self._toc_scope = None
+    
+    def _toc_chapter(self, scope: str, marker: str, title: str) -> Optional[bool]:
+        # None when the table of contents knows nothing about this scope
+        if scope not in self._toc_scopes:
+            return None
+        known = self._toc_titles.get((scope, marker))
+        return known is not None and _same_title(known, title)
+    
+    def _read_law_line(self, line: str, page_number: int):
+        law = self._current['law']
+        
+        chapter = CHAPTER_PATTERN.match(line)
+        if chapter:
+            letter, title = chapter.groups()
+            from_toc = self._toc_chapter(law.law_number, letter, title)
+            current = self._current.get('chapter')
+            expected = _next_letter(current.chapter_letter if current else None, 'A')
+            if from_toc or (from_toc is None and letter == expected):
+                self._open(law, 'chapter', f'{law.reference}{letter}', page_number,
+                           chapter_letter=letter, chapter_name=title.strip())
+                return
+        
+        self._read_markers(line, page_number, self._current.get('chapter') or law)
+    
+    def _read_annex_line(self, line: str, page_number: int):
+        section = self._current['section']
+        number = NUMBER_PATTERN.match(line)
+        if number:
+            value, title = number.groups()
+            current = self._current.get('chapter')
+            alinea = self._current.get('alinea')
+            from_toc = self._toc_chapter(section.section_name, value, title)
+            if from_toc is None:
+                expected_chapter = str(int(current.chapter_letter) + 1) if current else '1'
+                expected_alinea = str(alinea.alinea_number + 1) if alinea else '1'
+                from_toc = current is None or (value == expected_chapter and value != expected_alinea)
+            if from_toc:
+                self._open(section, 'chapter', f'{section.section_name} {value}', page_number,
+                           chapter_letter=value, chapter_name=title.strip())
+                return
+        
+        chapter = self._current.get('chapter')
+        if chapter is None:
+            section.lines.append(line)
+            return
+        self._read_markers(line, page_number, chapter, separator='.')
+    
+    def _read_markers(self, line: str, page_number: int, parent: CodeNode, separator: str = ''):
+        rest = line
+        
+        number = NUMBER_PATTERN.match(rest)
+        if number:
+            current = self._current.get('alinea')
+            expected = current.alinea_number + 1 if current else 1
+            if int(number.group(1)) == expected:
+                if parent.level != 'chapter':
+                    separator = '.'
+                parent = self._open(parent, 'alinea', f'{parent.reference}{separator}{expected}', page_number,
+                                    alinea_number=expected)
+                rest = number.group(2)
+        
+        sub = SUB_PATTERN.match(rest)
+        while sub and 'alinea' in self._current:
+            level = self._classify_sub(sub.group(1))
+            if level is None:
+                break
+            parent = self._current['sub_alinea'] if level == 'sub_sub_alinea' else self._current['alinea']
+            fields = {'sub_alinea_letter': sub.group(1)} if level == 'sub_alinea' else \
+                {'sub_sub_alinea_reference': sub.group(1)}
+            self._open(parent, level, f'{parent.reference}({sub.group(1)})', page_number, **fields)
+            rest = sub.group(2)
+            sub = SUB_PATTERN.match(rest)
+        
+        if rest:
+            self._deepest().lines.append(rest)
+    
+    def _classify_sub(self, token: str) -> Optional[str]:
+        sub_alinea = self._current.get('sub_alinea')
+        sub_sub = self._current.get('sub_sub_alinea')
+        expected_letter = _next_letter(sub_alinea.sub_alinea_letter if sub_alinea else None)
+        
+        if sub_sub is not None:
+            position = ROMAN_NUMERALS.index(sub_sub.sub_sub_alinea_reference)
+            if position + 1 < len(ROMAN_NUMERALS) and token == ROMAN_NUMERALS[position + 1]:
+                return 'sub_sub_alinea'
+        if token == expected_letter:
+            return 'sub_alinea'
+        if token == 'i' and sub_alinea is not None and sub_sub is None:
+            return 'sub_sub_alinea'
+        return None
+    
+    def _open_section(self, section_name: str, page_number: int) -> CodeNode:
+        return self._open(self.root, 'section', section_name, page_number, section_name=section_name)
+    
+    def _open_law(self, law_number: str, heading: str, page_number: int):
+        section = self._current.get('section')
+        if section is None or section.section_name != LAWS_SECTION:
+            section = self._open_section(LAWS_SECTION, page_number)
+        law_name = self._toc_titles.get((law_number, ''), heading.strip())
+        self._open(section, 'law', law_number, page_number, law_number=law_number, law_name=law_name)
+    
+    def _open(self, parent: CodeNode, level: str, reference: str, page_number: int, **fields) -> CodeNode:
+        node = parent.add_child(level, reference, page_number, **fields)
+        depth = LEVELS.index(level)
+        for deeper in LEVELS[depth:]:
+            self._current.pop(deeper, None)
+        self._current[level] = node
+        self.structure.add(node)
+        return node
+    
+    def _deepest(self) -> CodeNode:
+        for level in reversed(LEVELS[1:]):
+            if level in self._current:
+                return self._current[level]
+        return self.root
+
+def parse_code_structure(pages: Iterable[Tuple[int, str]], **options) -> CodeStructure:
+    return CodeStructureParser(**options).parse(pages)
+
+if __name__ == "__main__":
+    import sys
+    from enhanced_bridge_parser import EnhancedBridgePDFParser
+    
+    if len(sys.argv) < 2:
+        print("Usage: python code_structure.py <code.pdf> [reference ...]")
+        sys.exit(1)
+    
+    structure = EnhancedBridgePDFParser().build_code_structure(sys.argv[1])
+    print(f"🌳 {len(structure)} nodes, {len(structure.laws())} laws")
+    
+    for reference in sys.argv[2:]:
+        node = structure.get(reference)
+        if node is None:
+            print(f"❌ {reference}: not found")
+            continue
+        path = ' > '.join(ancestor.reference for ancestor in reversed(list(node.ancestors())))
+        print(f"📍 {node.reference} ({node.level}, page {node.page_number}) in {path}")
+        for child in structure.descendants(node.reference):
+            print(f"   {'  ' * (child.depth - node.depth - 1)}{child.reference}")
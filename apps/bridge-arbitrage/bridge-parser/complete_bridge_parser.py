@@ -28,9 +28,13 @@ from datetime import datetime
 
 # Import our enhanced modules
 try:
-    from enhanced_bridge_parser import EnhancedBridgePDFParser, ProcessingStats
+    from enhanced_bridge_parser import (EnhancedBridgePDFParser, ProcessingStats, TEST_MODE_MAX_PAGES,
+                                        DEFAULT_STAGE_WORKERS, PIPELINE_QUEUE_SIZE)
     from law_navigation_system import LawNavigationAPI
     from supabase_integration import EnhancedSupabaseManager, create_enhanced_manager
+    from parse_cache import (ParseCache, PageTextStore, DEFAULT_CACHE_DIR, DEFAULT_MAX_AGE_DAYS,
+                             DEFAULT_PAGE_STORE_MAX_BYTES)
+    from local_store import LocalStoreClient
 except ImportError as e:
     print(f"❌ Import error: {e}")
     print("Make sure all parser files are in the same directory!")
@@ -55,16 +59,22 @@ def setup_logging(log_level: str = 'INFO', log_file: str = None):
     logging.getLogger('requests').setLevel(logging.WARNING)
 
 class CompleteBridgeParserSystem:
-    def __init__(self, supabase_url: str, supabase_key: str, log_level: str = 'INFO'):
+    def __init__(self, supabase_url: str, supabase_key: str, log_level: str = 'INFO',
+                 parse_cache: Optional[ParseCache] = None, page_store: Optional[PageTextStore] = None,
+                 backend: str = 'auto', write_mode: str = 'insert', snapshot_dir: Optional[str] = DEFAULT_CACHE_DIR):
         self.logger = logging.getLogger(__name__)
+        self.parse_cache = parse_cache
+        self.page_store = page_store
         
         try:
             # Initialize Supabase manager
-            self.db_manager = create_enhanced_manager(supabase_url, supabase_key)
+            self.db_manager = create_enhanced_manager(supabase_url, supabase_key, snapshot_dir)
             self.logger.info("✅ Database manager initialized")
             
             # Initialize PDF parser
-            self.pdf_parser = EnhancedBridgePDFParser(supabase_url, supabase_key)
+            self.pdf_parser = EnhancedBridgePDFParser(supabase_url, supabase_key, parse_cache=parse_cache,
+                                                      page_store=page_store, backend=backend,
+                                                      write_mode=write_mode)
             self.logger.info("✅ PDF parser initialized")
             
             # Initialize navigation system
@@ -81,12 +91,32 @@ class CompleteBridgeParserSystem:
                               pdf_directory: str, 
                               clear_existing: bool = True,
                               test_mode: bool = False,
-                              max_files: int = None) -> Dict[str, Any]:
+                              max_files: int = None,
+                              workers: int = 1,
+                              pages: str = None,
+                              max_pages: int = None,
+                              pipeline: bool = False,
+                              stage_workers: Dict[str, int] = None,
+                              queue_size: int = PIPELINE_QUEUE_SIZE,
+                              metrics_file: str = None,
+                              progress_stream: str = None) -> Dict[str, Any]:
+        
+        if test_mode and max_pages is None:
+            max_pages = TEST_MODE_MAX_PAGES
         
         self.logger.info("🎯 Starting complete processing pipeline")
         self.logger.info(f"📁 Source directory: {pdf_directory}")
+        if self.pdf_parser.write_mode == 'upsert':
+            # Rows are reconciled in place, so the live tables never go empty
+            clear_existing = False
+            self.logger.info("♻️  Write mode: upsert (unchanged laws skipped, vanished laws soft-deleted)")
         self.logger.info(f"🗑️  Clear existing data: {clear_existing}")
         self.logger.info(f"🧪 Test mode: {test_mode}")
+        if pipeline:
+            self.logger.info(f"🧵 Pipeline stages: {stage_workers or DEFAULT_STAGE_WORKERS} (queue size {queue_size})")
+        else:
+            self.logger.info(f"🧵 Worker processes: {workers}")
+        self.logger.info(f"📑 Pages: {pages or 'all'}" + (f" (max {max_pages} per file)" if max_pages else ""))
         
         results = {
             'start_time': datetime.now(),
@@ -122,15 +152,34 @@ class CompleteBridgeParserSystem:
             
             # Step 3: Process PDFs
             self.logger.info("📚 Starting PDF processing...")
+            local_store = self.db_manager.client if isinstance(self.db_manager.client, LocalStoreClient) else None
+            if local_store:
+                local_store.reset_stats()
             processing_stats = self.pdf_parser.process_directory(
                 pdf_directory, 
-                clear_data=False  # Already cleared above
+                clear_data=False,  # Already cleared above
+                workers=workers,
+                pages=pages,
+                max_pages=max_pages,
+                max_files=max_files,
+                pipeline=pipeline,
+                stage_workers=stage_workers,
+                queue_size=queue_size,
+                progress_stream=progress_stream
             )
             results['pdf_processing'] = processing_stats
             
+            if self.parse_cache:
+                results['parse_cache'] = self.parse_cache.get_stats()
+            if self.page_store:
+                results['page_store'] = self.page_store.get_stats()
+            if local_store:
+                results['local_store'] = local_store.get_stats()
+            
             # Step 4: Get database statistics
             self.logger.info("📊 Gathering database statistics...")
-            db_stats = self.db_manager.get_database_stats()
+            with processing_stats.metrics.timer('database_stats'):
+                db_stats = self.db_manager.get_database_stats()
             results['database_stats'] = db_stats
             
             # Step 5: Setup navigation system
@@ -143,7 +192,8 @@ class CompleteBridgeParserSystem:
             
             # Step 6: Run optimization
             self.logger.info("⚡ Running database optimization...")
-            optimization_results = self.db_manager.optimize_database()
+            with processing_stats.metrics.timer('optimize'):
+                optimization_results = self.db_manager.optimize_database()
             results['optimization'] = optimization_results
             
             results['success'] = True
@@ -158,6 +208,12 @@ class CompleteBridgeParserSystem:
             results['errors'].append(error_msg)
             results['success'] = False
         
+        if results['pdf_processing']:
+            results['metrics'] = results['pdf_processing'].metrics_report()
+            if metrics_file:
+                results['pdf_processing'].export_metrics(metrics_file)
+                self.logger.info(f"📈 Metrics written to {metrics_file}")
+        
         return results
     
     def _log_processing_summary(self, results: Dict[str, Any]):
@@ -175,6 +231,37 @@ class CompleteBridgeParserSystem:
             self.logger.info(f"   References found: {stats.total_references}")
             self.logger.info(f"   Duration: {duration:.1f} seconds")
             self.logger.info(f"   Errors: {len(stats.errors)}")
+            if stats.sync:
+                self.logger.info("   Upsert: " + ', '.join(f"{count} {name.replace('_', '-')}" for name, count in stats.sync.items()))
+            for name, timing in stats.metrics_report()['stages'].items():
+                self.logger.info(f"   {name}: {timing['count']} x {timing['mean_seconds'] * 1000:.1f} ms avg, "
+                                 f"{timing['seconds']:.1f}s total")
+            for name, stage in stats.stages.items():
+                self.logger.info(f"   Stage {name} x{stage['workers']}: {stage['throughput']:.1f} items/s, "
+                                 f"max queue depth {stage['max_queue_depth']}")
+            for source_file, report in stats.extraction.items():
+                samples = ', '.join(f"{name} {sample['pages_per_second']:.1f} p/s"
+                                    for name, sample in report['samples'].items())
+                self.logger.info(f"   {source_file}: {report['backend']}" + (f" (sampled: {samples})" if samples else ""))
+        
+        if results.get('parse_cache'):
+            cache_stats = results['parse_cache']
+            self.logger.info(f"⚡ Parse cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                             f"{cache_stats['entries']} entries ({cache_stats['bytes'] / 1024:.0f} KB)")
+        
+        if results.get('page_store'):
+            store_stats = results['page_store']
+            self.logger.info(f"📚 Page text store: {store_stats['pages']} pages from {store_stats['documents']} documents "
+                             f"({store_stats['bytes'] / 1024:.0f} KB)")
+        
+        if results.get('local_store') and results.get('pdf_processing'):
+            # Round trips overlap on pipeline writer threads, so network time can exceed its share of the wall clock
+            store_stats = results['local_store']
+            stats = results['pdf_processing']
+            duration = (stats.end_time - stats.start_time).total_seconds()
+            self.logger.info(f"🌐 Local store during PDF processing: {store_stats['requests']} requests, "
+                             f"{store_stats['latency_seconds']:.1f}s simulated network ({store_stats['latency_ms']:.0f} ms each), "
+                             f"{store_stats['query_seconds']:.1f}s in queries, {duration:.1f}s wall clock")
         
         # Database stats
         if results.get('database_stats'):
@@ -293,6 +380,18 @@ class CompleteBridgeParserSystem:
             self.logger.error(f"❌ Failed to create sample data: {e}")
             return False
 
+def parse_stage_workers(value: str) -> Dict[str, int]:
+    stage_workers = {}
+    for item in value.split(','):
+        name, _, count = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_STAGE_WORKERS or not count.strip().isdigit():
+            raise argparse.ArgumentTypeError(
+                f"expected stage=count with stage in {', '.join(DEFAULT_STAGE_WORKERS)}, got '{item}'"
+            )
+        stage_workers[name] = int(count)
+    return stage_workers
+
 def main():
     parser = argparse.ArgumentParser(
         description="Complete Bridge PDF Parser System",
@@ -305,22 +404,73 @@ Examples:
   # Test mode with limited files
   python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --test-mode --max-files 2
   
+  # Only the first 40 pages and page 55 of each file
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --pages 1-40,55
+  
+  # Parse on 8 worker processes
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --workers 8
+  
+  # Overlap parsing and database writes, with 4 writer threads
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --pipeline --stage-workers writer=4
+  
+  # Force one PDF library instead of sampling both on each file
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --backend pypdf2
+  
+  # Re-extract every PDF even if it has not changed
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --no-cache
+  
   # Keep existing data
   python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --no-clear
   
+  # Re-run after a PDF edit: only changed laws are written
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --upsert
+
+  # Offline run against a local SQLite store with 40 ms of simulated latency per request
+  python complete_bridge_parser.py ./pdfs "local:///tmp/bridge.sqlite3?latency_ms=40" any-key
+  
+  # Export per-stage timings and counters for Prometheus (JSON for any other extension)
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --metrics-file run.prom
+  
+  # Stream progress events (JSON lines) to a listener for the web app
+  python complete_bridge_parser.py ./pdfs https://your-project.supabase.co your-anon-key --progress-stream tcp://localhost:8765
+  
   # Run system tests only
   python complete_bridge_parser.py --test-only https://your-project.supabase.co your-anon-key
         """
      )
     
     parser.add_argument('pdf_directory', nargs='?', help='Directory containing PDF files')
-    parser.add_argument('supabase_url', help='Supabase project URL')
+    parser.add_argument('supabase_url', help='Supabase project URL, or local:// for the offline SQLite store')
     parser.add_argument('supabase_key', help='Supabase anon key')
     parser.add_argument('--no-clear', action='store_true', help='Keep existing database data')
-    parser.add_argument('--test-mode', action='store_true', help='Run in test mode (limited processing)')
+    parser.add_argument('--upsert', action='store_true',
+                        help='Update changed laws in place and soft-delete vanished ones instead of clearing the tables')
+    parser.add_argument('--test-mode', action='store_true',
+                        help=f'Run in test mode (first {TEST_MODE_MAX_PAGES} pages of each file unless --max-pages is given)')
     parser.add_argument('--max-files', type=int, help='Maximum number of files to process')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes for PDF parsing')
+    parser.add_argument('--pages', help='Pages to parse in each file, e.g. "1-40,55" (default: all pages)')
+    parser.add_argument('--max-pages', type=int, help='Maximum number of pages to parse per file')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Run reader, extractor, validator and writer stages concurrently over bounded queues')
+    parser.add_argument('--stage-workers', type=parse_stage_workers,
+                        help='Threads per pipeline stage, e.g. "extractor=2,writer=4"')
+    parser.add_argument('--queue-size', type=int, default=PIPELINE_QUEUE_SIZE, help='Capacity of each pipeline queue')
+    parser.add_argument('--backend', default='auto', choices=['auto', 'pdfplumber', 'pypdf2'],
+                        help='PDF text extraction library (auto: benchmark both on sample pages of each file)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always re-extract PDFs and re-read code_laws, bypassing the parse cache, page text store and duplicate snapshot')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Parse cache and duplicate snapshot directory')
+    parser.add_argument('--cache-max-mb', type=int, default=512, help='Evict least recently used cache entries above this size')
+    parser.add_argument('--page-store-max-mb', type=int, default=DEFAULT_PAGE_STORE_MAX_BYTES // (1024 * 1024),
+                        help='Evict least recently used page texts above this size')
+    parser.add_argument('--cache-max-age-days', type=float, default=DEFAULT_MAX_AGE_DAYS, help='Evict cache entries unused for this long')
     parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
     parser.add_argument('--log-file', help='Log file path')
+    parser.add_argument('--metrics-file',
+                        help='Write per-stage timings and counters to this file (.prom or .txt: Prometheus text format, otherwise JSON)')
+    parser.add_argument('--progress-stream',
+                        help='Write progress events as JSON lines to this file ("-" for stdout) or tcp://host:port')
     parser.add_argument('--test-only', action='store_true', help='Run system tests only')
     parser.add_argument('--create-sample', action='store_true', help='Create sample data for testing')
     
@@ -332,7 +482,16 @@ Examples:
     
     try:
         # Initialize system
-        system = CompleteBridgeParserSystem(args.supabase_url, args.supabase_key, args.log_level)
+        parse_cache = None
+        page_store = None
+        if not args.no_cache:
+            parse_cache = ParseCache(args.cache_dir, args.cache_max_mb * 1024 * 1024, args.cache_max_age_days)
+            page_store = PageTextStore(args.cache_dir, args.page_store_max_mb * 1024 * 1024, args.cache_max_age_days)
+        
+        system = CompleteBridgeParserSystem(args.supabase_url, args.supabase_key, args.log_level,
+                                            parse_cache, page_store, args.backend,
+                                            'upsert' if args.upsert else 'insert',
+                                            None if args.no_cache else args.cache_dir)
         
         # Run tests only
         if args.test_only:
@@ -367,7 +526,15 @@ Examples:
             pdf_directory=args.pdf_directory,
             clear_existing=not args.no_clear,
             test_mode=args.test_mode,
-            max_files=args.max_files
+            max_files=args.max_files,
+            workers=args.workers,
+            pages=args.pages,
+            max_pages=args.max_pages,
+            pipeline=args.pipeline,
+            stage_workers=args.stage_workers,
+            queue_size=args.queue_size,
+            metrics_file=args.metrics_file,
+            progress_stream=args.progress_stream
         )
         
         # Exit with appropriate code
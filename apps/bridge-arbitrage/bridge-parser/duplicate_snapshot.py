@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Duplicate Detection Snapshot
+============================
+
+Local snapshot of the duplicate detector's state, so a new manager reads only
+the code_laws rows changed since the last run instead of the whole table.
+
+Features:
+- One SQLite file per database URL, next to the parse cache
+- Per law: id, law number, content hash and near-duplicate index entry
+  (band keys and compact signature)
+- High-water marks on id and updated_at for the delta query at startup
+- Incremental saves: only the laws added or removed since the last save are
+  written
+- Snapshots written with other signature parameters are ignored
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+@dataclass
+class SnapshotWatermark:
+    max_id: Optional[int] = None
+    max_updated_at: Optional[str] = None
+
+def snapshot_path(cache_dir: str, database_url: str) -> str:
+    database_key = hashlib.sha256(database_url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"duplicates-{database_key}.sqlite3")
+
+class DuplicateSnapshot:
+    def __init__(self, path: str, fingerprint: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        
+        self.path = path
+        self.fingerprint = f"{SNAPSHOT_FORMAT}:{fingerprint}"
+        
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshot_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                fingerprint TEXT NOT NULL,
+                max_id INTEGER,
+                max_updated_at TEXT,
+                saved_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS snapshot_laws (
+                id INTEGER PRIMARY KEY,
+                law_number TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                entry BLOB
+            );
+        """)
+        self.connection.commit()
+    
+    def load(self) -> Optional[Tuple[SnapshotWatermark, List[Tuple[int, str, str, Optional[bytes]]]]]:
+        meta = self.connection.execute(
+            "SELECT fingerprint, max_id, max_updated_at FROM snapshot_meta WHERE id = 1"
+        ).fetchone()
+        
+        if meta is None:
+            return None
+        if meta[0] != self.fingerprint:
+            logger.info(f"🔍 Ignoring duplicate snapshot {self.path} (written with {meta[0]})")
+            return None
+        
+        laws = self.connection.execute("SELECT id, law_number, content_hash, entry FROM snapshot_laws").fetchall()
+        return SnapshotWatermark(meta[1], meta[2]), laws
+    
+    def save(self, watermark: SnapshotWatermark, laws: Iterable[Tuple[int, str, str, Optional[bytes]]],
+             removed_ids: Iterable[int] = (), replace: bool = False):
+        with self.connection:
+            if replace:
+                self.connection.execute("DELETE FROM snapshot_laws")
+            self.connection.executemany("DELETE FROM snapshot_laws WHERE id = ?", ((law_id,) for law_id in removed_ids))
+            self.connection.executemany("INSERT OR REPLACE INTO snapshot_laws VALUES (?, ?, ?, ?)", laws)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO snapshot_meta VALUES (1, ?, ?, ?, ?)",
+                (self.fingerprint, watermark.max_id, watermark.max_updated_at, time.time())
+            )
+    
+    def close(self):
+        self.connection.close()
@@ -23,54 +23,89 @@ import sys
 import re
 import json
 import time
+import hashlib
 import logging
-from typing import Optional, List, Dict, Any, Tuple, Set
-from dataclasses import dataclass, asdict
-from datetime import datetime
+import importlib.util
+from typing import Optional, List, Dict, Any, Tuple, Set, Iterable, Iterator, TYPE_CHECKING
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from bisect import bisect_right
+from itertools import groupby
 import threading
 from queue import Queue
 
-# Progress tracking imports
-try:
-    from tqdm import tqdm
-    HAS_TQDM = True
-except ImportError:
-    HAS_TQDM = False
-    print("⚠️  tqdm not installed. Install with: pip install tqdm")
-
-# Supabase integration
-try:
-    from supabase import create_client, Client
-    HAS_SUPABASE = True
-except ImportError:
-    HAS_SUPABASE = False
-    print("⚠️  supabase not installed. Install with: pip install supabase")
-
-# PDF processing libraries
-PDF_LIBS = {}
-try:
-    import pdfplumber
-    PDF_LIBS['pdfplumber'] = pdfplumber
-except ImportError:
-    pass
-
-try:
-    import PyPDF2
-    PDF_LIBS['pypdf2'] = PyPDF2
-except ImportError:
-    pass
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bridge_parser.log'),
-        logging.StreamHandler()
-    ]
-)
+# Optional dependencies are only looked up here and imported on first use, so that
+# importing the parser (CLI --help, worker processes) does not load them
+HAS_TQDM = importlib.util.find_spec('tqdm') is not None
+HAS_SUPABASE = importlib.util.find_spec('supabase') is not None
+
+# PDF processing libraries: backend name -> module name
+PDF_LIBS = {name: module for name, module in (('pdfplumber', 'pdfplumber'), ('pypdf2', 'PyPDF2'))
+            if importlib.util.find_spec(module) is not None}
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+from parse_cache import ParseCache, PageTextStore, file_digest
+from reference_extractor import REFERENCE_PATTERN, extract_references
+from code_structure import CodeStructure, CodeStructureParser
+from pdf_backends import AdaptiveExtractor, ExtractionReport, BACKEND_CLASSES, merge_report_dicts
+from law_tables import clear_law_tables, has_change_columns
+from local_store import create_storage_client, is_local_url
+from stage_metrics import StageMetrics, write_metrics
+from progress_stream import ProgressStream
+from rate_limiter import RequestLimiter, shared_limiter
+
+# Logging is configured by the entry points (see __main__ below and complete_bridge_parser.py)
 logger = logging.getLogger(__name__)
 
+PARSER_VERSION = '2.3'
+MIN_LAW_CONTENT_LENGTH = 50
+TEST_MODE_MAX_PAGES = 10
+PAGES_PER_SHARD = 40
+PIPELINE_QUEUE_SIZE = 64
+LAW_INSERT_BATCH_SIZE = 100
+SYNC_PAGE_SIZE = 1000
+WRITE_MODES = ('insert', 'upsert')
+PROGRESS_EVENT_INTERVAL = 0.5
+RATE_WINDOW_SECONDS = 1.0
+RATE_SMOOTHING = 0.5
+DEFAULT_STAGE_WORKERS = {'reader': 1, 'extractor': 1, 'validator': 1, 'writer': 2}
+TITLE_PATTERN = re.compile(r'^([^.!?]+[.!?])')
+PAGE_RANGE_PATTERN = re.compile(r'(\d+)\s*(?:(-)\s*(\d+)?)?')
+
+@lru_cache(maxsize=32)
+def _compile_heading_pattern(law_patterns: Tuple[str, ...]) -> 're.Pattern':
+    alternatives = '|'.join(f'(?:{pattern})' for pattern in law_patterns)
+    return re.compile(rf'^[ \t]*(?:{alternatives})[ \t]*[:\-]?[ \t]*', re.MULTILINE | re.IGNORECASE)
+
+def _keyword_trie_regex(keywords: Iterable[str]) -> str:
+    # Keywords folded into a prefix trie so the regex engine never re-tries a shared prefix
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f'(?:{body})?' if '' in node else body
+    
+    return build(trie)
+
+@lru_cache(maxsize=32)
+def _compile_category_matcher(category_keywords: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Tuple['re.Pattern', Dict[str, str]]:
+    keyword_categories = {}
+    for category, keywords in category_keywords:
+        for keyword in keywords:
+            keyword_categories.setdefault(keyword.lower(), category)
+    return re.compile(_keyword_trie_regex(keyword_categories)), keyword_categories
+
 @dataclass
 class LawReference:
     source_law_id: str
@@ -79,18 +114,40 @@ class LawReference:
     context: str
     position: int
 
+@dataclass
+class CategoryMatch:
+    category: str
+    scores: Dict[str, int]
+
 @dataclass
 class ParsedLaw:
     law_number: str
     title: str
     content: str
     category: str
+    # Finer classification within category; the keyword categorizer does not derive one, so None
     subcategory: Optional[str]
     references: List[LawReference]
     source_file: str
     page_number: int
     char_count: int
     created_at: datetime
+    
+    def to_record(self) -> Dict[str, Any]:
+        record = asdict(self)
+        record['created_at'] = self.created_at.isoformat()
+        return record
+    
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'ParsedLaw':
+        data = dict(record)
+        data['references'] = [LawReference(**ref) for ref in record['references']]
+        data['created_at'] = datetime.fromisoformat(record['created_at'])
+        return cls(**data)
 
 @dataclass
 class ProcessingStats:
@@ -101,41 +158,356 @@ class ProcessingStats:
     errors: List[str] = None
     start_time: datetime = None
     end_time: Optional[datetime] = None
+    total_pages: int = 0
+    extraction: Dict[str, Dict[str, Any]] = None
+    stages: Dict[str, Dict[str, Any]] = None
+    write_failures: List[Dict[str, Any]] = None
+    sync: Dict[str, int] = None
+    metrics: StageMetrics = None
+    failed_files: Set[str] = None
     
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
+        if self.failed_files is None:
+            self.failed_files = set()
         if self.start_time is None:
             self.start_time = datetime.now()
+        if self.extraction is None:
+            self.extraction = {}
+        if self.stages is None:
+            self.stages = {}
+        if self.write_failures is None:
+            self.write_failures = []
+        if self.sync is None:
+            self.sync = {}
+        if self.metrics is None:
+            self.metrics = StageMetrics()
+    
+    def record_extraction(self, report: ExtractionReport):
+        self._merge_extraction(report.source_file, report.to_dict())
+    
+    def _merge_extraction(self, source_file: str, report: Dict[str, Any]):
+        if source_file in self.extraction:
+            report = merge_report_dicts(self.extraction[source_file], report)
+        self.extraction[source_file] = report
+    
+    def merge(self, other: 'ProcessingStats'):
+        self.total_files += other.total_files
+        self.processed_files += other.processed_files
+        self.total_laws += other.total_laws
+        self.total_references += other.total_references
+        self.total_pages += other.total_pages
+        self.errors.extend(other.errors)
+        self.failed_files.update(other.failed_files)
+        self.write_failures.extend(other.write_failures)
+        self.metrics.merge(other.metrics)
+        for source_file, report in other.extraction.items():
+            self._merge_extraction(source_file, report)
+    
+    def totals(self) -> Dict[str, int]:
+        return {
+            'files_processed': self.processed_files,
+            'pages': self.total_pages,
+            'laws': self.total_laws,
+            'references': self.total_references,
+            'errors': len(self.errors),
+            'rejected_rows': len(self.write_failures)
+        }
+    
+    def metrics_report(self) -> Dict[str, Any]:
+        return self.metrics.to_dict(self.totals())
+    
+    def export_metrics(self, path: str):
+        # .prom / .txt: Prometheus text format, anything else: JSON
+        write_metrics(path, self.metrics, self.totals())
+
+@dataclass
+class PageSelection:
+    ranges: Optional[List[Tuple[int, Optional[int]]]] = None
+    max_pages: Optional[int] = None
+    
+    @classmethod
+    def parse(cls, pages: Optional[str] = None, max_pages: Optional[int] = None) -> 'PageSelection':
+        if max_pages is not None and max_pages < 1:
+            raise ValueError(f"max_pages must be at least 1, got {max_pages}")
+        
+        if not pages:
+            return cls(None, max_pages)
+        
+        ranges = []
+        for part in pages.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            
+            match = PAGE_RANGE_PATTERN.fullmatch(part)
+            if not match:
+                raise ValueError(f"Invalid page range '{part}' in '{pages}'")
+            
+            first = int(match.group(1))
+            if match.group(2):
+                last = int(match.group(3)) if match.group(3) else None
+            else:
+                last = first
+            
+            if first < 1 or (last is not None and last < first):
+                raise ValueError(f"Invalid page range '{part}' in '{pages}'")
+            
+            ranges.append((first, last))
+        
+        return cls(ranges or None, max_pages)
+    
+    @classmethod
+    def from_page_numbers(cls, page_numbers: List[int]) -> 'PageSelection':
+        ranges = []
+        for page_num in page_numbers:
+            if ranges and ranges[-1][1] == page_num - 1:
+                ranges[-1] = (ranges[-1][0], page_num)
+            else:
+                ranges.append((page_num, page_num))
+        return cls(ranges)
+    
+    def page_numbers(self, total_pages: int) -> Iterator[int]:
+        ranges = sorted(self.ranges) if self.ranges is not None else [(1, None)]
+        selected = 0
+        previous_last = 0
+        
+        for first, last in ranges:
+            first = max(first, previous_last + 1)
+            last = min(last or total_pages, total_pages)
+            
+            for page_num in range(first, last + 1):
+                if self.max_pages is not None and selected >= self.max_pages:
+                    return
+                selected += 1
+                yield page_num
+            
+            previous_last = max(previous_last, last)
+    
+    def __str__(self) -> str:
+        if self.ranges is None:
+            description = "all pages"
+        else:
+            description = ','.join(
+                str(first) if first == last else f"{first}-{last or ''}"
+                for first, last in self.ranges
+            )
+        
+        if self.max_pages is not None:
+            description += f" (max {self.max_pages})"
+        
+        return description
+
+@dataclass
+class ParserConfig:
+    # What a worker process needs to parse like the parser that planned the shard;
+    # the law parser is pickled whole, so custom patterns and subclasses carry over
+    backend: str = 'auto'
+    law_parser: Optional['LawParser'] = None
+    
+    def key(self) -> Tuple[str, str, str]:
+        # The fingerprint only covers the rules, two subclasses sharing them still parse differently
+        if self.law_parser is None:
+            return self.backend, '', ''
+        law_parser_class = type(self.law_parser)
+        return self.backend, f'{law_parser_class.__module__}.{law_parser_class.__qualname__}', self.law_parser.fingerprint()
+
+@dataclass
+class ParseShard:
+    pdf_path: str
+    file_index: int
+    selection: PageSelection
+    page_count: int = 0
+    collect_pages: bool = False
+    backend: Optional[str] = None
+    config: Optional[ParserConfig] = None
+
+@dataclass
+class ShardResult:
+    shard: ParseShard
+    leading: str
+    laws: List[ParsedLaw]
+    open_segment: Optional[Tuple[str, int, str]]
+    stats: ProcessingStats
+    method: Optional[str] = None
+    page_texts: Optional[List[Tuple[int, str]]] = None
+
+@dataclass
+class RowFailure:
+    table: str
+    index: int
+    law_number: str
+    error: str
+
+@dataclass
+class BulkInsertReport:
+    law_ids: List[Optional[int]] = field(default_factory=list)
+    references_inserted: int = 0
+    failures: List[RowFailure] = field(default_factory=list)
+    requests: int = 0
+
+@dataclass
+class SyncReport:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    soft_deleted: int = 0
+    references_inserted: int = 0
+    failures: List[RowFailure] = field(default_factory=list)
+    requests: int = 0
+    
+    def counts(self) -> Dict[str, int]:
+        return {
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'soft_deleted': self.soft_deleted
+        }
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    processed: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    max_queue_depth: int = 0
+    finished_workers: int = 0
 
 class ProgressTracker:
-    def __init__(self, total_items: int, description: str = "Processing"):
+    # Progress in work units (pages for a directory run) with smoothed rates:
+    # a 300-page Code and a 5-page annex weigh what they cost, not one file each.
+    def __init__(self, total_items: int, description: str = "Processing", unit: str = "items",
+                 stream: Optional[ProgressStream] = None, total_files: int = 0):
         self.total_items = total_items
         self.current_item = 0
         self.description = description
+        self.unit = unit
+        self.stream = stream
+        self.total_files = total_files
+        self.files_done = 0
+        self.laws = 0
+        self.rows = 0
         self.start_time = time.time()
         self.use_tqdm = HAS_TQDM
+        self.rates = {'items': 0.0, 'laws': 0.0, 'rows': 0.0}
+        self._file_items: Dict[str, List[int]] = {}
+        self._current_file = ''
+        self._lock = threading.RLock()
+        self._rate_mark = (self.start_time, 0, 0, 0)
+        self._last_event = 0.0
         
         if self.use_tqdm:
-            self.pbar = tqdm(total=total_items, desc=description, unit="items")
+            from tqdm import tqdm
+            self.pbar = tqdm(total=total_items, desc=description, unit=unit)
         else:
             self.last_percent = -1
             print(f"🚀 {description}: Starting...")
+        self._emit('start', 'parsing')
     
     def update(self, increment: int = 1, item_name: str = ""):
-        self.current_item += increment
+        with self._lock:
+            self.current_item += increment
+            self._update_rates()
+            
+            if self.use_tqdm:
+                self.pbar.update(increment)
+                self.pbar.set_postfix_str(self._rate_summary() + (f", {item_name}" if item_name else ""))
+            else:
+                percent = int((self.current_item / self.total_items) * 100) if self.total_items else 100
+                if percent >= self.last_percent + 5:
+                    print(f"📊 {self.description}: {percent}% ({self.current_item}/{self.total_items} {self.unit}) - "
+                          f"{self._rate_summary()} - ETA: {self.eta():.1f}s")
+                    self.last_percent = percent
+            
+            if time.time() - self._last_event >= PROGRESS_EVENT_INTERVAL:
+                self._emit('progress', 'parsing')
+    
+    def start_file(self, filename: str, items: int):
+        with self._lock:
+            self._file_items[filename] = [items, 0]
+            self._current_file = filename
+        self.set_description(f"Processing {filename}")
+    
+    def advance_file(self, filename: str, items: int = 1):
+        with self._lock:
+            planned, done = self._file_items.setdefault(filename, [0, 0])
+            # Never beyond the planned count: the rest is settled by finish_file
+            step = max(0, min(items, planned - done))
+            self._file_items[filename][1] = done + step
+            self._current_file = filename
+            if step:
+                self.update(step)
+    
+    def finish_file(self, filename: str, item_name: str = ""):
+        with self._lock:
+            planned, done = self._file_items.pop(filename, [0, 0])
+            self.files_done += 1
+            self.update(max(0, planned - done), item_name)
+            self._emit('file', 'parsing', file=filename, summary=item_name)
+    
+    def add_laws(self, count: int = 1):
+        with self._lock:
+            self.laws += count
+    
+    def add_rows(self, count: int):
+        with self._lock:
+            self.rows += count
+    
+    def eta(self) -> float:
+        remaining = self.total_items - self.current_item
+        if remaining <= 0:
+            return 0.0
+        if self.rates['items'] > 0:
+            return remaining / self.rates['items']
+        elapsed = time.time() - self.start_time
+        return (elapsed / self.current_item) * remaining if self.current_item > 0 else 0.0
+    
+    def _update_rates(self):
+        # Exponential moving average over windows of at least RATE_WINDOW_SECONDS
+        now = time.time()
+        mark_time, mark_items, mark_laws, mark_rows = self._rate_mark
+        window = now - mark_time
+        if window < RATE_WINDOW_SECONDS:
+            return
         
-        if self.use_tqdm:
-            self.pbar.update(increment)
-            if item_name:
-                self.pbar.set_postfix_str(item_name)
-        else:
-            percent = int((self.current_item / self.total_items) * 100)
-            if percent >= self.last_percent + 5:
-                elapsed = time.time() - self.start_time
-                eta = (elapsed / self.current_item) * (self.total_items - self.current_item) if self.current_item > 0 else 0
-                print(f"📊 {self.description}: {percent}% ({self.current_item}/{self.total_items}) - ETA: {eta:.1f}s")
-                self.last_percent = percent
+        for name, current, previous in (('items', self.current_item, mark_items), ('laws', self.laws, mark_laws),
+                                        ('rows', self.rows, mark_rows)):
+            rate = (current - previous) / window
+            self.rates[name] = rate if mark_time == self.start_time else (
+                RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * self.rates[name])
+        self._rate_mark = (now, self.current_item, self.laws, self.rows)
+    
+    def _rate_summary(self) -> str:
+        return (f"{self.rates['items']:.1f} {self.unit}/s, {self.rates['laws']:.1f} laws/s, "
+                f"{self.rates['rows']:.1f} rows/s")
+    
+    def _emit(self, event: str, status: str, **extra):
+        if not self.stream:
+            return
+        self._last_event = time.time()
+        self.stream.emit({
+            'event': event,
+            'status': status,
+            'description': self.description,
+            'current_file': self._current_file,
+            'unit': self.unit,
+            'done': self.current_item,
+            'total': self.total_items,
+            'progress_percentage': round(100 * self.current_item / self.total_items, 1) if self.total_items else 100.0,
+            'files_done': self.files_done,
+            'files_total': self.total_files,
+            'laws': self.laws,
+            'rows': self.rows,
+            f'{self.unit}_per_sec': round(self.rates['items'], 2),
+            'laws_per_sec': round(self.rates['laws'], 2),
+            'rows_per_sec': round(self.rates['rows'], 2),
+            'elapsed_seconds': round(self._last_event - self.start_time, 1),
+            'eta_seconds': round(self.eta(), 1),
+            'last_updated': datetime.now().isoformat(),
+            **extra
+        })
     
     def set_description(self, desc: str):
         if self.use_tqdm:
@@ -143,88 +515,305 @@ class ProgressTracker:
         else:
             print(f"🔄 {desc}")
     
-    def close(self):
-        if self.use_tqdm:
-            self.pbar.close()
-        else:
-            elapsed = time.time() - self.start_time
-            print(f"✅ {self.description}: Completed in {elapsed:.1f}s")
+    def close(self, status: str = 'completed', error_message: Optional[str] = None):
+        with self._lock:
+            if self.use_tqdm:
+                self.pbar.close()
+            else:
+                elapsed = time.time() - self.start_time
+                if status == 'error':
+                    print(f"❌ {self.description}: Failed after {elapsed:.1f}s")
+                else:
+                    print(f"✅ {self.description}: Completed in {elapsed:.1f}s")
+            
+            self._emit('done', status, **({'error_message': error_message} if error_message else {}))
+            if self.stream:
+                self.stream.close()
 
 class DatabaseManager:
+    limiter: Optional[RequestLimiter] = None
+    # True when code_laws predates the deleted_at/updated_at migrations
+    legacy_schema = False
+    
     def __init__(self, supabase_url: str, supabase_key: str):
-        if not HAS_SUPABASE:
+        if not HAS_SUPABASE and not is_local_url(supabase_url):
             raise ImportError("Supabase client not available. Install with: pip install supabase")
         
-        self.client: Client = create_client(supabase_url, supabase_key)
+        self.client: 'Client' = create_storage_client(supabase_url, supabase_key)
+        self.limiter = shared_limiter(supabase_url)
+        self.metrics = StageMetrics()
         self.setup_enhanced_schema()
     
     def setup_enhanced_schema(self):
         logger.info("🗄️  Setting up enhanced database schema...")
+        self.legacy_schema = not has_change_columns(self.client, self._execute)
         logger.info("✅ Database schema ready")
     
     def clear_table(self, table_name: str) -> int:
+        return self.clear_tables([table_name])[table_name]
+    
+    def clear_tables(self, table_names: List[str]) -> Dict[str, int]:
+        self.metrics.count('http_requests')
         try:
-            result = self.client.table(table_name).delete().neq('id', 0).execute()
-            count = len(result.data) if result.data else 0
-            logger.info(f"🗑️  Cleared {count} records from {table_name}")
-            return count
+            counts = clear_law_tables(self.client, table_names)
         except Exception as e:
-            logger.error(f"❌ Error clearing {table_name}: {e}")
-            return 0
+            logger.error(f"❌ Error clearing {', '.join(table_names)}: {e}")
+            return {table_name: 0 for table_name in table_names}
+        
+        for table_name, count in counts.items():
+            logger.info(f"🗑️  Cleared {count} records from {table_name}")
+        return counts
     
     def insert_law(self, law: ParsedLaw) -> Optional[int]:
-        try:
-            law_data = {
-                'law_number': law.law_number,
-                'title': law.title,
-                'content': law.content,
-                'category': law.category,
-                'subcategory': law.subcategory,
-                'source_file': law.source_file,
-                'page_number': law.page_number,
-                'char_count': law.char_count
-            }
+        return self.insert_laws([law]).law_ids[0]
+    
+    def insert_laws(self, laws: List[ParsedLaw], batch_size: int = LAW_INSERT_BATCH_SIZE,
+                    with_hash: bool = False) -> BulkInsertReport:
+        report = BulkInsertReport()
+        
+        for start in range(0, len(laws), batch_size):
+            batch = laws[start:start + batch_size]
+            rows = [self._law_row(law, with_hash) for law in batch]
+            labels = [(start + offset, law.law_number) for offset, law in enumerate(batch)]
             
-            result = self.client.table('code_laws').insert(law_data).execute()
-            if result.data:
-                law_id = result.data[0]['id']
-                
-                for ref in law.references:
-                    ref_data = {
-                        'source_law_id': law_id,
-                        'target_law_number': ref.target_law_number,
-                        'target_law_title': ref.target_law_title,
-                        'context': ref.context,
-                        'position': ref.position
-                    }
-                    self.client.table('law_references').insert(ref_data).execute()
-                
-                return law_id
+            # PostgREST returns inserted rows in the order they were sent
+            inserted = self._insert_rows('code_laws', rows, labels, report)
+            law_ids = [row['id'] if row else None for row in inserted]
+            report.law_ids.extend(law_ids)
+            
+            report.references_inserted += self._insert_references(zip(labels, batch, law_ids), report)
+        
+        for failure in report.failures:
+            logger.error(f"❌ Error inserting {failure.table} row for law {failure.law_number}: {failure.error}")
+        
+        return report
+    
+    def begin_sync(self, source_files: List[str]) -> 'LawSyncSession':
+        if self.legacy_schema:
+            raise RuntimeError("Upsert mode needs code_laws.deleted_at and updated_at: apply migrations 20250715 and 20250717")
+        return LawSyncSession(self, self._load_sync_rows(source_files))
+    
+    def _load_sync_rows(self, source_files: List[str]) -> List[Dict[str, Any]]:
+        rows = []
+        if not source_files:
+            return rows
+        
+        while True:
+            result = self._execute(self.client.table('code_laws')
+                .select('id, source_file, law_number, content_hash, title, category, subcategory, page_number, deleted_at')
+                .in_('source_file', source_files)
+                .order('id')
+                .range(len(rows), len(rows) + SYNC_PAGE_SIZE - 1))
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < SYNC_PAGE_SIZE:
+                return rows
+    
+    def _law_row(self, law: ParsedLaw, with_hash: bool = False) -> Dict[str, Any]:
+        row = {
+            'law_number': law.law_number,
+            'title': law.title,
+            'content': law.content,
+            'category': law.category,
+            'subcategory': law.subcategory,
+            'source_file': law.source_file,
+            'page_number': law.page_number,
+            'char_count': law.char_count
+        }
+        if with_hash:
+            row['content_hash'] = law.content_hash
+        return row
+    
+    def _insert_references(self, entries: Iterable[Tuple[Tuple[int, str], ParsedLaw, Optional[int]]],
+                           report) -> int:
+        ref_rows = []
+        ref_labels = []
+        for (index, law_number), law, law_id in entries:
+            if law_id is None:
+                continue
+            for ref in law.references:
+                ref_rows.append({
+                    'source_law_id': law_id,
+                    'target_law_number': ref.target_law_number,
+                    'target_law_title': ref.target_law_title,
+                    'context': ref.context,
+                    'position': ref.position
+                })
+                ref_labels.append((index, law_number))
+        
+        return sum(1 for row in self._insert_rows('law_references', ref_rows, ref_labels, report) if row)
+    
+    def _insert_rows(self, table: str, rows: List[Dict[str, Any]], labels: List[Tuple[int, str]],
+                     report, upsert: bool = False) -> List[Optional[Dict[str, Any]]]:
+        if not rows:
+            return []
+        
+        report.requests += 1
+        try:
+            query = self.client.table(table)
+            query = query.upsert(rows, on_conflict='id') if upsert else query.insert(rows)
+            result = self._execute(query)
         except Exception as e:
-            logger.error(f"❌ Error inserting law {law.law_number}: {e}")
-        return None
+            if len(rows) == 1:
+                report.failures.append(RowFailure(table, labels[0][0], labels[0][1], str(e)))
+                return [None]
+            # One bad row rejects the whole statement: split until the failing rows are isolated
+            middle = len(rows) // 2
+            return (self._insert_rows(table, rows[:middle], labels[:middle], report, upsert)
+                    + self._insert_rows(table, rows[middle:], labels[middle:], report, upsert))
+        
+        data = result.data or []
+        if len(data) != len(rows):
+            # Written but not returned (e.g. RLS on select): retrying would duplicate them
+            for index, law_number in labels:
+                report.failures.append(RowFailure(table, index, law_number, "row not returned by insert"))
+            return [None] * len(rows)
+        
+        return data
     
     def get_law_by_number(self, law_number: str) -> Optional[Dict]:
         try:
-            result = self.client.table('code_laws').select('*').eq('law_number', law_number).execute()
+            result = self._execute(self.live(self.client.table('code_laws').select('*').eq('law_number', law_number)))
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"❌ Error retrieving law {law_number}: {e}")
             return None
+    
+    def live(self, query, column: str = 'deleted_at'):
+        # Soft-deleted rows filtered out, when the schema has soft deletes at all
+        return query if self.legacy_schema else query.is_(column, 'null')
+    
+    def _execute(self, query):
+        # Every PostgREST round trip of the parser goes through here
+        self.metrics.count('http_requests')
+        return self.limiter.execute(query) if self.limiter else query.execute()
+
+class LawSyncSession:
+    # Upsert mode: rows are matched on (source_file, law_number, content_hash).
+    # Unchanged rows cost nothing, changed rows are updated in place (ids stay
+    # stable for links), and rows not seen again are soft-deleted at the end.
+    def __init__(self, db_manager: DatabaseManager, existing_rows: List[Dict[str, Any]]):
+        self.db_manager = db_manager
+        self.report = SyncReport()
+        self._existing: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._seen: Set[int] = set()
+        self._lock = threading.Lock()
+        
+        # Live rows first, so a changed law takes over its current row rather than a deleted one
+        for row in sorted(existing_rows, key=lambda row: row['deleted_at'] is not None):
+            self._existing.setdefault((row['source_file'], row['law_number']), []).append(row)
+        
+        logger.info(f"♻️  Upsert mode: {len(existing_rows)} existing rows loaded")
+    
+    def apply(self, laws: List[ParsedLaw]) -> SyncReport:
+        report = SyncReport()
+        fresh = []
+        updates = []
+        
+        with self._lock:
+            for law in laws:
+                candidates = [row for row in self._existing.get((law.source_file, law.law_number), [])
+                              if row['id'] not in self._seen]
+                row = next((row for row in candidates if row['content_hash'] == law.content_hash), None)
+                
+                if row is not None:
+                    self._seen.add(row['id'])
+                    if row['deleted_at'] is None and all(row[key] == value for key, value in self._metadata(law).items()):
+                        report.unchanged += 1
+                    else:
+                        updates.append((row['id'], law, False))
+                elif candidates:
+                    self._seen.add(candidates[0]['id'])
+                    updates.append((candidates[0]['id'], law, True))
+                else:
+                    fresh.append(law)
+        
+        if updates:
+            self._update(updates, report)
+        
+        if fresh:
+            inserted = self.db_manager.insert_laws(fresh, with_hash=True)
+            report.inserted += sum(1 for law_id in inserted.law_ids if law_id is not None)
+            report.references_inserted += inserted.references_inserted
+            report.failures.extend(inserted.failures)
+            report.requests += inserted.requests
+        
+        with self._lock:
+            self._add(report)
+        return report
+    
+    def finish(self, source_files: Iterable[str]) -> SyncReport:
+        source_files = set(source_files)
+        vanished = [row['id'] for rows in self._existing.values() for row in rows
+                    if row['source_file'] in source_files and row['deleted_at'] is None and row['id'] not in self._seen]
+        # updated_at is also bumped by the code_laws trigger; set here for stores without it
+        deleted_at = datetime.now(timezone.utc).isoformat()
+        
+        for start in range(0, len(vanished), LAW_INSERT_BATCH_SIZE):
+            ids = vanished[start:start + LAW_INSERT_BATCH_SIZE]
+            self.report.requests += 1
+            try:
+                self.db_manager._execute(self.db_manager.client.table('code_laws').update({'deleted_at': deleted_at, 'updated_at': deleted_at}).in_('id', ids))
+                self.report.soft_deleted += len(ids)
+            except Exception as e:
+                logger.error(f"❌ Error soft-deleting {len(ids)} laws: {e}")
+                self.report.failures.extend(RowFailure('code_laws', law_id, '', str(e)) for law_id in ids)
+        
+        return self.report
+    
+    def _metadata(self, law: ParsedLaw) -> Dict[str, Any]:
+        return {
+            'title': law.title,
+            'category': law.category,
+            'subcategory': law.subcategory,
+            'page_number': law.page_number
+        }
+    
+    def _update(self, updates: List[Tuple[int, ParsedLaw, bool]], report: SyncReport):
+        updated_at = datetime.now(timezone.utc).isoformat()
+        rows = [{'id': law_id, **self.db_manager._law_row(law, with_hash=True), 'deleted_at': None, 'updated_at': updated_at}
+                for law_id, law, _ in updates]
+        labels = [(law_id, law.law_number) for law_id, law, _ in updates]
+        updated = self.db_manager._insert_rows('code_laws', rows, labels, report, upsert=True)
+        report.updated += sum(1 for row in updated if row)
+        
+        # References derive from the content: replace them only where the content changed
+        changed = [(label, law, law_id) for (law_id, law, content_changed), label, row
+                   in zip(updates, labels, updated) if content_changed and row]
+        if not changed:
+            return
+        
+        report.requests += 1
+        try:
+            self.db_manager._execute(self.db_manager.client.table('law_references').delete()
+                                     .in_('source_law_id', [law_id for _, _, law_id in changed]))
+        except Exception as e:
+            logger.error(f"❌ Error replacing references of {len(changed)} laws: {e}")
+            report.failures.extend(RowFailure('law_references', law_id, law.law_number, str(e))
+                                   for _, law, law_id in changed)
+            return
+        report.references_inserted += self.db_manager._insert_references(changed, report)
+    
+    def _add(self, report: SyncReport):
+        self.report.inserted += report.inserted
+        self.report.updated += report.updated
+        self.report.unchanged += report.unchanged
+        self.report.references_inserted += report.references_inserted
+        self.report.failures.extend(report.failures)
+        self.report.requests += report.requests
 
 class LawParser:
     def __init__(self):
+        # Heading patterns: each captures the law number only, the content is
+        # the text sliced between one heading and the next.
         self.law_patterns = [
-            r'(?:Article|Art\.?)\s*(\d+(?:\.\d+)*)\s*[:\-]?\s*(.+?)(?=(?:Article|Art\.?)\s*\d+|$)',
-            r'(\d+(?:\.\d+)+)\s*[:\-]\s*(.+?)(?=\d+(?:\.\d+)+|$)',
-            r'(?:Law|Rule)\s*(\d+(?:[A-Z])?)\s*[:\-]?\s*(.+?)(?=(?:Law|Rule)\s*\d+|$)',
+            r'(?:Article|Art\.?)\s*(\d+(?:\.\d+)*)',
+            r'(\d+(?:\.\d+)+)(?=\s*[:\-])',
+            r'(?:Law|Rule)\s*(\d+(?:[A-Z])?)',
         ]
         
-        self.reference_patterns = [
-            r'(?:article|art\.?|loi|law|rule)\s*(\d+(?:\.\d+)*(?:[A-Z])?)',
-            r'(?:voir|see|cf\.?)\s*(?:article|art\.?|loi|law)\s*(\d+(?:\.\d+)*)',
-            r'(?:selon|according to)\s*(?:l\')?(?:article|art\.?)\s*(\d+(?:\.\d+)*)',
-        ]
+        # Reference kinds stored as law_references; section references are only linked at render time
+        self.reference_kinds = ['article', 'law']
         
         self.category_keywords = {
             'bidding': ['enchère', 'enchere', 'bid', 'auction', 'annonce'],
@@ -236,89 +825,201 @@ class LawParser:
             'tournament': ['tournoi', 'tournament', 'compétition', 'competition']
         }
     
+    def fingerprint(self) -> str:
+        # Any change to the rules invalidates parse cache entries built with the old ones
+        payload = json.dumps(
+            [PARSER_VERSION, MIN_LAW_CONTENT_LENGTH, self.law_patterns, REFERENCE_PATTERN.pattern,
+             self.reference_kinds, self.category_keywords],
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+    
     def extract_laws_from_text(self, text: str, source_file: str, page_number: int) -> List[ParsedLaw]:
         laws = []
         
-        for pattern in self.law_patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                law_number = match.group(1).strip()
-                content = match.group(2).strip()
-                
-                if len(content) < 50:
-                    continue
-                
-                title_match = re.match(r'^([^.!?]+[.!?])', content)
-                title = title_match.group(1).strip() if title_match else content[:100] + "..."
-                
-                category = self._categorize_law(content)
-                references = self._find_references(content, law_number)
-                
-                law = ParsedLaw(
-                    law_number=law_number,
-                    title=title,
-                    content=content,
-                    category=category,
-                    subcategory=None,
-                    references=references,
-                    source_file=source_file,
-                    page_number=page_number,
-                    char_count=len(content),
-                    created_at=datetime.now()
-                )
-                
+        for law_number, content in self._segment_text(text):
+            law = self.build_law(law_number, content, source_file, page_number)
+            if law:
                 laws.append(law)
         
         return laws
     
+    def _heading_pattern(self) -> 're.Pattern':
+        return _compile_heading_pattern(tuple(self.law_patterns))
+    
+    def _category_matcher(self) -> Tuple['re.Pattern', Dict[str, str]]:
+        return _compile_category_matcher(tuple(
+            (category, tuple(keywords)) for category, keywords in self.category_keywords.items()
+        ))
+    
+    def iter_laws_from_pages(self, pages: Iterable[Tuple[int, str]], source_file: str) -> Iterator[ParsedLaw]:
+        for law_number, page_number, content in self.iter_page_segments(pages):
+            if law_number is None:
+                continue
+            
+            law = self.build_law(law_number, content, source_file, page_number)
+            if law:
+                yield law
+    
+    def iter_page_segments(self, pages: Iterable[Tuple[int, str]]) -> Iterator[Tuple[Optional[str], int, str]]:
+        # The last segment of a page stays open until the next heading shows up,
+        # so laws continuing onto the following page(s) are kept whole. The first
+        # segment carries the text preceding the first heading (law_number None).
+        pending_number = None
+        pending_page = 0
+        pending_chunks: List[str] = []
+        
+        for page_number, text in pages:
+            leading, segments = self._split_page(text)
+            
+            if pending_chunks:
+                pending_chunks.append('\n' + leading)
+            else:
+                pending_page = page_number
+                pending_chunks = [leading]
+            
+            if not segments:
+                continue
+            
+            yield pending_number, pending_page, ''.join(pending_chunks)
+            
+            for law_number, content in segments[:-1]:
+                yield law_number, page_number, content
+            
+            pending_number, pending_content = segments[-1]
+            pending_page = page_number
+            pending_chunks = [pending_content]
+        
+        if pending_chunks:
+            yield pending_number, pending_page, ''.join(pending_chunks)
+    
+    def _segment_text(self, text: str) -> List[Tuple[str, str]]:
+        return self._split_page(text)[1]
+    
+    def _split_page(self, text: str) -> Tuple[str, List[Tuple[str, str]]]:
+        headings = list(self._heading_pattern().finditer(text))
+        leading = text[:headings[0].start()] if headings else text
+        segments = []
+        
+        for index, heading in enumerate(headings):
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(text)
+            law_number = next(group for group in heading.groups() if group is not None)
+            segments.append((law_number.strip(), text[heading.end():end]))
+        
+        return leading, segments
+    
+    def build_law(self, law_number: str, content: str, source_file: str, page_number: int) -> Optional[ParsedLaw]:
+        content = content.strip()
+        
+        if len(content) < MIN_LAW_CONTENT_LENGTH:
+            return None
+        
+        title_match = TITLE_PATTERN.match(content)
+        title = title_match.group(1).strip() if title_match else content[:100] + "..."
+        
+        category = self.categorize(content)
+        
+        return ParsedLaw(
+            law_number=law_number,
+            title=title,
+            content=content,
+            category=category.category,
+            subcategory=None,
+            references=self._find_references(content, law_number),
+            source_file=source_file,
+            page_number=page_number,
+            char_count=len(content),
+            created_at=datetime.now()
+        )
+    
     def _categorize_law(self, content: str) -> str:
-        content_lower = content.lower()
+        return self.categorize(content).category
+    
+    def categorize(self, content: str) -> CategoryMatch:
+        pattern, keyword_categories = self._category_matcher()
+        scores = {}
+        
+        for match in pattern.finditer(content.lower()):
+            category = keyword_categories[match.group(0)]
+            scores[category] = scores.get(category, 0) + 1
+        
+        return self._rank_categories(scores)
+    
+    def categorize_batch(self, contents: List[str]) -> List[CategoryMatch]:
+        # Single scan over all texts joined by NUL; hit offsets are mapped back with bisect
+        pattern, keyword_categories = self._category_matcher()
+        lowered = [content.lower() for content in contents]
+        starts = []
+        offset = 0
+        for content in lowered:
+            starts.append(offset)
+            offset += len(content) + 1
         
-        for category, keywords in self.category_keywords.items():
-            if any(keyword in content_lower for keyword in keywords):
-                return category
+        scores = [{} for _ in contents]
+        for match in pattern.finditer('\x00'.join(lowered)):
+            index = bisect_right(starts, match.start()) - 1
+            category = keyword_categories[match.group(0)]
+            scores[index][category] = scores[index].get(category, 0) + 1
         
-        return 'general'
+        return [self._rank_categories(law_scores) for law_scores in scores]
+    
+    def _rank_categories(self, scores: Dict[str, int]) -> CategoryMatch:
+        # Highest count wins; ties keep category_keywords order
+        order = list(self.category_keywords)
+        ranked = sorted(scores, key=lambda category: (-scores[category], order.index(category)))
+        
+        if not ranked:
+            return CategoryMatch(category='general', scores={})
+        
+        return CategoryMatch(category=ranked[0], scores={category: scores[category] for category in ranked})
     
     def _find_references(self, content: str, source_law_number: str) -> List[LawReference]:
         references = []
         
-        for pattern in self.reference_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            
-            for match in matches:
-                target_law = match.group(1)
-                if target_law != source_law_number:
-                    start = max(0, match.start() - 50)
-                    end = min(len(content), match.end() + 50)
-                    context = content[start:end].strip()
-                    
-                    ref = LawReference(
-                        source_law_id=source_law_number,
-                        target_law_number=target_law,
-                        target_law_title=None,
-                        context=context,
-                        position=match.start()
-                    )
-                    references.append(ref)
+        for span in extract_references(content):
+            if span.kind in self.reference_kinds and span.law_number != source_law_number:
+                references.append(LawReference(
+                    source_law_id=source_law_number,
+                    target_law_number=span.law_number,
+                    target_law_title=None,
+                    context=span.context(content, 50),
+                    position=span.start
+                ))
         
         return references
 
 class EnhancedBridgePDFParser:
-    def __init__(self, supabase_url: str = None, supabase_key: str = None):
+    def __init__(self, supabase_url: str = None, supabase_key: str = None, parse_cache: Optional[ParseCache] = None,
+                 page_store: Optional[PageTextStore] = None, backend: str = 'auto', write_mode: str = 'insert'):
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"Unknown write mode: {write_mode}")
+        
         self.db_manager = None
         if supabase_url and supabase_key:
             self.db_manager = DatabaseManager(supabase_url, supabase_key)
         
         self.law_parser = LawParser()
+        self.parse_cache = parse_cache
+        self.page_store = page_store
         self.stats = ProcessingStats()
         
         self.available_methods = list(PDF_LIBS.keys())
         if not self.available_methods:
             raise RuntimeError("No PDF parsing libraries available. Install pdfplumber or PyPDF2.")
+        if backend != 'auto' and backend not in self.available_methods:
+            raise ValueError(f"PDF backend not available: {backend}")
+        
+        # 'auto' samples every library per file; a named backend is tried first on every page
+        self.backend = backend
+        self.extraction_methods = [backend]
+        self._backend_choices: Dict[str, str] = {}
+        self._stats_lock = threading.Lock()
+        self._pending_laws: List[ParsedLaw] = []
+        self.write_mode = write_mode
+        self._sync: Optional[LawSyncSession] = None
+        self._progress: Optional[ProgressTracker] = None
         
-        logger.info(f"🔧 Available parsing methods: {', '.join(self.available_methods)}")
+        logger.info(f"🔧 Available parsing methods: {', '.join(self.available_methods)} (backend: {backend})")
     
     def clear_existing_data(self, tables: List[str] = None):
         if not self.db_manager:
@@ -329,135 +1030,552 @@ class EnhancedBridgePDFParser:
             tables = ['code_laws', 'law_references', 'rnc_articles', 'conventions']
         
         logger.info("🗑️  Clearing existing data...")
-        for table in tables:
-            self.db_manager.clear_table(table)
+        self.db_manager.clear_tables(tables)
+    
+    def parse_pdf_file(self, pdf_path: str, pages: Optional[str] = None, max_pages: Optional[int] = None) -> List[ParsedLaw]:
+        return list(self.iter_pdf_laws(pdf_path, PageSelection.parse(pages, max_pages)))
     
-    def parse_pdf_file(self, pdf_path: str) -> List[ParsedLaw]:
+    def iter_pdf_laws(self, pdf_path: str, selection: Optional[PageSelection] = None) -> Iterator[ParsedLaw]:
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         logger.info(f"📄 Parsing: {os.path.basename(pdf_path)}")
+        filename = os.path.basename(pdf_path)
+        selection = selection or PageSelection()
+        
+        cached = self._load_cached(pdf_path, selection)
+        if cached is not None:
+            self.stats.total_pages += cached['page_count']
+            for record in cached['records']:
+                yield ParsedLaw.from_record(record)
+            return
         
-        for method in self.available_methods:
+        for method in self.extraction_methods:
+            yielded = 0
+            page_stats = ProcessingStats()
+            records = [] if self.parse_cache else None
             try:
-                if method == 'pdfplumber':
-                    return self._parse_with_pdfplumber(pdf_path)
-                elif method == 'pypdf2':
-                    return self._parse_with_pypdf2(pdf_path)
+                pages = self._tally_pages(self._iter_pages(method, pdf_path, selection, stats=page_stats), page_stats,
+                                          filename)
+                laws = page_stats.metrics.time_transform(
+                    'parse', pages, lambda pages: self.law_parser.iter_laws_from_pages(pages, filename))
+                for law in laws:
+                    yielded += 1
+                    if records is not None:
+                        records.append(law.to_record())
+                    yield law
+                self.stats.merge(page_stats)
+                
+                if records is not None:
+                    self.parse_cache.put(file_digest(pdf_path), self._cache_key(selection), filename,
+                                         page_stats.total_pages, records)
+                return
             except Exception as e:
+                if yielded:
+                    # Laws already went downstream, restarting would duplicate them
+                    raise
                 logger.warning(f"⚠️  Method {method} failed: {e}")
                 continue
         
         raise RuntimeError(f"All parsing methods failed for {pdf_path}")
     
-    def _parse_with_pdfplumber(self, pdf_path: str) -> List[ParsedLaw]:
-        import pdfplumber
+    def build_code_structure(self, pdf_path: str, selection: Optional[PageSelection] = None,
+                             **options) -> CodeStructure:
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
-        all_laws = []
-        filename = os.path.basename(pdf_path)
+        selection = selection or PageSelection()
+        
+        for method in self.extraction_methods:
+            try:
+                structure = CodeStructureParser(**options).parse(self._iter_pages(method, pdf_path, selection))
+                logger.info(f"🌳 Code structure: {os.path.basename(pdf_path)} ({len(structure)} nodes)")
+                return structure
+            except Exception as e:
+                logger.warning(f"⚠️  Method {method} failed: {e}")
+        
+        raise RuntimeError(f"All parsing methods failed for {pdf_path}")
+    
+    def _load_cached(self, pdf_path: str, selection: PageSelection) -> Optional[Dict[str, Any]]:
+        if not self.parse_cache:
+            return None
+        
+        cached = self.parse_cache.get(file_digest(pdf_path), self._cache_key(selection))
+        if cached is not None:
+            logger.info(f"⚡ Parse cache hit: {os.path.basename(pdf_path)} ({len(cached['records'])} laws)")
+        return cached
+    
+    def _cache_key(self, selection: PageSelection) -> str:
+        return f"{self.law_parser.fingerprint()}:{selection}"
+    
+    def _needs_extraction(self, pdf_path: str, selection: PageSelection) -> bool:
+        file_sha256 = None
+        
+        if self.parse_cache:
+            file_sha256 = file_digest(pdf_path)
+            if self.parse_cache.contains(file_sha256, self._cache_key(selection)):
+                return False
+        
+        if self.page_store:
+            file_sha256 = file_sha256 or file_digest(pdf_path)
+            return self._stored_page_numbers(file_sha256, self.backend, selection) is None
+        
+        return True
+    
+    def _stored_page_numbers(self, file_sha256: str, method: str, selection: PageSelection) -> Optional[List[int]]:
+        document = self.page_store.get_document(file_sha256, method)
+        if document is None:
+            return None
+        
+        page_numbers = list(selection.page_numbers(document['page_count']))
+        if any(page_num not in document['pages'] for page_num in page_numbers):
+            return None
+        
+        return page_numbers
+    
+    def _iter_pages(self, method: str, pdf_path: str, selection: Optional[PageSelection] = None,
+                    raw_pages: Optional[List[Tuple[int, str]]] = None,
+                    stats: Optional[ProcessingStats] = None) -> Iterator[Tuple[int, str]]:
+        selection = selection or PageSelection()
         
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
+        if self.page_store:
+            file_sha256 = file_digest(pdf_path)
+            page_numbers = self._stored_page_numbers(file_sha256, method, selection)
             
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text() or ''
-                if text.strip():
-                    laws = self.law_parser.extract_laws_from_text(text, filename, page_num)
-                    all_laws.extend(laws)
-                    
-                    if page_num <= 10:
-                        logger.info(f"📖 Page {page_num}/{total_pages}: Found {len(laws)} laws")
-                    
-                    if page_num >= 10:
-                        logger.info(f"🛑 Stopping at page {page_num} (testing limit)")
-                        break
+            if page_numbers is not None:
+                pages = self.page_store.iter_pages(file_sha256, method, page_numbers)
+            else:
+                pages = self._write_through(file_sha256, method, pdf_path,
+                                            self._extract_pages(method, pdf_path, selection, stats))
+        else:
+            pages = self._extract_pages(method, pdf_path, selection, stats)
+        
+        return self._non_empty_pages(pages, raw_pages)
+    
+    def _extract_pages(self, method: str, pdf_path: str, selection: PageSelection,
+                       stats: Optional[ProcessingStats] = None) -> Iterator[Tuple[int, str]]:
+        preferred = self._backend_choices.get(pdf_path) if method == 'auto' else method
+        
+        with AdaptiveExtractor(pdf_path, self.available_methods, preferred) as extractor:
+            if stats is None:
+                yield from extractor.iter_pages(selection)
+            else:
+                for page_num, text in stats.metrics.time_items('extract_text', extractor.iter_pages(selection)):
+                    stats.metrics.count('pages_extracted')
+                    stats.metrics.count('text_bytes', len(text.encode('utf-8')))
+                    yield page_num, text
         
-        return all_laws
+        if stats is not None:
+            stats.record_extraction(extractor.report)
+    
+    def probe_backend(self, pdf_path: str, selection: Optional[PageSelection] = None) -> str:
+        selection = selection or PageSelection()
+        
+        with AdaptiveExtractor(pdf_path, self.available_methods) as extractor:
+            backend = extractor.probe(list(selection.page_numbers(extractor.page_count)))
+        
+        self._backend_choices[pdf_path] = backend
+        self.stats.record_extraction(extractor.report)
+        return backend
+    
+    def _write_through(self, file_sha256: str, method: str, pdf_path: str,
+                       pages: Iterator[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+        writer = self.page_store.open_writer(file_sha256, method, os.path.basename(pdf_path), self.count_pages(pdf_path))
+        try:
+            for page_num, text in pages:
+                writer.add(page_num, text)
+                yield page_num, text
+        finally:
+            writer.close()
+    
+    def _non_empty_pages(self, pages: Iterator[Tuple[int, str]],
+                         raw_pages: Optional[List[Tuple[int, str]]] = None) -> Iterator[Tuple[int, str]]:
+        for page_num, text in pages:
+            if raw_pages is not None:
+                raw_pages.append((page_num, text))
+            if text.strip():
+                yield page_num, text
+    
+    def _parse_with_pdfplumber(self, pdf_path: str) -> List[ParsedLaw]:
+        pages = self._iter_pages('pdfplumber', pdf_path)
+        return list(self.law_parser.iter_laws_from_pages(pages, os.path.basename(pdf_path)))
     
     def _parse_with_pypdf2(self, pdf_path: str) -> List[ParsedLaw]:
-        import PyPDF2
+        pages = self._iter_pages('pypdf2', pdf_path)
+        return list(self.law_parser.iter_laws_from_pages(pages, os.path.basename(pdf_path)))
+    
+    def _planned_pages(self, pdf_path: str, selection: PageSelection) -> int:
+        return sum(1 for _ in selection.page_numbers(self.count_pages(pdf_path)))
+    
+    def count_pages(self, pdf_path: str) -> int:
+        for method in reversed(self.available_methods):
+            try:
+                with BACKEND_CLASSES[method](pdf_path) as backend:
+                    return backend.page_count
+            except Exception as e:
+                logger.warning(f"⚠️  Could not count pages with {method}: {e}")
+        return 0
+    
+    def parser_config(self) -> ParserConfig:
+        return ParserConfig(self.backend, self.law_parser)
+    
+    @classmethod
+    def from_config(cls, config: ParserConfig) -> 'EnhancedBridgePDFParser':
+        parser = cls(backend=config.backend)
+        if config.law_parser is not None:
+            parser.law_parser = config.law_parser
+        return parser
+    
+    def plan_shards(self, pdf_paths: List[str], selection: Optional[PageSelection] = None,
+                    pages_per_shard: int = PAGES_PER_SHARD) -> List[ParseShard]:
+        selection = selection or PageSelection()
+        config = self.parser_config()
+        shards = []
         
-        all_laws = []
-        filename = os.path.basename(pdf_path)
+        for file_index, pdf_path in enumerate(pdf_paths):
+            page_count = self.count_pages(pdf_path)
+            page_numbers = list(selection.page_numbers(page_count))
+            collect_pages = self.page_store is not None
+            # Sampled once here so every shard of the file extracts with the same backend
+            backend = self.probe_backend(pdf_path, selection) if self.backend == 'auto' else self.backend
+            
+            if len(page_numbers) <= pages_per_shard:
+                shards.append(ParseShard(pdf_path, file_index, selection, page_count, collect_pages, backend, config))
+                continue
+            
+            for start in range(0, len(page_numbers), pages_per_shard):
+                chunk = page_numbers[start:start + pages_per_shard]
+                shards.append(ParseShard(pdf_path, file_index, PageSelection.from_page_numbers(chunk),
+                                         page_count, collect_pages, backend, config))
+        
+        return shards
+    
+    def parse_shard(self, shard: ParseShard) -> ShardResult:
+        stats = ProcessingStats()
+        filename = os.path.basename(shard.pdf_path)
+        laws = None
+        page_texts = None
+        if shard.backend:
+            self._backend_choices[shard.pdf_path] = shard.backend
+        
+        for method in self.extraction_methods:
+            stats.total_pages = 0
+            page_texts = [] if shard.collect_pages else None
+            edges = []
+            try:
+                pages = self._tally_pages(self._iter_pages(method, shard.pdf_path, shard.selection, page_texts, stats), stats)
+                laws = list(stats.metrics.time_transform(
+                    'parse', pages,
+                    lambda pages: self._iter_shard_laws(self.law_parser.iter_page_segments(pages), filename, edges)))
+                break
+            except Exception as e:
+                logger.warning(f"⚠️  Method {method} failed on {filename} (pages {shard.selection}): {e}")
+        
+        if laws is None:
+            stats.errors.append(f"Error processing {filename} pages {shard.selection}: all parsing methods failed")
+            return ShardResult(shard, '', [], None, stats)
         
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            total_pages = len(reader.pages)
+        leading, open_segment = edges if len(edges) == 2 else ('', None)
+        stats.total_laws = len(laws)
+        return ShardResult(shard, leading, laws, open_segment, stats, method, page_texts)
+    
+    def _iter_shard_laws(self, segments: Iterator[Tuple[Optional[str], int, str]], filename: str,
+                         edges: List[Any]) -> Iterator[ParsedLaw]:
+        # A segment is built once the next one arrives, so its cost lands on the page that closed it.
+        # The first segment is the text before the first heading and the last one may continue in
+        # the next shard: both are handed back through edges.
+        previous = None
+        for index, segment in enumerate(segments):
+            if index == 0:
+                edges.append(segment[2])
+                continue
+            if previous is not None:
+                law = self.law_parser.build_law(previous[0], previous[2], filename, previous[1])
+                if law:
+                    yield law
+            previous = segment
+        edges.append(previous)
+    
+    def _tally_pages(self, pages: Iterator[Tuple[int, str]], stats: ProcessingStats,
+                     filename: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+        for page in pages:
+            stats.total_pages += 1
+            if filename and self._progress:
+                self._progress.advance_file(filename, 1)
+            yield page
+    
+    def _iter_merged_laws(self, results: Iterable[ShardResult]) -> Iterator[ParsedLaw]:
+        pending = None
+        
+        for result in results:
+            self.stats.merge(result.stats)
+            filename = os.path.basename(result.shard.pdf_path)
+            if self._progress:
+                self._progress.advance_file(filename, result.stats.total_pages)
             
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text() or ''
-                if text.strip():
-                    laws = self.law_parser.extract_laws_from_text(text, filename, page_num)
-                    all_laws.extend(laws)
-                    
-                    if page_num <= 10:
-                        logger.info(f"📖 Page {page_num}/{total_pages}: Found {len(laws)} laws")
-                    
-                    if page_num >= 10:
-                        logger.info(f"🛑 Stopping at page {page_num} (testing limit)")
-                        break
+            if pending:
+                pending[2].append('\n' + result.leading)
+            
+            if self.page_store and result.page_texts:
+                self._store_shard_pages(result)
+            
+            if result.open_segment is None:
+                continue
+            
+            if pending:
+                law = self.law_parser.build_law(pending[0], ''.join(pending[2]), filename, pending[1])
+                if law:
+                    self.stats.total_laws += 1
+                    yield law
+            
+            yield from result.laws
+            
+            law_number, page_number, content = result.open_segment
+            pending = (law_number, page_number, [content])
         
-        return all_laws
+        if pending:
+            law = self.law_parser.build_law(pending[0], ''.join(pending[2]), filename, pending[1])
+            if law:
+                self.stats.total_laws += 1
+                yield law
     
-    def process_directory(self, pdf_directory: str, clear_data: bool = True) -> ProcessingStats:
+    def process_directory(self, pdf_directory: str, clear_data: bool = True, workers: int = 1,
+                          pages: Optional[str] = None, max_pages: Optional[int] = None,
+                          max_files: Optional[int] = None, pipeline: bool = False,
+                          stage_workers: Optional[Dict[str, int]] = None,
+                          queue_size: int = PIPELINE_QUEUE_SIZE,
+                          metrics_file: Optional[str] = None,
+                          progress_stream: Optional[str] = None) -> ProcessingStats:
         if not os.path.exists(pdf_directory):
             raise FileNotFoundError(f"Directory not found: {pdf_directory}")
         
-        pdf_files = [f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf')]
+        selection = PageSelection.parse(pages, max_pages)
+        pdf_files = sorted(f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf'))
         
         if not pdf_files:
             logger.warning(f"⚠️  No PDF files found in {pdf_directory}")
             return self.stats
         
-        if clear_data:
-            self.clear_existing_data()
+        if max_files:
+            pdf_files = pdf_files[:max_files]
+        
+        logger.info(f"📑 Page selection: {selection}")
         
         self.stats = ProcessingStats()
         self.stats.total_files = len(pdf_files)
+        planned_pages = {pdf_file: self._planned_pages(os.path.join(pdf_directory, pdf_file), selection)
+                         for pdf_file in pdf_files}
+        if self.db_manager:
+            self.db_manager.metrics = self.stats.metrics
+        
+        if self.write_mode == 'upsert':
+            if self.db_manager:
+                self._sync = self.db_manager.begin_sync(pdf_files)
+        elif clear_data:
+            self.clear_existing_data()
         
-        progress = ProgressTracker(len(pdf_files), "Processing PDFs")
+        stream = ProgressStream(progress_stream) if progress_stream else None
+        progress = ProgressTracker(sum(planned_pages.values()), "Processing PDFs", unit="pages", stream=stream,
+                                   total_files=len(pdf_files))
+        self._progress = progress
         
         try:
+            if pipeline:
+                if workers > 1:
+                    logger.warning("⚠️  Pipeline mode runs on threads, ignoring the worker process count")
+                pdf_paths = [os.path.join(pdf_directory, pdf_file) for pdf_file in pdf_files]
+                ingest = IngestPipeline(self, selection, stage_workers, queue_size)
+                ingest.run(pdf_paths, progress, planned_pages)
+                self.stats.stages = ingest.snapshot()
+            elif workers > 1:
+                self._process_files_in_pool(pdf_directory, pdf_files, selection, workers, progress, planned_pages)
+            else:
+                for pdf_file in pdf_files:
+                    self._process_file(pdf_directory, pdf_file, selection, progress, planned_pages[pdf_file])
+        
+        finally:
+            self._flush_laws()
+            failed = self.stats.errors and not self.stats.processed_files
+            progress.close('error' if failed else 'completed', self.stats.errors[-1] if failed else None)
+            self._progress = None
+            self.stats.end_time = datetime.now()
+        
+        if self._sync:
+            self._finish_sync(pdf_files, selection)
+        
+        self._log_final_stats()
+        if metrics_file:
+            self.stats.export_metrics(metrics_file)
+            logger.info(f"📈 Metrics written to {metrics_file}")
+        return self.stats
+    
+    def _process_file(self, pdf_directory: str, pdf_file: str, selection: PageSelection, progress: ProgressTracker,
+                      planned_pages: int = 0):
+        pdf_path = os.path.join(pdf_directory, pdf_file)
+        progress.start_file(pdf_file, planned_pages)
+        law_count = 0
+        
+        try:
+            # Laws are written as soon as they close, while later pages are still being parsed
+            for law in self.iter_pdf_laws(pdf_path, selection):
+                law_count += 1
+                self.stats.total_laws += 1
+                progress.add_laws(1)
+                self._store_law(law)
+            self._flush_laws()
+            
+            self.stats.processed_files += 1
+            logger.info(f"✅ {pdf_file}: {law_count} laws extracted")
+        
+        except Exception as e:
+            error_msg = f"Error processing {pdf_file}: {e}"
+            self.stats.errors.append(error_msg)
+            self.stats.failed_files.add(pdf_file)
+            logger.error(f"❌ {error_msg}")
+        
+        progress.finish_file(pdf_file, f"{law_count} laws")
+    
+    def _store_shard_pages(self, result: ShardResult):
+        pdf_path = result.shard.pdf_path
+        writer = self.page_store.open_writer(file_digest(pdf_path), self.backend, os.path.basename(pdf_path),
+                                             result.shard.page_count)
+        try:
+            for page_num, text in result.page_texts:
+                writer.add(page_num, text)
+        finally:
+            writer.close()
+    
+    def reparse_page_store(self, source_file: Optional[str] = None) -> Iterator[Tuple[str, List[ParsedLaw]]]:
+        if not self.page_store:
+            raise RuntimeError("No page text store configured")
+        
+        for document in self.page_store.iter_documents():
+            if source_file and document['source_file'] != source_file:
+                continue
+            
+            pages = self._non_empty_pages(self.page_store.iter_pages(document['file_sha256'], document['backend']))
+            yield document['source_file'], list(self.law_parser.iter_laws_from_pages(pages, document['source_file']))
+    
+    def _process_files_in_pool(self, pdf_directory: str, pdf_files: List[str], selection: PageSelection,
+                               workers: int, progress: ProgressTracker, planned_pages: Dict[str, int]):
+        # Files served by the parse cache or the page text store are handled here without touching the pool
+        uncached_files = [f for f in pdf_files if self._needs_extraction(os.path.join(pdf_directory, f), selection)]
+        pdf_paths = [os.path.join(pdf_directory, pdf_file) for pdf_file in uncached_files]
+        shards = self.plan_shards(pdf_paths, selection)
+        
+        logger.info(f"🧵 Parsing {len(uncached_files)} files as {len(shards)} shards on {workers} worker processes")
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() hands results back in submission order, which keeps law ordering stable
+            results = executor.map(_parse_shard_in_worker, shards)
+            grouped_results = groupby(results, key=lambda result: result.shard.file_index)
+            
             for pdf_file in pdf_files:
-                pdf_path = os.path.join(pdf_directory, pdf_file)
-                progress.set_description(f"Processing {pdf_file}")
+                if pdf_file not in uncached_files:
+                    self._process_file(pdf_directory, pdf_file, selection, progress, planned_pages[pdf_file])
+                    continue
                 
-                try:
-                    laws = self.parse_pdf_file(pdf_path)
-                    self.stats.total_laws += len(laws)
-                    
-                    if self.db_manager:
-                        for law in laws:
-                            law_id = self.db_manager.insert_law(law)
-                            if law_id:
-                                self.stats.total_references += len(law.references)
-                    
+                _, file_results = next(grouped_results)
+                progress.start_file(pdf_file, planned_pages[pdf_file])
+                error_count = len(self.stats.errors)
+                page_count = self.stats.total_pages
+                records = [] if self.parse_cache else None
+                law_count = 0
+                
+                for law in self._iter_merged_laws(file_results):
+                    law_count += 1
+                    progress.add_laws(1)
+                    if records is not None:
+                        records.append(law.to_record())
+                    self._store_law(law)
+                self._flush_laws()
+                
+                if len(self.stats.errors) == error_count:
                     self.stats.processed_files += 1
-                    logger.info(f"✅ {pdf_file}: {len(laws)} laws extracted")
+                    logger.info(f"✅ {pdf_file}: {law_count} laws extracted")
                     
-                except Exception as e:
-                    error_msg = f"Error processing {pdf_file}: {e}"
-                    self.stats.errors.append(error_msg)
-                    logger.error(f"❌ {error_msg}")
+                    if records is not None:
+                        pdf_path = os.path.join(pdf_directory, pdf_file)
+                        self.parse_cache.put(file_digest(pdf_path), self._cache_key(selection), pdf_file,
+                                             self.stats.total_pages - page_count, records)
+                else:
+                    self.stats.failed_files.add(pdf_file)
+                    for error in self.stats.errors[error_count:]:
+                        logger.error(f"❌ {error}")
                 
-                progress.update(1, f"{len(laws) if 'laws' in locals() else 0} laws")
+                progress.finish_file(pdf_file, f"{law_count} laws")
+    
+    def _store_law(self, law: ParsedLaw):
+        if self.db_manager:
+            self._pending_laws.append(law)
+            if len(self._pending_laws) >= LAW_INSERT_BATCH_SIZE:
+                self._flush_laws()
+    
+    def _flush_laws(self):
+        laws, self._pending_laws = self._pending_laws, []
+        self._write_laws(laws)
+    
+    def _write_laws(self, laws: List[ParsedLaw]):
+        if not self.db_manager or not laws:
+            return
         
-        finally:
-            progress.close()
-            self.stats.end_time = datetime.now()
+        with self.stats.metrics.timer('insert'):
+            report = self._sync.apply(laws) if self._sync else self.db_manager.insert_laws(laws)
+        if self._progress:
+            law_rows = report.inserted + report.updated if self._sync else sum(1 for law_id in report.law_ids if law_id)
+            self._progress.add_rows(law_rows + report.references_inserted)
+        with self._stats_lock:
+            self.stats.total_references += report.references_inserted
+            self.stats.write_failures.extend(asdict(failure) for failure in report.failures)
+    
+    def _finish_sync(self, pdf_files: List[str], selection: PageSelection):
+        # Only a complete, error-free parse of a file proves that its missing laws are gone
+        if selection.ranges is None and selection.max_pages is None:
+            prune_files = [pdf_file for pdf_file in pdf_files if pdf_file not in self.stats.failed_files]
+        else:
+            prune_files = []
         
-        self._log_final_stats()
-        return self.stats
+        reported = len(self._sync.report.failures)
+        report = self._sync.finish(prune_files)
+        self._sync = None
+        self.stats.sync = report.counts()
+        self.stats.write_failures.extend(asdict(failure) for failure in report.failures[reported:])
     
     def _log_final_stats(self):
         duration = (self.stats.end_time - self.stats.start_time).total_seconds()
         
         logger.info("📊 PROCESSING COMPLETE")
         logger.info(f"📁 Files processed: {self.stats.processed_files}/{self.stats.total_files}")
+        logger.info(f"📖 Pages parsed: {self.stats.total_pages}")
         logger.info(f"⚖️  Laws extracted: {self.stats.total_laws}")
         logger.info(f"🔗 References found: {self.stats.total_references}")
         logger.info(f"⏱️  Duration: {duration:.1f} seconds")
         logger.info(f"❌ Errors: {len(self.stats.errors)}")
+        if self.stats.write_failures:
+            logger.info(f"🧱 Rows rejected by the database: {len(self.stats.write_failures)}")
+        if self.stats.sync:
+            logger.info("♻️  Upsert: " + ', '.join(f"{count} {name.replace('_', '-')}" for name, count in self.stats.sync.items()))
+        
+        metrics = self.stats.metrics_report()
+        for name, timing in metrics['stages'].items():
+            logger.info(f"⏱️  {name}: {timing['count']} x {timing['mean_seconds'] * 1000:.1f} ms avg "
+                        f"(p95 <= {timing['p95_seconds'] * 1000:.0f} ms, max {timing['max_seconds'] * 1000:.0f} ms), "
+                        f"{timing['seconds']:.1f}s total")
+        counters = metrics['counters']
+        logger.info(f"📈 {counters.get('pages_extracted', 0)} pages extracted ({counters.get('text_bytes', 0) / 1024:.0f} KB of text), "
+                    f"{counters.get('http_requests', 0)} HTTP requests")
+        
+        for name, stage in self.stats.stages.items():
+            logger.info(f"🧵 Stage {name} x{stage['workers']}: {stage['processed']} items, "
+                        f"{stage['throughput']:.1f}/s, blocked {stage['blocked_seconds']:.1f}s, "
+                        f"max queue {stage['max_queue_depth']}")
+        
+        for source_file, report in self.stats.extraction.items():
+            fallbacks = sum(report['fallback_pages'].values())
+            logger.info(f"🔧 {source_file}: {report['backend']} at {report['pages_per_second']:.1f} pages/s"
+                        + (f", {fallbacks} pages from fallback backends" if fallbacks else ""))
         
         if self.stats.errors:
             logger.info("🚨 Error details:")
@@ -465,6 +1583,303 @@ class EnhancedBridgePDFParser:
                 logger.info(f"   - {error}")
 
 
+class IngestPipeline:
+    # reader -> extractor -> validator -> writer, each stage on its own threads.
+    # Every queue is bounded: a slow database blocks the validator, which
+    # blocks the extractor and then the reader, so memory stays capped.
+    STAGES = ('reader', 'extractor', 'validator', 'writer')
+    
+    def __init__(self, parser: EnhancedBridgePDFParser, selection: PageSelection,
+                 stage_workers: Optional[Dict[str, int]] = None, queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.parser = parser
+        self.selection = selection
+        self.queue_size = queue_size
+        workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.stages = {name: StageStats(name, max(1, workers[name])) for name in self.STAGES}
+        
+        # Pages of one file go through a per-file channel so a single extractor
+        # sees them in order; the channels themselves are handed out via a queue
+        self.inboxes = {
+            'reader': Queue(),
+            'extractor': Queue(),
+            'validator': Queue(maxsize=queue_size),
+            'writer': Queue(maxsize=queue_size),
+        }
+        self.duplicates = 0
+        self.rejected = 0
+        self._seen: Set[Tuple[str, str, str]] = set()
+        self._pages_in_flight = 0
+        self._lock = threading.Lock()
+        self._progress: Optional[ProgressTracker] = None
+        self._planned_pages: Dict[str, int] = {}
+        self._write_buffers = threading.local()
+        self._start_time = 0.0
+        self._end_time: Optional[float] = None
+    
+    def run(self, pdf_paths: List[str], progress: Optional[ProgressTracker] = None,
+            planned_pages: Optional[Dict[str, int]] = None):
+        self._progress = progress
+        self._planned_pages = planned_pages or {}
+        self._start_time = time.perf_counter()
+        
+        for file_index, pdf_path in enumerate(pdf_paths):
+            self.inboxes['reader'].put((file_index, pdf_path))
+        self.stages['reader'].max_queue_depth = len(pdf_paths)
+        for _ in range(self.stages['reader'].workers):
+            self.inboxes['reader'].put(None)
+        
+        handlers = {
+            'reader': self._read_file,
+            'extractor': self._extract_file,
+            'validator': self._validate_law,
+            'writer': self._write_law,
+        }
+        threads = []
+        for name in self.STAGES:
+            for index in range(self.stages[name].workers):
+                thread = threading.Thread(target=self._run_worker, args=(name, handlers[name]),
+                                          name=f"ingest-{name}-{index}", daemon=True)
+                thread.start()
+                threads.append(thread)
+        
+        for thread in threads:
+            thread.join()
+        
+        self._end_time = time.perf_counter()
+        logger.info(f"🧵 Pipeline finished: {self.duplicates} duplicates dropped, {self.rejected} laws rejected")
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        elapsed = max((self._end_time or time.perf_counter()) - self._start_time, 1e-9)
+        snapshot = {}
+        
+        for name, stage in self.stages.items():
+            snapshot[name] = {
+                'workers': stage.workers,
+                'processed': stage.processed,
+                'throughput': stage.processed / elapsed,
+                'busy_seconds': round(stage.busy_seconds, 3),
+                'blocked_seconds': round(stage.blocked_seconds, 3),
+                'queue_depth': self._queue_depth(name),
+                'max_queue_depth': stage.max_queue_depth
+            }
+        
+        return snapshot
+    
+    def _queue_depth(self, name: str) -> int:
+        return self._pages_in_flight if name == 'extractor' else self.inboxes[name].qsize()
+    
+    def _run_worker(self, name: str, handler):
+        stage = self.stages[name]
+        inbox = self.inboxes[name]
+        
+        while True:
+            item = inbox.get()
+            if item is None:
+                break
+            
+            start = time.perf_counter()
+            try:
+                handler(item)
+            except Exception as e:
+                self._error(f"Pipeline {name} stage failed: {e}")
+            with self._lock:
+                stage.busy_seconds += time.perf_counter() - start
+        
+        if name == 'writer':
+            self._flush_writes()
+        
+        with self._lock:
+            stage.finished_workers += 1
+            last_worker = stage.finished_workers == stage.workers
+        
+        # The last worker out closes the next stage
+        next_index = self.STAGES.index(name) + 1
+        if last_worker and next_index < len(self.STAGES):
+            successor = self.STAGES[next_index]
+            for _ in range(self.stages[successor].workers):
+                self.inboxes[successor].put(None)
+    
+    def _put(self, producer: str, consumer: str, queue: Queue, item: Any):
+        start = time.perf_counter()
+        queue.put(item)
+        blocked = time.perf_counter() - start
+        
+        with self._lock:
+            self.stages[producer].blocked_seconds += blocked
+            consumer_stage = self.stages[consumer]
+            consumer_stage.max_queue_depth = max(consumer_stage.max_queue_depth, self._queue_depth(consumer))
+    
+    def _count(self, name: str, count: int = 1):
+        with self._lock:
+            self.stages[name].processed += count
+    
+    def _error(self, message: str, filename: Optional[str] = None):
+        with self.parser._stats_lock:
+            self.parser.stats.errors.append(message)
+            if filename:
+                self.parser.stats.failed_files.add(filename)
+        logger.error(f"❌ {message}")
+    
+    def _read_file(self, item: Tuple[int, str]):
+        file_index, pdf_path = item
+        filename = os.path.basename(pdf_path)
+        if self._progress:
+            self._progress.start_file(filename, self._planned_pages.get(filename, 0))
+        
+        try:
+            cached = self.parser._load_cached(pdf_path, self.selection)
+        except Exception as e:
+            self._error(f"Error processing {filename}: {e}", filename)
+            self._file_done(filename, 0)
+            return
+        
+        if cached is not None:
+            for record in cached['records']:
+                self._put('reader', 'validator', self.inboxes['validator'], ParsedLaw.from_record(record))
+            with self.parser._stats_lock:
+                self.parser.stats.total_pages += cached['page_count']
+                self.parser.stats.processed_files += 1
+            self._file_done(filename, len(cached['records']))
+            return
+        
+        channel = Queue(maxsize=self.queue_size)
+        page_stats = ProcessingStats()
+        self.inboxes['extractor'].put((file_index, pdf_path, channel))
+        
+        try:
+            for page in self.parser._iter_pages(self.parser.backend, pdf_path, self.selection, stats=page_stats):
+                page_stats.total_pages += 1
+                with self._lock:
+                    self._pages_in_flight += 1
+                self._put('reader', 'extractor', channel, page)
+                self._count('reader')
+                if self._progress:
+                    self._progress.advance_file(filename, 1)
+        except Exception as e:
+            page_stats.errors.append(f"Error processing {filename}: {e}")
+        finally:
+            # ProcessingStats doubles as the end-of-file marker on the channel
+            channel.put(page_stats)
+    
+    def _channel_pages(self, channel: Queue, outcome: List[ProcessingStats]) -> Iterator[Tuple[int, str]]:
+        while True:
+            item = channel.get()
+            if isinstance(item, ProcessingStats):
+                outcome.append(item)
+                return
+            with self._lock:
+                self._pages_in_flight -= 1
+            yield item
+    
+    def _extract_file(self, item: Tuple[int, str, Queue]):
+        file_index, pdf_path, channel = item
+        filename = os.path.basename(pdf_path)
+        records = [] if self.parser.parse_cache else None
+        outcome: List[ProcessingStats] = []
+        law_count = 0
+        error = None
+        
+        try:
+            pages = self._channel_pages(channel, outcome)
+            laws = self.parser.stats.metrics.time_transform(
+                'parse', pages, lambda pages: self.parser.law_parser.iter_laws_from_pages(pages, filename))
+            for law in laws:
+                law_count += 1
+                if records is not None:
+                    records.append(law.to_record())
+                self._put('extractor', 'validator', self.inboxes['validator'], law)
+                self._count('extractor')
+        except Exception as e:
+            error = f"Error processing {filename}: {e}"
+        finally:
+            if not outcome:
+                # Drain so the reader never blocks on a channel nobody reads
+                for _ in self._channel_pages(channel, outcome):
+                    pass
+            
+            # The file is accounted for whatever happened to it
+            page_stats = outcome[0]
+            if error:
+                page_stats.errors.append(error)
+            if page_stats.errors:
+                page_stats.failed_files.add(filename)
+            with self.parser._stats_lock:
+                self.parser.stats.merge(page_stats)
+                if not page_stats.errors:
+                    self.parser.stats.processed_files += 1
+            
+            if page_stats.errors:
+                for page_error in page_stats.errors:
+                    logger.error(f"❌ {page_error}")
+            elif records is not None:
+                self.parser.parse_cache.put(file_digest(pdf_path), self.parser._cache_key(self.selection), filename,
+                                            page_stats.total_pages, records)
+            
+            self._file_done(filename, law_count)
+    
+    def _file_done(self, filename: str, law_count: int):
+        logger.info(f"✅ {filename}: {law_count} laws extracted")
+        if self._progress:
+            self._progress.finish_file(filename, f"{law_count} laws")
+    
+    def _validate_law(self, law: ParsedLaw):
+        metrics = self.parser.stats.metrics
+        
+        with metrics.timer('validate'):
+            valid = bool(law.law_number) and len(law.content) >= MIN_LAW_CONTENT_LENGTH
+        if not valid:
+            with self._lock:
+                self.rejected += 1
+            return
+        
+        with metrics.timer('dedupe'):
+            key = (law.source_file, law.law_number, law.content_hash)
+            with self._lock:
+                duplicate = key in self._seen
+                if duplicate:
+                    self.duplicates += 1
+                else:
+                    self._seen.add(key)
+        if duplicate:
+            return
+        
+        with self.parser._stats_lock:
+            self.parser.stats.total_laws += 1
+        if self._progress:
+            self._progress.add_laws(1)
+        self._put('validator', 'writer', self.inboxes['writer'], law)
+        self._count('validator')
+    
+    def _write_law(self, law: ParsedLaw):
+        # Each writer thread batches its own laws; a batch goes out when full or when the queue runs dry
+        buffer = self._write_buffer()
+        buffer.append(law)
+        if len(buffer) >= LAW_INSERT_BATCH_SIZE or self.inboxes['writer'].empty():
+            self._flush_writes()
+    
+    def _write_buffer(self) -> List[ParsedLaw]:
+        if not hasattr(self._write_buffers, 'laws'):
+            self._write_buffers.laws = []
+        return self._write_buffers.laws
+    
+    def _flush_writes(self):
+        laws = self._write_buffer()
+        if laws:
+            self._write_buffers.laws = []
+            self.parser._write_laws(laws)
+            self._count('writer', len(laws))
+
+
+_worker_parsers: Dict[Tuple[str, str, str], 'EnhancedBridgePDFParser'] = {}
+
+def _parse_shard_in_worker(shard: ParseShard) -> ShardResult:
+    config = shard.config or ParserConfig()
+    parser = _worker_parsers.get(config.key())
+    if parser is None:
+        parser = _worker_parsers[config.key()] = EnhancedBridgePDFParser.from_config(config)
+    return parser.parse_shard(shard)
+
+
 def install_dependencies():
     import subprocess
     
@@ -480,6 +1895,25 @@ def install_dependencies():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('bridge_parser.log'),
+            logging.StreamHandler()
+        ]
+    )
+    
+    if len(sys.argv) > 1 and sys.argv[1] == '--reparse-pages':
+        # Layer 2 only: re-run the law rules over previously extracted page text
+        store = PageTextStore(*sys.argv[2:3])
+        parser = EnhancedBridgePDFParser(page_store=store)
+        start = time.time()
+        for source_file, laws in parser.reparse_page_store():
+            print(f"📄 {source_file}: {len(laws)} laws")
+        print(f"⏱️  Re-parsed cached pages in {time.time() - start:.2f}s")
+        sys.exit(0)
+    
     parser = EnhancedBridgePDFParser()
     
     if len(sys.argv) > 1:
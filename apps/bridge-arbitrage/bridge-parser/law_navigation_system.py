@@ -21,7 +21,8 @@ from typing import List, Dict, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 import json
-import re
+
+from reference_extractor import extract_references
 
 @dataclass
 class NavigationNode:
@@ -83,35 +84,16 @@ class LawCrossReferenceEngine:
         self.reference_cache = {}
         
     def find_references_in_text(self, text: str) -> List[Dict]:
-        references = []
-        
-        patterns = [
-            r'(?:Article|Art\.?)\s*(\d+(?:\.\d+)*(?:[A-Z])?)',
-            r'(?:Law|Rule|Loi|Règle)\s*(\d+(?:[A-Z])?)',
-            r'(?:Section|§)\s*(\d+(?:\.\d+)*)',
-            r'(?:voir|see|cf\.?|selon|per)\s*(?:l\')?(?:article|art\.?|law|rule)\s*(\d+(?:\.\d+)*)',
-            r'(?:conformément à|according to|as per)\s*(?:l\')?(?:article|art\.?)\s*(\d+(?:\.\d+)*)',
+        return [
+            {
+                'law_number': span.law_number,
+                'kind': span.kind,
+                'position': span.start,
+                'context': span.context(text, 100),
+                'match_text': span.text
+            }
+            for span in extract_references(text)
         ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                law_number = match.group(1)
-                start_pos = match.start()
-                end_pos = match.end()
-                
-                context_start = max(0, start_pos - 100)
-                context_end = min(len(text), end_pos + 100)
-                context = text[context_start:context_end].strip()
-                
-                references.append({
-                    'law_number': law_number,
-                    'position': start_pos,
-                    'context': context,
-                    'match_text': match.group(0)
-                })
-        
-        return references
     
     def resolve_reference(self, law_number: str) -> Optional[Dict]:
         if law_number in self.reference_cache:
@@ -127,16 +109,14 @@ class LawCrossReferenceEngine:
     
     def get_related_laws(self, law_id: int, max_results: int = 10) -> List[Dict]:
         try:
-            incoming_refs = self.db_manager.client.table('law_references')\
-                .select('source_law_id, code_laws!inner(*)')\
-                .eq('target_law_number', law_id)\
-                .limit(max_results)\
-                .execute()
+            incoming_refs = self.db_manager._execute(self.db_manager.live(self.db_manager.client.table('law_references')
+                .select('source_law_id, code_laws!inner(*)')
+                .eq('target_law_number', law_id), 'code_laws.deleted_at')
+                .limit(max_results))
             
-            outgoing_refs = self.db_manager.client.table('law_references')\
-                .select('target_law_number')\
-                .eq('source_law_id', law_id)\
-                .execute()
+            outgoing_refs = self.db_manager._execute(self.db_manager.client.table('law_references')
+                .select('target_law_number')
+                .eq('source_law_id', law_id))
             
             related = []
             
@@ -189,7 +169,7 @@ class LawSearchEngine:
     
     def search_laws(self, query: str, filters: Dict = None, limit: int = 20) -> List[Dict]:
         try:
-            query_builder = self.db_manager.client.table('code_laws').select('*')
+            query_builder = self.db_manager.live(self.db_manager.client.table('code_laws').select('*'))
             
             if query:
                 query_builder = query_builder.or_(f'title.ilike.%{query}%,content.ilike.%{query}%,law_number.ilike.%{query}%')
@@ -202,7 +182,7 @@ class LawSearchEngine:
                 if 'min_char_count' in filters:
                     query_builder = query_builder.gte('char_count', filters['min_char_count'])
             
-            result = query_builder.limit(limit).execute()
+            result = self.db_manager._execute(query_builder.limit(limit))
             return result.data if result.data else []
             
         except Exception as e:
@@ -211,11 +191,10 @@ class LawSearchEngine:
     
     def get_law_suggestions(self, partial_number: str) -> List[Dict]:
         try:
-            result = self.db_manager.client.table('code_laws')\
-                .select('law_number, title')\
-                .ilike('law_number', f'{partial_number}%')\
-                .limit(10)\
-                .execute()
+            result = self.db_manager._execute(self.db_manager.live(self.db_manager.client.table('code_laws')
+                .select('law_number, title')
+                .ilike('law_number', f'{partial_number}%'))
+                .limit(10))
             
             return result.data if result.data else []
             
@@ -244,11 +223,10 @@ class LawNavigationAPI:
             session = self.create_session(session_id)
         
         try:
-            result = self.db_manager.client.table('code_laws')\
-                .select('*')\
-                .eq('id', law_id)\
-                .single()\
-                .execute()
+            result = self.db_manager._execute(self.db_manager.live(self.db_manager.client.table('code_laws')
+                .select('*')
+                .eq('id', law_id))
+                .single())
             
             if not result.data:
                 return {'error': 'Law not found'}
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Law Table Maintenance
+=====================
+
+Server-side maintenance of the parser tables, shared by the PDF parser and
+the Supabase manager.
+
+Features:
+- clear_law_tables: one RPC call, one transaction, only row counts come back
+- Children cleared before parents so foreign keys never block a delete
+- Fallback when the RPC is not installed: minimal-return deletes with an
+  exact count header, never the deleted rows themselves
+- has_change_columns: one probe telling whether code_laws has the soft
+  delete and change tracking columns, or predates their migrations
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import logging
+from typing import List, Dict, Callable
+
+logger = logging.getLogger(__name__)
+
+# Same order as the clear_law_tables function in migrations/20250716_clear_law_tables.sql
+CLEARABLE_TABLES = ('law_references', 'code_laws', 'rnc_articles', 'conventions')
+# deleted_at comes with migrations/20250715_code_laws_upsert_key.sql, updated_at with 20250717
+CHANGE_COLUMNS = 'updated_at, deleted_at'
+UNDEFINED_COLUMN_CODE = '42703'
+
+def clear_law_tables(client, table_names: List[str]) -> Dict[str, int]:
+    unknown = set(table_names) - set(CLEARABLE_TABLES)
+    if unknown:
+        raise ValueError(f"Cannot clear unsupported tables: {', '.join(sorted(unknown))}")
+    tables = [table for table in CLEARABLE_TABLES if table in table_names]
+    
+    try:
+        result = client.rpc('clear_law_tables', {'table_names': tables}).execute()
+        return {table: int((result.data or {}).get(table, 0)) for table in tables}
+    except Exception as e:
+        logger.warning(f"⚠️  clear_law_tables RPC unavailable, deleting table by table: {e}")
+    
+    counts = {}
+    for table in tables:
+        result = client.table(table).delete(count='exact', returning='minimal').not_.is_('id', 'null').execute()
+        counts[table] = result.count or 0
+    return counts
+
+def has_change_columns(client, execute: Callable = lambda query: query.execute()) -> bool:
+    try:
+        execute(client.table('code_laws').select(CHANGE_COLUMNS).limit(1))
+    except Exception as e:
+        if getattr(e, 'code', None) != UNDEFINED_COLUMN_CODE:
+            raise
+        logger.warning(f"⚠️  code_laws has no updated_at/deleted_at column ({e}): apply migrations 20250715 "
+                       f"and 20250717 to enable soft deletes, upsert mode and the duplicate snapshot")
+        return False
+    return True
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Local Storage Backend
+=====================
+
+In-process stand-in for the Supabase client, backed by SQLite, so the whole
+pipeline runs (and can be measured) without network access.
+
+Features:
+- Same query surface the parser uses: table().select/insert/upsert/update/delete,
+  eq/neq/gt/gte/lt/lte/in_/is_/like/ilike/or_/not_, order/limit/range/single,
+  embedded resources ('code_laws!inner(*)') and count='exact'
+- rpc() for the server functions the parser calls (clear_law_tables,
+  remove_duplicate_references, remove_orphaned_references)
+- Schemaless tables: columns are added the first time they are written or filtered on
+- Simulated round-trip latency per request, plus request/query/latency counters
+  to separate network time from our own CPU time
+- Selected with a local:// URL wherever a Supabase URL is accepted:
+  local:// (in memory), local:///path/to/store.sqlite3, local://?latency_ms=40
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import re
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlsplit, parse_qs
+from typing import List, Dict, Optional, Any, Tuple
+
+from law_tables import CLEARABLE_TABLES
+
+LOCAL_URL_SCHEME = 'local'
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+EMBED_PATTERN = re.compile(r'^(\w+)(!inner)?\((.*)\)$')
+
+# Many-to-one links used by embedded selects: (table, embedded table) -> (foreign key, key)
+RELATIONS = {
+    ('law_references', 'code_laws'): ('source_law_id', 'id'),
+}
+
+class LocalStoreError(Exception):
+    pass
+
+class LocalResponse:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+def is_local_url(url: Optional[str]) -> bool:
+    return bool(url) and urlsplit(url).scheme == LOCAL_URL_SCHEME
+
+def create_storage_client(url: str, key: str):
+    if is_local_url(url):
+        return LocalStoreClient.for_url(url)
+    
+    from supabase import create_client
+    return create_client(url, key)
+
+def _quote(name: str) -> str:
+    if not IDENTIFIER_PATTERN.match(name):
+        raise LocalStoreError(f"Invalid identifier: {name}")
+    return f'"{name}"'
+
+def _split_top_level(text: str) -> List[str]:
+    parts = []
+    depth = 0
+    current = ''
+    for char in text:
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += (char == '(') - (char == ')')
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+@lru_cache(maxsize=256)
+def _like_regex(pattern: str, ignore_case: bool):
+    # PostgREST accepts both % and * as the multi-character wildcard
+    regex = ''.join('.*' if char in '%*' else '.' if char == '_' else re.escape(char) for char in pattern)
+    return re.compile(regex, re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+
+def _like(value: Any, pattern: str, ignore_case: bool) -> bool:
+    return value is not None and _like_regex(pattern, ignore_case).fullmatch(str(value)) is not None
+
+class LocalStoreClient:
+    _instances: Dict[str, 'LocalStoreClient'] = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, path: str = ':memory:', latency: float = 0.0):
+        self.path = path
+        self.latency = latency
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.create_function('pg_ilike', 2, lambda value, pattern: _like(value, pattern, True), deterministic=True)
+        self._connection.create_function('pg_like', 2, lambda value, pattern: _like(value, pattern, False), deterministic=True)
+        self._columns: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'query_seconds': 0.0, 'latency_seconds': 0.0}
+        
+        for row in self._connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"):
+            self._load_columns(row['name'])
+    
+    @classmethod
+    def for_url(cls, url: str) -> 'LocalStoreClient':
+        parts = urlsplit(url)
+        path = (parts.netloc + parts.path) or ':memory:'
+        if path == 'memory':
+            path = ':memory:'
+        latency = float(parse_qs(parts.query).get('latency_ms', ['0'])[0]) / 1000
+        
+        # Every manager built from the same URL shares one store, like a real database
+        with cls._instances_lock:
+            client = cls._instances.get(path)
+            if client is None:
+                client = cls._instances[path] = cls(path, latency)
+            client.latency = latency
+            return client
+    
+    def table(self, name: str) -> 'LocalQuery':
+        return LocalQuery(self, name)
+    
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None) -> 'LocalRpc':
+        return LocalRpc(self, name, params or {})
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'requests': self.stats['requests'],
+                'query_seconds': round(self.stats['query_seconds'], 4),
+                'latency_seconds': round(self.stats['latency_seconds'], 4),
+                'latency_ms': self.latency * 1000
+            }
+    
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = {'requests': 0, 'query_seconds': 0.0, 'latency_seconds': 0.0}
+    
+    def _request(self, operation):
+        start = time.perf_counter()
+        with self._lock:
+            result = operation()
+        query_seconds = time.perf_counter() - start
+        
+        # The round trip is simulated outside the lock: concurrent requests overlap as they would over HTTP
+        if self.latency:
+            time.sleep(self.latency)
+        
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['query_seconds'] += query_seconds
+            self.stats['latency_seconds'] += self.latency
+        return result
+    
+    def _load_columns(self, table: str):
+        self._columns[table] = [row['name'] for row in self._connection.execute(f"PRAGMA table_info({_quote(table)})")]
+    
+    def _ensure_columns(self, table: str, columns):
+        if table not in self._columns:
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} (id INTEGER PRIMARY KEY AUTOINCREMENT)")
+            self._load_columns(table)
+        for column in columns:
+            if column not in self._columns[table]:
+                self._connection.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}")
+                self._columns[table].append(column)
+    
+    def _rows(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._connection.execute(sql, params)]
+    
+    def _transaction(self, operation):
+        self._connection.execute('BEGIN')
+        try:
+            result = operation()
+        except sqlite3.Error as e:
+            self._connection.execute('ROLLBACK')
+            raise LocalStoreError(str(e)) from e
+        except Exception:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+        return result
+
+class LocalQuery:
+    def __init__(self, client: LocalStoreClient, table: str):
+        self._client = client
+        self._table = table
+        self._action = 'select'
+        self._columns = '*'
+        self._count: Optional[str] = None
+        self._returning = 'representation'
+        self._payload: Any = None
+        self._on_conflict = 'id'
+        self._filters: List[Tuple[str, List[Any], List[str]]] = []
+        self._embed_filters: Dict[str, List[Tuple[str, List[Any], List[str]]]] = {}
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single = False
+        self._negate = False
+    
+    def select(self, columns: str = '*', count: Optional[str] = None) -> 'LocalQuery':
+        self._action = 'select'
+        self._columns = columns
+        self._count = count
+        return self
+    
+    def insert(self, rows, count: Optional[str] = None, returning: str = 'representation') -> 'LocalQuery':
+        self._action = 'insert'
+        self._payload = rows if isinstance(rows, list) else [rows]
+        self._count = count
+        self._returning = returning
+        return self
+    
+    def upsert(self, rows, on_conflict: str = 'id', count: Optional[str] = None,
+               returning: str = 'representation') -> 'LocalQuery':
+        self._action = 'upsert'
+        self._payload = rows if isinstance(rows, list) else [rows]
+        self._on_conflict = on_conflict
+        self._count = count
+        self._returning = returning
+        return self
+    
+    def update(self, values: Dict[str, Any], count: Optional[str] = None,
+               returning: str = 'representation') -> 'LocalQuery':
+        self._action = 'update'
+        self._payload = values
+        self._count = count
+        self._returning = returning
+        return self
+    
+    def delete(self, count: Optional[str] = None, returning: str = 'representation') -> 'LocalQuery':
+        self._action = 'delete'
+        self._count = count
+        self._returning = returning
+        return self
+    
+    @property
+    def not_(self) -> 'LocalQuery':
+        self._negate = True
+        return self
+    
+    def eq(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, '= ?', [value])
+    
+    def neq(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, '<> ?', [value])
+    
+    def gt(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, '> ?', [value])
+    
+    def gte(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, '>= ?', [value])
+    
+    def lt(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, '< ?', [value])
+    
+    def lte(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, '<= ?', [value])
+    
+    def in_(self, column: str, values) -> 'LocalQuery':
+        values = list(values)
+        if not values:
+            return self._filter(column, 'IS NULL AND 0 = 1', [])
+        return self._filter(column, f"IN ({', '.join('?' for _ in values)})", values)
+    
+    def is_(self, column: str, value: Any) -> 'LocalQuery':
+        if value is None or str(value).lower() == 'null':
+            return self._filter(column, 'IS NULL', [])
+        return self._filter(column, '= ?', [str(value).lower() == 'true'])
+    
+    def like(self, column: str, pattern: str) -> 'LocalQuery':
+        return self._filter(column, '', [pattern], function='pg_like')
+    
+    def ilike(self, column: str, pattern: str) -> 'LocalQuery':
+        return self._filter(column, '', [pattern], function='pg_ilike')
+    
+    def or_(self, filters: str) -> 'LocalQuery':
+        negate, self._negate = self._negate, False
+        clauses = []
+        params = []
+        columns = []
+        for part in _split_top_level(filters):
+            column, operator, value = part.split('.', 2)
+            probe = LocalQuery(self._client, self._table)
+            if operator == 'in':
+                probe.in_(column, _split_top_level(value.strip('()')))
+            elif operator == 'is':
+                probe.is_(column, value)
+            else:
+                getattr(probe, operator)(column, value)
+            sql, filter_params, filter_columns = probe._filters[0]
+            clauses.append(sql)
+            params.extend(filter_params)
+            columns.extend(filter_columns)
+        self._filters.append((('NOT ' if negate else '') + f"({' OR '.join(clauses)})", params, columns))
+        return self
+    
+    def order(self, column: str, desc: bool = False) -> 'LocalQuery':
+        self._order.append((column, desc))
+        return self
+    
+    def limit(self, count: int) -> 'LocalQuery':
+        self._limit = count
+        return self
+    
+    def range(self, start: int, end: int) -> 'LocalQuery':
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+    
+    def single(self) -> 'LocalQuery':
+        self._single = True
+        return self
+    
+    def execute(self) -> LocalResponse:
+        return self._client._request(self._run)
+    
+    def _filter(self, column: str, condition: str, params: List[Any], function: Optional[str] = None) -> 'LocalQuery':
+        negate, self._negate = self._negate, False
+        # {p} is where the table alias goes when the filter applies to an embedded resource
+        embed, _, name = column.rpartition('.')
+        sql = f"{function}({{p}}{_quote(name)}, ?)" if function else f"{{p}}{_quote(name)} {condition}"
+        if negate:
+            sql = f"NOT ({sql})"
+        entry = (sql, [_encode(param) for param in params], [name])
+        
+        if embed:
+            self._embed_filters.setdefault(embed, []).append(entry)
+        else:
+            self._filters.append(entry)
+        return self
+    
+    def _where(self, embeds: Dict[str, bool]) -> Tuple[str, List[Any]]:
+        clauses = []
+        params = []
+        for sql, filter_params, columns in self._filters:
+            self._client._ensure_columns(self._table, columns)
+            clauses.append(sql.format(p=''))
+            params.extend(filter_params)
+        
+        for embed, inner in embeds.items():
+            filters = self._embed_filters.get(embed, [])
+            if not inner and not filters:
+                continue
+            foreign_key, key = self._relation(embed)
+            self._client._ensure_columns(embed, [key, foreign_key] if embed == self._table else [key])
+            self._client._ensure_columns(self._table, [foreign_key])
+            embed_clauses = [f"e.{_quote(key)} = {_quote(self._table)}.{_quote(foreign_key)}"]
+            for sql, filter_params, columns in filters:
+                self._client._ensure_columns(embed, columns)
+                embed_clauses.append(sql.format(p='e.'))
+                params.extend(filter_params)
+            clauses.append(f"EXISTS (SELECT 1 FROM {_quote(embed)} e WHERE {' AND '.join(embed_clauses)})")
+        
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+    
+    def _relation(self, embed: str) -> Tuple[str, str]:
+        if (self._table, embed) not in RELATIONS:
+            raise LocalStoreError(f"No relationship between {self._table} and {embed}")
+        return RELATIONS[(self._table, embed)]
+    
+    def _parse_columns(self) -> Tuple[List[str], Dict[str, Tuple[bool, str]]]:
+        columns = []
+        embeds = {}
+        for part in _split_top_level(self._columns):
+            match = EMBED_PATTERN.match(part)
+            if match:
+                embeds[match.group(1)] = (bool(match.group(2)), match.group(3))
+            else:
+                columns.append(part)
+        return columns, embeds
+    
+    def _run(self) -> LocalResponse:
+        self._client._ensure_columns(self._table, [])
+        if self._action == 'select':
+            return self._run_select()
+        return self._client._transaction(getattr(self, f"_run_{self._action}"))
+    
+    def _run_select(self) -> LocalResponse:
+        columns, embeds = self._parse_columns()
+        where, params = self._where({name: inner for name, (inner, _) in embeds.items()})
+        table = _quote(self._table)
+        
+        count = None
+        if self._count:
+            count = self._client._connection.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+        
+        sql = f"SELECT * FROM {table}{where}"
+        if self._order:
+            self._client._ensure_columns(self._table, [column for column, _ in self._order])
+            sql += ' ORDER BY ' + ', '.join(f"{_quote(column)} {'DESC' if desc else 'ASC'}" for column, desc in self._order)
+        if self._limit is not None or self._offset:
+            sql += f" LIMIT {self._limit if self._limit is not None else -1} OFFSET {self._offset}"
+        rows = self._client._rows(sql, params)
+        
+        for embed, (_, embed_columns) in embeds.items():
+            foreign_key, key = self._relation(embed)
+            linked = {row[foreign_key] for row in rows if row.get(foreign_key) is not None}
+            targets = {}
+            if linked:
+                self._client._ensure_columns(embed, [key])
+                placeholders = ', '.join('?' for _ in linked)
+                for target in self._client._rows(f"SELECT * FROM {_quote(embed)} WHERE {_quote(key)} IN ({placeholders})",
+                                                 list(linked)):
+                    targets[target[key]] = self._project(target, _split_top_level(embed_columns))
+            for row in rows:
+                row[embed] = targets.get(row.get(foreign_key))
+        
+        data = [self._project(row, columns, list(embeds)) for row in rows]
+        return self._respond(data, count)
+    
+    def _project(self, row: Dict[str, Any], columns: List[str], embeds: List[str] = ()) -> Dict[str, Any]:
+        if not columns or '*' in columns:
+            return row
+        return {column: row.get(column) for column in list(columns) + list(embeds)}
+    
+    def _respond(self, data: List[Dict[str, Any]], count: Optional[int] = None) -> LocalResponse:
+        if self._count and count is None:
+            count = len(data)
+        if self._returning == 'minimal' and self._action != 'select':
+            data = []
+        if self._single:
+            if len(data) != 1:
+                raise LocalStoreError(f"JSON object requested, multiple (or no) rows returned ({len(data)})")
+            data = data[0]
+        return LocalResponse(data, count)
+    
+    def _insert_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        self._client._ensure_columns(self._table, row)
+        table = _quote(self._table)
+        if row:
+            columns = ', '.join(_quote(column) for column in row)
+            placeholders = ', '.join('?' for _ in row)
+            cursor = self._client._connection.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                                                      [_encode(value) for value in row.values()])
+        else:
+            cursor = self._client._connection.execute(f"INSERT INTO {table} DEFAULT VALUES")
+        return self._client._rows(f"SELECT * FROM {table} WHERE id = ?", [cursor.lastrowid])[0]
+    
+    def _run_insert(self) -> LocalResponse:
+        return self._respond([self._insert_row(row) for row in self._payload])
+    
+    def _run_upsert(self) -> LocalResponse:
+        keys = [key.strip() for key in self._on_conflict.split(',')]
+        table = _quote(self._table)
+        data = []
+        
+        for row in self._payload:
+            self._client._ensure_columns(self._table, list(row) + keys)
+            match = ' AND '.join(f"{_quote(key)} = ?" for key in keys)
+            existing = self._client._rows(f"SELECT id FROM {table} WHERE {match}", [_encode(row.get(key)) for key in keys])
+            if existing:
+                assignments = ', '.join(f"{_quote(column)} = ?" for column in row)
+                self._client._connection.execute(f"UPDATE {table} SET {assignments} WHERE id = ?",
+                                                 [_encode(value) for value in row.values()] + [existing[0]['id']])
+                data.extend(self._client._rows(f"SELECT * FROM {table} WHERE id = ?", [existing[0]['id']]))
+            else:
+                data.append(self._insert_row(row))
+        
+        return self._respond(data)
+    
+    def _run_update(self) -> LocalResponse:
+        self._client._ensure_columns(self._table, self._payload)
+        where, params = self._where({})
+        table = _quote(self._table)
+        ids = [row['id'] for row in self._client._rows(f"SELECT id FROM {table}{where}", params)]
+        
+        if ids and self._payload:
+            assignments = ', '.join(f"{_quote(column)} = ?" for column in self._payload)
+            values = [_encode(value) for value in self._payload.values()]
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                self._client._connection.execute(
+                    f"UPDATE {table} SET {assignments} WHERE id IN ({', '.join('?' for _ in chunk)})", values + chunk)
+        
+        data = self._fetch_ids(ids) if self._returning != 'minimal' else []
+        return self._respond(data, len(ids))
+    
+    def _run_delete(self) -> LocalResponse:
+        where, params = self._where({})
+        table = _quote(self._table)
+        data = self._client._rows(f"SELECT * FROM {table}{where}", params) if self._returning != 'minimal' else []
+        count = self._client._connection.execute(f"DELETE FROM {table}{where}", params).rowcount
+        return self._respond(data, count)
+    
+    def _fetch_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows.extend(self._client._rows(
+                f"SELECT * FROM {_quote(self._table)} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk))
+        return rows
+
+class LocalRpc:
+    def __init__(self, client: LocalStoreClient, name: str, params: Dict[str, Any]):
+        self._client = client
+        self._name = name
+        self._params = params
+    
+    def execute(self) -> LocalResponse:
+        function = getattr(self, f"_{self._name}", None)
+        if function is None:
+            raise LocalStoreError(f"Could not find the function public.{self._name}")
+        return self._client._request(lambda: LocalResponse(self._client._transaction(function)))
+    
+    def _clear_law_tables(self) -> Dict[str, int]:
+        table_names = self._params.get('table_names') or []
+        if set(table_names) - set(CLEARABLE_TABLES):
+            raise LocalStoreError(f"clear_law_tables: unsupported table in {table_names}")
+        
+        counts = {}
+        for table in CLEARABLE_TABLES:
+            if table in table_names:
+                self._client._ensure_columns(table, [])
+                counts[table] = self._client._connection.execute(f"DELETE FROM {_quote(table)}").rowcount
+        return counts
+    
+    def _remove_duplicate_references(self) -> int:
+        self._client._ensure_columns('law_references', ['source_law_id', 'target_law_number', 'position'])
+        return self._client._connection.execute(
+            "DELETE FROM law_references WHERE id NOT IN "
+            "(SELECT MIN(id) FROM law_references GROUP BY source_law_id, target_law_number, position)"
+        ).rowcount
+    
+    def _remove_orphaned_references(self) -> int:
+        self._client._ensure_columns('law_references', ['source_law_id'])
+        self._client._ensure_columns('code_laws', [])
+        return self._client._connection.execute(
+            "DELETE FROM law_references WHERE source_law_id NOT IN (SELECT id FROM code_laws)"
+        ).rowcount
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Index
+====================
+
+MinHash/LSH index over law contents, used by the duplicate detector to find
+the few laws worth an exact Jaccard comparison instead of scanning them all.
+
+Features:
+- MinHash signatures over word shingles (the lower-cased word set the
+  detector's Jaccard similarity is defined on), 128 multiply-shift hash
+  functions over a stable (blake2b) word hash
+- The 128 hash values of each vocabulary word are computed once and kept as a
+  compact array, so a signature is an element-wise minimum over its words
+- Banding: a law is a candidate when all rows of at least one band match;
+  with 16 bands of 8 rows a pair at Jaccard 0.9 is missed with probability
+  ~1e-4, a pair at 0.5 becomes a candidate ~6% of the time
+- The index keeps one byte per slot (b-bit MinHash, 128 bytes per law) to
+  estimate the similarity of a candidate without its text; hash tables hold
+  keys only, so memory grows with the number of laws, not their length
+- Entries (band keys and compact signature, 256 bytes) can be exported,
+  restored and removed, so the index can be persisted and kept in sync
+- Candidates are never final: callers confirm them with the exact similarity
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import random
+import hashlib
+from operator import eq
+from array import array
+from collections import defaultdict
+from typing import List, Dict, Set, Hashable, Iterable, Optional
+
+SIGNATURE_SIZE = 128
+LSH_BANDS = 16
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+HASH_SEED = 2025
+
+# Multiply-shift hash family: h(x) = ((a * x + b) mod 2^64) >> 32, a odd
+_rng = random.Random(HASH_SEED)
+HASH_FUNCTIONS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(SIGNATURE_SIZE)]
+MASK_64 = (1 << 64) - 1
+
+# Two unrelated slots keep the same low byte by chance 1 time in 256
+SLOT_BITS = 8
+CHANCE_MATCH = 1 / (1 << SLOT_BITS)
+
+# Entry layout: LSH_BANDS unsigned 64-bit band keys, then one byte per signature slot
+BAND_KEY_BYTES = LSH_BANDS * 8
+INDEX_FINGERPRINT = f"minhash-{SIGNATURE_SIZE}x{LSH_BANDS}-seed{HASH_SEED}-{SLOT_BITS}bit"
+
+def word_shingles(text: str) -> Set[str]:
+    return set(text.lower().split())
+
+def jaccard(words1: Set[str], words2: Set[str]) -> float:
+    if not words1 or not words2:
+        return 0.0
+    intersection = len(words1 & words2)
+    return intersection / (len(words1) + len(words2) - intersection)
+
+class MinHashLSH:
+    def __init__(self):
+        self._buckets: List[Dict[int, List[Hashable]]] = [defaultdict(list) for _ in range(LSH_BANDS)]
+        self._word_vectors: Dict[str, array] = {}
+        self.entries: Dict[Hashable, bytes] = {}
+    
+    @property
+    def size(self) -> int:
+        return len(self.entries)
+    
+    def scratch(self) -> 'MinHashLSH':
+        # Empty index sharing this one's word hash vectors (short-lived, e.g. one insert batch)
+        index = MinHashLSH()
+        index._word_vectors = self._word_vectors
+        return index
+    
+    def _word_vector(self, word: str) -> array:
+        vector = self._word_vectors.get(word)
+        if vector is None:
+            base = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+            vector = array('I', [((a * base + b) & MASK_64) >> 32 for a, b in HASH_FUNCTIONS])
+            self._word_vectors[word] = vector
+        return vector
+    
+    def signature(self, words: Iterable[str]) -> Optional[List[int]]:
+        vectors = [self._word_vector(word) for word in words]
+        if not vectors:
+            return None
+        return list(map(min, zip(*vectors)))
+    
+    def _entry(self, signature: List[int]) -> bytes:
+        # Band keys are stable hashes (not hash()), so persisted entries stay valid across processes
+        band_keys = array('Q', [
+            int.from_bytes(hashlib.blake2b(array('I', signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]).tobytes(),
+                                           digest_size=8).digest(), 'little')
+            for band in range(LSH_BANDS)
+        ])
+        return band_keys.tobytes() + bytes(value & 0xFF for value in signature)
+    
+    def _band_keys(self, entry: bytes) -> array:
+        return array('Q', entry[:BAND_KEY_BYTES])
+    
+    def _estimate(self, entry1: bytes, entry2: bytes) -> float:
+        matches = sum(map(eq, entry1[BAND_KEY_BYTES:], entry2[BAND_KEY_BYTES:])) / SIGNATURE_SIZE
+        return max(0.0, (matches - CHANCE_MATCH) / (1 - CHANCE_MATCH))
+    
+    def add(self, key: Hashable, words: Iterable[str]) -> Optional[bytes]:
+        signature = self.signature(words)
+        if signature is None:
+            return None
+        entry = self._entry(signature)
+        self.restore(key, entry)
+        return entry
+    
+    def restore(self, key: Hashable, entry: bytes):
+        if key in self.entries:
+            self.remove(key)
+        for buckets, band_key in zip(self._buckets, self._band_keys(entry)):
+            buckets[band_key].append(key)
+        self.entries[key] = entry
+    
+    def remove(self, key: Hashable):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for buckets, band_key in zip(self._buckets, self._band_keys(entry)):
+            bucket = buckets[band_key]
+            bucket.remove(key)
+            if not bucket:
+                del buckets[band_key]
+    
+    def candidates(self, words: Iterable[str], min_similarity: float = 0.0) -> Dict[Hashable, float]:
+        # Keys sharing at least one band, with their estimated similarity
+        signature = self.signature(words)
+        if signature is None:
+            return {}
+        entry = self._entry(signature)
+        
+        found = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(entry)):
+            bucket = buckets.get(band_key)
+            if bucket:
+                found.update(bucket)
+        
+        estimates = {key: self._estimate(entry, self.entries[key]) for key in found}
+        return {key: estimate for key, estimate in estimates.items() if estimate >= min_similarity}
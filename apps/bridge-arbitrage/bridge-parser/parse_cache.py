@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Parse Cache
+===========
+
+Local content-addressed caches for parsed PDF output.
+
+Features:
+- ParseCache: parsed laws keyed by the PDF's SHA-256 and the parser fingerprint,
+  stored as zlib-compressed JSON in one SQLite file
+- PageTextStore: raw page text extracted once per PDF and backend, kept in
+  memory-mappable data files with a SQLite index by file, page and text hash
+- Unchanged PDFs skip text extraction entirely; rule changes only re-run the regexes
+- Eviction by total size (least recently used first) and by age, after every
+  write to either store; documents still being written are never evicted
+- Safe to share between threads (the ingest pipeline's readers and extractors):
+  one connection per store, serialized by a lock
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import os
+import json
+import mmap
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'BRIDGE_PARSER_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'bridge-parser')
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_PAGE_STORE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ParseCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(os.path.join(cache_dir, 'parse_cache.sqlite3'), check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS parsed_files (
+                file_sha256 TEXT NOT NULL,
+                parser_key TEXT NOT NULL,
+                source_file TEXT NOT NULL,
+                page_count INTEGER NOT NULL,
+                law_count INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (file_sha256, parser_key)
+            )
+        """)
+        self.connection.commit()
+    
+    def get(self, file_sha256: str, parser_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT payload, page_count FROM parsed_files WHERE file_sha256 = ? AND parser_key = ?",
+                (file_sha256, parser_key)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self.connection.execute(
+                "UPDATE parsed_files SET last_used = ? WHERE file_sha256 = ? AND parser_key = ?",
+                (time.time(), file_sha256, parser_key)
+            )
+            self.connection.commit()
+            self.hits += 1
+        
+        return {
+            'records': json.loads(zlib.decompress(row[0]).decode('utf-8')),
+            'page_count': row[1]
+        }
+    
+    def contains(self, file_sha256: str, parser_key: str) -> bool:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM parsed_files WHERE file_sha256 = ? AND parser_key = ?",
+                (file_sha256, parser_key)
+            ).fetchone()
+            return row is not None
+    
+    def put(self, file_sha256: str, parser_key: str, source_file: str, page_count: int, records: List[Dict]):
+        payload = zlib.compress(json.dumps(records, ensure_ascii=False).encode('utf-8'), 6)
+        now = time.time()
+        
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO parsed_files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_sha256, parser_key, source_file, page_count, len(records), payload, len(payload), now, now)
+            )
+            self.connection.commit()
+        logger.debug(f"💾 Cached {len(records)} laws for {source_file} ({len(payload)} bytes)")
+        
+        self.evict()
+    
+    def evict(self, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> int:
+        with self._lock:
+            max_bytes = self.max_bytes if max_bytes is None else max_bytes
+            max_age_days = self.max_age_days if max_age_days is None else max_age_days
+            removed = 0
+            
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                removed += self.connection.execute(
+                    "DELETE FROM parsed_files WHERE last_used < ?", (cutoff,)
+                ).rowcount
+            
+            if max_bytes is not None:
+                total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM parsed_files").fetchone()[0]
+                if total > max_bytes:
+                    rows = self.connection.execute(
+                        "SELECT file_sha256, parser_key, size FROM parsed_files ORDER BY last_used"
+                    ).fetchall()
+                    for file_sha256, parser_key, size in rows:
+                        if total <= max_bytes:
+                            break
+                        self.connection.execute(
+                            "DELETE FROM parsed_files WHERE file_sha256 = ? AND parser_key = ?",
+                            (file_sha256, parser_key)
+                        )
+                        total -= size
+                        removed += 1
+            
+            self.connection.commit()
+            
+            if removed:
+                logger.info(f"🧹 Evicted {removed} parse cache entries")
+            
+            return removed
+    
+    def clear(self) -> int:
+        with self._lock:
+            removed = self.connection.execute("DELETE FROM parsed_files").rowcount
+            self.connection.commit()
+            return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total_bytes = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parsed_files"
+            ).fetchone()
+            
+            return {
+                'entries': entries,
+                'bytes': total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'cache_dir': self.cache_dir
+            }
+    
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+class PageTextWriter:
+    def __init__(self, store: 'PageTextStore', file_sha256: str, backend: str):
+        self.store = store
+        self.file_sha256 = file_sha256
+        self.backend = backend
+        self.known_pages = set(store.stored_pages(file_sha256, backend))
+        self.data_file = open(store.data_path(file_sha256, backend), 'ab')
+        self.offset = self.data_file.seek(0, os.SEEK_END)
+        self.rows: List[Tuple[str, str, int, int, int, str]] = []
+    
+    def add(self, page_number: int, text: str):
+        if page_number in self.known_pages:
+            return
+        
+        data = text.encode('utf-8')
+        self.data_file.write(data)
+        self.rows.append(
+            (self.file_sha256, self.backend, page_number, self.offset, len(data), hashlib.sha256(data).hexdigest())
+        )
+        self.known_pages.add(page_number)
+        self.offset += len(data)
+    
+    def close(self):
+        # Index rows are written only once the text they point at is on disk (the connection is
+        # shared, so rows executed earlier could be committed by another thread)
+        self.data_file.close()
+        with self.store._lock:
+            self.store.connection.executemany("INSERT OR REPLACE INTO page_texts VALUES (?, ?, ?, ?, ?, ?)", self.rows)
+            self.store.connection.commit()
+            self.store._writing.discard((self.file_sha256, self.backend))
+        
+        if self.rows:
+            logger.debug(f"💾 Stored {len(self.rows)} page texts for {self.file_sha256[:12]} ({self.backend})")
+        
+        self.store.evict()
+
+class PageTextStore:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_PAGE_STORE_MAX_BYTES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.pages_dir = os.path.join(cache_dir, 'pages')
+        os.makedirs(self.pages_dir, exist_ok=True)
+        
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        
+        self._lock = threading.RLock()
+        self._writing: Set[Tuple[str, str]] = set()
+        self.connection = sqlite3.connect(os.path.join(cache_dir, 'page_text.sqlite3'), check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS page_documents (
+                file_sha256 TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                source_file TEXT NOT NULL,
+                page_count INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (file_sha256, backend)
+            );
+            CREATE TABLE IF NOT EXISTS page_texts (
+                file_sha256 TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                page_number INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                text_sha256 TEXT NOT NULL,
+                PRIMARY KEY (file_sha256, backend, page_number)
+            );
+            CREATE INDEX IF NOT EXISTS idx_page_texts_hash ON page_texts(text_sha256);
+            CREATE INDEX IF NOT EXISTS idx_page_documents_source ON page_documents(source_file);
+        """)
+        self.connection.commit()
+    
+    def data_path(self, file_sha256: str, backend: str) -> str:
+        return os.path.join(self.pages_dir, f"{file_sha256}.{backend}.txt")
+    
+    def get_document(self, file_sha256: str, backend: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT source_file, page_count FROM page_documents WHERE file_sha256 = ? AND backend = ?",
+                (file_sha256, backend)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            
+            return {'source_file': row[0], 'page_count': row[1], 'pages': self.stored_pages(file_sha256, backend)}
+    
+    def stored_pages(self, file_sha256: str, backend: str) -> Dict[int, Tuple[int, int]]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT page_number, offset, length FROM page_texts WHERE file_sha256 = ? AND backend = ?",
+                (file_sha256, backend)
+            ).fetchall()
+            return {page_number: (offset, length) for page_number, offset, length in rows}
+    
+    def open_writer(self, file_sha256: str, backend: str, source_file: str, page_count: int) -> PageTextWriter:
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO page_documents VALUES (?, ?, ?, ?, ?)",
+                (file_sha256, backend, source_file, page_count, time.time())
+            )
+            self._writing.add((file_sha256, backend))
+            return PageTextWriter(self, file_sha256, backend)
+    
+    def iter_pages(self, file_sha256: str, backend: str, page_numbers: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, str]]:
+        index = self.stored_pages(file_sha256, backend)
+        page_numbers = sorted(index) if page_numbers is None else page_numbers
+        path = self.data_path(file_sha256, backend)
+        
+        with self._lock:
+            self.connection.execute(
+                "UPDATE page_documents SET last_used = ? WHERE file_sha256 = ? AND backend = ?",
+                (time.time(), file_sha256, backend)
+            )
+            self.connection.commit()
+        
+        if os.path.getsize(path) == 0:
+            for page_number in page_numbers:
+                yield page_number, ''
+            return
+        
+        with open(path, 'rb') as data_file, mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for page_number in page_numbers:
+                offset, length = index[page_number]
+                yield page_number, data[offset:offset + length].decode('utf-8')
+    
+    def find_pages_by_hash(self, text_sha256: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT d.source_file, t.file_sha256, t.backend, t.page_number FROM page_texts t "
+                "JOIN page_documents d ON d.file_sha256 = t.file_sha256 AND d.backend = t.backend "
+                "WHERE t.text_sha256 = ?",
+                (text_sha256,)
+            ).fetchall()
+            return [
+                {'source_file': row[0], 'file_sha256': row[1], 'backend': row[2], 'page_number': row[3]}
+                for row in rows
+            ]
+    
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT file_sha256, backend, source_file, page_count FROM page_documents ORDER BY source_file"
+            ).fetchall()
+            for file_sha256, backend, source_file, page_count in rows:
+                yield {'file_sha256': file_sha256, 'backend': backend, 'source_file': source_file, 'page_count': page_count}
+    
+    def remove_document(self, file_sha256: str, backend: str):
+        with self._lock:
+            self.connection.execute("DELETE FROM page_texts WHERE file_sha256 = ? AND backend = ?", (file_sha256, backend))
+            self.connection.execute("DELETE FROM page_documents WHERE file_sha256 = ? AND backend = ?", (file_sha256, backend))
+            self.connection.commit()
+            
+            path = self.data_path(file_sha256, backend)
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def evict(self, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> int:
+        with self._lock:
+            max_bytes = self.max_bytes if max_bytes is None else max_bytes
+            max_age_days = self.max_age_days if max_age_days is None else max_age_days
+            cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+            
+            rows = self.connection.execute(
+                "SELECT file_sha256, backend, last_used FROM page_documents ORDER BY last_used"
+            ).fetchall()
+            sizes = {
+                (file_sha256, backend): os.path.getsize(self.data_path(file_sha256, backend))
+                if os.path.exists(self.data_path(file_sha256, backend)) else 0
+                for file_sha256, backend, _ in rows
+            }
+            total = sum(sizes.values())
+            removed = 0
+            
+            for file_sha256, backend, last_used in rows:
+                too_old = cutoff is not None and last_used < cutoff
+                too_big = max_bytes is not None and total > max_bytes
+                if not (too_old or too_big) or (file_sha256, backend) in self._writing:
+                    continue
+                
+                self.remove_document(file_sha256, backend)
+                total -= sizes[(file_sha256, backend)]
+                removed += 1
+            
+            if removed:
+                logger.info(f"🧹 Evicted {removed} documents from the page text store")
+            
+            return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            documents, pages = self.connection.execute(
+                "SELECT (SELECT COUNT(*) FROM page_documents), (SELECT COUNT(*) FROM page_texts)"
+            ).fetchone()
+            total_bytes = sum(
+                os.path.getsize(os.path.join(self.pages_dir, name)) for name in os.listdir(self.pages_dir)
+            )
+            
+            return {'documents': documents, 'pages': pages, 'bytes': total_bytes, 'cache_dir': self.cache_dir}
+    
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+if __name__ == "__main__":
+    import sys
+    
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_DIR
+    
+    print("Parse Cache")
+    for key, value in ParseCache(cache_dir).get_stats().items():
+        print(f"  {key}: {value}")
+    
+    print("Page Text Store")
+    for key, value in PageTextStore(cache_dir).get_stats().items():
+        print(f"  {key}: {value}")
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+PDF Extraction Backends
+=======================
+
+Page-text extractors behind one interface, with per-file backend selection.
+
+Features:
+- PdfplumberBackend / PyPDF2Backend: open once, extract any page, close
+- Sample pages are timed with every backend: throughput, chars per page
+  and empty-page rate are recorded per file
+- The fastest backend with acceptable text quality extracts the rest of the document
+- A page that fails or comes back empty is retried with the other backends,
+  instead of restarting the whole file
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import os
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_PAGES = 4
+MIN_CHAR_RATIO = 0.8
+MAX_EMPTY_RATE_GAP = 0.1
+
+class PdfBackend:
+    name = ''
+    
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.page_count = 0
+        self._document = None
+    
+    def __enter__(self) -> 'PdfBackend':
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def open(self) -> int:
+        raise NotImplementedError
+    
+    def extract(self, page_num: int) -> str:
+        raise NotImplementedError
+    
+    def close(self):
+        self._document = None
+
+class PdfplumberBackend(PdfBackend):
+    name = 'pdfplumber'
+    
+    def open(self) -> int:
+        import pdfplumber
+        
+        self._document = pdfplumber.open(self.pdf_path)
+        self.page_count = len(self._document.pages)
+        return self.page_count
+    
+    def extract(self, page_num: int) -> str:
+        page = self._document.pages[page_num - 1]
+        text = page.extract_text() or ''
+        
+        # Release the cached layout objects so memory stays flat on long documents
+        if hasattr(page, 'close'):
+            page.close()
+        else:
+            page.flush_cache()
+        
+        return text
+    
+    def close(self):
+        if self._document is not None:
+            self._document.close()
+        self._document = None
+
+class PyPDF2Backend(PdfBackend):
+    name = 'pypdf2'
+    
+    def open(self) -> int:
+        import PyPDF2
+        
+        self._file = open(self.pdf_path, 'rb')
+        self._document = PyPDF2.PdfReader(self._file)
+        self.page_count = len(self._document.pages)
+        return self.page_count
+    
+    def extract(self, page_num: int) -> str:
+        return self._document.pages[page_num - 1].extract_text() or ''
+    
+    def close(self):
+        if self._document is not None:
+            self._file.close()
+        self._document = None
+
+BACKEND_CLASSES = {
+    'pdfplumber': PdfplumberBackend,
+    'pypdf2': PyPDF2Backend,
+}
+
+@dataclass
+class BackendSample:
+    backend: str
+    pages: int = 0
+    seconds: float = 0.0
+    chars: int = 0
+    empty_pages: int = 0
+    errors: int = 0
+    
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+    
+    @property
+    def chars_per_page(self) -> float:
+        return self.chars / self.pages if self.pages else 0.0
+    
+    @property
+    def empty_page_rate(self) -> float:
+        return self.empty_pages / self.pages if self.pages else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pages': self.pages,
+            'seconds': round(self.seconds, 4),
+            'pages_per_second': round(self.pages_per_second, 2),
+            'chars_per_page': round(self.chars_per_page, 1),
+            'empty_page_rate': round(self.empty_page_rate, 3),
+            'errors': self.errors
+        }
+
+@dataclass
+class ExtractionReport:
+    source_file: str
+    backend: Optional[str] = None
+    samples: Dict[str, BackendSample] = field(default_factory=dict)
+    pages: int = 0
+    seconds: float = 0.0
+    fallback_pages: Dict[str, int] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'backend': self.backend,
+            'pages': self.pages,
+            'seconds': round(self.seconds, 4),
+            'pages_per_second': round(self.pages / self.seconds, 2) if self.seconds else 0.0,
+            'fallback_pages': dict(self.fallback_pages),
+            'samples': {name: sample.to_dict() for name, sample in self.samples.items()}
+        }
+
+def merge_report_dicts(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    # Shards of the same file report separately; totals add up, the sampling run is kept once
+    merged = dict(first)
+    merged['pages'] = first['pages'] + second['pages']
+    merged['seconds'] = round(first['seconds'] + second['seconds'], 4)
+    merged['pages_per_second'] = round(merged['pages'] / merged['seconds'], 2) if merged['seconds'] else 0.0
+    merged['fallback_pages'] = dict(first['fallback_pages'])
+    for backend, count in second['fallback_pages'].items():
+        merged['fallback_pages'][backend] = merged['fallback_pages'].get(backend, 0) + count
+    merged['samples'] = first['samples'] or second['samples']
+    return merged
+
+def choose_backend(samples: Dict[str, BackendSample]) -> Optional[str]:
+    usable = [sample for sample in samples.values() if sample.pages and not sample.errors]
+    if not usable:
+        return None
+    
+    best_chars = max(sample.chars_per_page for sample in usable)
+    best_empty_rate = min(sample.empty_page_rate for sample in usable)
+    acceptable = [
+        sample for sample in usable
+        if sample.chars_per_page >= best_chars * MIN_CHAR_RATIO
+        and sample.empty_page_rate <= best_empty_rate + MAX_EMPTY_RATE_GAP
+    ]
+    return max(acceptable, key=lambda sample: sample.pages_per_second).backend
+
+def sample_page_numbers(page_numbers: List[int], sample_size: int = SAMPLE_PAGES) -> List[int]:
+    if len(page_numbers) <= sample_size:
+        return list(page_numbers)
+    step = len(page_numbers) / sample_size
+    return [page_numbers[int(index * step + step / 2)] for index in range(sample_size)]
+
+class AdaptiveExtractor:
+    def __init__(self, pdf_path: str, backends: List[str], preferred: Optional[str] = None,
+                 sample_size: int = SAMPLE_PAGES):
+        self.pdf_path = pdf_path
+        self.backend_names = [name for name in backends if name in BACKEND_CLASSES]
+        self.preferred = preferred
+        self.sample_size = sample_size
+        self.report = ExtractionReport(os.path.basename(pdf_path), backend=preferred)
+        self._open_backends: Dict[str, Optional[PdfBackend]] = {}
+        self._sampled_texts: Dict[int, Tuple[str, float]] = {}
+    
+    def __enter__(self) -> 'AdaptiveExtractor':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def page_count(self) -> int:
+        for name in self._ordered_backends():
+            backend = self._backend(name)
+            if backend:
+                return backend.page_count
+        raise RuntimeError(f"No PDF backend could open {self.pdf_path}")
+    
+    def probe(self, page_numbers: List[int]) -> Optional[str]:
+        if self.report.backend:
+            return self.report.backend
+        
+        candidates = [name for name in self.backend_names if self._backend(name)]
+        if not candidates:
+            raise RuntimeError(f"No PDF backend could open {self.pdf_path}")
+        if len(candidates) == 1:
+            self.report.backend = candidates[0]
+            return self.report.backend
+        
+        sampled = sample_page_numbers(page_numbers, self.sample_size)
+        texts = {}
+        for name in candidates:
+            sample = BackendSample(name)
+            texts[name] = {}
+            for page_num in sampled:
+                start = time.perf_counter()
+                try:
+                    text = self._open_backends[name].extract(page_num)
+                except Exception as e:
+                    logger.debug(f"Sample page {page_num} failed with {name}: {e}")
+                    sample.errors += 1
+                    text = None
+                elapsed = time.perf_counter() - start
+                sample.seconds += elapsed
+                sample.pages += 1
+                if text is not None:
+                    texts[name][page_num] = (text, elapsed)
+                    sample.chars += len(text)
+                    sample.empty_pages += not text.strip()
+            self.report.samples[name] = sample
+        
+        self.report.backend = choose_backend(self.report.samples) or candidates[0]
+        self._sampled_texts = texts[self.report.backend]
+        logger.info(f"⚖️  {self.report.source_file}: using {self.report.backend} "
+                    + ', '.join(f"{name} {sample.pages_per_second:.1f} p/s {sample.chars_per_page:.0f} c/p"
+                                for name, sample in self.report.samples.items()))
+        return self.report.backend
+    
+    def iter_pages(self, selection) -> Iterator[Tuple[int, str]]:
+        page_numbers = list(selection.page_numbers(self.page_count))
+        chosen = self.probe(page_numbers)
+        
+        for page_num in page_numbers:
+            start = time.perf_counter()
+            text, sampled_seconds = self._sampled_texts.pop(page_num, (None, 0.0))
+            if text is None:
+                text = self._extract(chosen, page_num)
+            
+            if not text or not text.strip():
+                text = self._fallback(chosen, page_num, text)
+            
+            self.report.seconds += time.perf_counter() - start + sampled_seconds
+            self.report.pages += 1
+            yield page_num, text
+    
+    def _extract(self, name: str, page_num: int) -> Optional[str]:
+        backend = self._backend(name)
+        if backend is None:
+            return None
+        try:
+            return backend.extract(page_num)
+        except Exception as e:
+            logger.warning(f"⚠️  {name} failed on page {page_num} of {self.report.source_file}: {e}")
+            return None
+    
+    def _fallback(self, chosen: str, page_num: int, text: Optional[str]) -> str:
+        for name in self._ordered_backends():
+            if name == chosen:
+                continue
+            alternative = self._extract(name, page_num)
+            if alternative and alternative.strip():
+                self.report.fallback_pages[name] = self.report.fallback_pages.get(name, 0) + 1
+                return alternative
+            if text is None:
+                text = alternative
+        
+        if text is None:
+            raise RuntimeError(f"All PDF backends failed on page {page_num} of {self.report.source_file}")
+        return text
+    
+    def _ordered_backends(self) -> List[str]:
+        preferred = self.report.backend or self.preferred
+        return sorted(self.backend_names, key=lambda name: name != preferred)
+    
+    def _backend(self, name: str) -> Optional[PdfBackend]:
+        if name not in self._open_backends:
+            backend = BACKEND_CLASSES[name](self.pdf_path)
+            try:
+                backend.open()
+            except Exception as e:
+                logger.warning(f"⚠️  {name} could not open {self.report.source_file}: {e}")
+                backend = None
+            self._open_backends[name] = backend
+        return self._open_backends[name]
+    
+    def close(self):
+        for backend in self._open_backends.values():
+            if backend:
+                backend.close()
+        self._open_backends = {}
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Progress Stream
+===============
+
+Machine-readable progress events for a parser run, one JSON object per line.
+
+Features:
+- Targets: a file path (appended to, "-" for stdout) or tcp://host:port
+- Field names follow the parsing_progress table read by ParsingProgress.js
+  (status, progress_percentage, last_updated), so a consumer can render the
+  events without polling the database
+- A broken consumer never stops the run: the stream disables itself after
+  the first failed write
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import sys
+import json
+import socket
+import logging
+import threading
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+SOCKET_TIMEOUT = 5.0
+
+class ProgressStream:
+    def __init__(self, target: str):
+        self.target = target
+        self._socket: Optional[socket.socket] = None
+        self._file = None
+        self._lock = threading.Lock()
+        
+        if target.startswith('tcp://'):
+            parsed = urlparse(target)
+            self._socket = socket.create_connection((parsed.hostname, parsed.port), timeout=SOCKET_TIMEOUT)
+        elif target == '-':
+            self._file = sys.stdout
+        else:
+            self._file = open(target, 'a', encoding='utf-8')
+    
+    def emit(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False, default=str) + '\n'
+        
+        with self._lock:
+            if self._socket is None and self._file is None:
+                return
+            try:
+                if self._socket is not None:
+                    self._socket.sendall(line.encode('utf-8'))
+                else:
+                    self._file.write(line)
+                    self._file.flush()
+            except OSError as e:
+                logger.warning(f"⚠️  Progress stream {self.target} disabled: {e}")
+                self._close()
+    
+    def close(self):
+        with self._lock:
+            self._close()
+    
+    def _close(self):
+        if self._socket is not None:
+            self._socket.close()
+        elif self._file is not None and self._file is not sys.stdout:
+            self._file.close()
+        self._socket = None
+        self._file = None
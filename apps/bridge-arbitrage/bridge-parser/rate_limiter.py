@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter
+=====================
+
+Shared request limiter for the Supabase clients: a token bucket caps the
+request rate and an AIMD controller caps the requests in flight, both adapted
+to how the server responds.
+
+Features:
+- One limiter per database URL, shared by every manager talking to it
+- Token bucket (about one second of burst) in front of every request
+- Additive increase: after each window of successful requests whose p95
+  latency stays under the target, one more request may be in flight and the
+  rate grows by a fixed step
+- Multiplicative decrease: a slow window shrinks the concurrency limit; a
+  throttled (429/503) or failed (5xx, connection) request halves both limits
+  and pauses every caller for an exponential backoff (or Retry-After)
+- Throttled requests were not processed and are retried; other errors are
+  raised to the caller, which knows whether a write is safe to repeat
+- Current rate, concurrency, latency and recent backoff events for the stats
+- local:// stores get a pass-through limiter: SQLite has no server to protect
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Union
+
+from local_store import is_local_url
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATE = 20.0
+MIN_RATE = 1.0
+MAX_RATE = 200.0
+RATE_STEP = 2.0
+INITIAL_CONCURRENCY = 2
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+LATENCY_TARGET_SECONDS = 1.0
+LATENCY_WINDOW = 50
+SLOW_DECREASE = 0.8
+BACKOFF_DECREASE = 0.5
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+MAX_RETRIES = 3
+BACKOFF_HISTORY = 20
+THROTTLE_STATUSES = (429, 503)
+
+RequestLimiter = Union['AdaptiveRateLimiter', 'PassThroughLimiter']
+
+_limiters: Dict[str, RequestLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def shared_limiter(database_url: str) -> RequestLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(database_url)
+        if limiter is None:
+            limiter_class = PassThroughLimiter if is_local_url(database_url) else AdaptiveRateLimiter
+            limiter = _limiters[database_url] = limiter_class()
+        return limiter
+
+def _status_code(error: Exception) -> Optional[int]:
+    # postgrest APIError carries the HTTP status in `code` when the body is not JSON; httpx errors carry a response
+    response = getattr(error, 'response', None)
+    for value in (getattr(error, 'status_code', None), getattr(response, 'status_code', None), getattr(error, 'code', None)):
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit() and len(value) == 3):
+            return int(value)
+    return None
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveRateLimiter:
+    def __init__(self, rate: float = INITIAL_RATE, concurrency: int = INITIAL_CONCURRENCY,
+                 max_concurrency: int = MAX_CONCURRENCY, latency_target: float = LATENCY_TARGET_SECONDS):
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        
+        self._rate = rate
+        self._limit = float(concurrency)
+        self._tokens = 1.0
+        self._refilled_at = time.monotonic()
+        self._resume_at = 0.0
+        self._in_flight = 0
+        self._window_successes = 0
+        self._consecutive_backoffs = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._backoffs = deque(maxlen=BACKOFF_HISTORY)
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        
+        self.counters = {'requests': 0, 'retries': 0, 'throttled': 0, 'errors': 0, 'backoff_events': 0, 'wait_seconds': 0.0}
+    
+    @property
+    def last_latency(self) -> float:
+        # Latency of the calling thread's last request, limiter wait excluded
+        return getattr(self._local, 'latency', 0.0)
+    
+    def execute(self, query):
+        for attempt in range(MAX_RETRIES + 1):
+            self._acquire()
+            start = time.perf_counter()
+            try:
+                response = query.execute()
+            except Exception as e:
+                self._local.latency = time.perf_counter() - start
+                status = _status_code(e)
+                throttled = status in THROTTLE_STATUSES
+                
+                if throttled or (status is not None and status >= 500) or isinstance(e, (ConnectionError, TimeoutError)):
+                    self._back_off('throttled' if throttled else 'error', status, _retry_after(e))
+                else:
+                    self._release()
+                
+                if not throttled or attempt == MAX_RETRIES:
+                    raise
+                with self._condition:
+                    self.counters['retries'] += 1
+                continue
+            
+            self._local.latency = time.perf_counter() - start
+            self._release(self._local.latency)
+            return response
+    
+    def _refill(self, now: float):
+        self._tokens = min(max(1.0, self._rate), self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+    
+    def _acquire(self):
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                
+                if now < self._resume_at:
+                    self._condition.wait(self._resume_at - now)
+                elif self._in_flight >= int(self._limit):
+                    self._condition.wait()
+                elif self._tokens < 1:
+                    self._condition.wait((1 - self._tokens) / self._rate)
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    self.counters['requests'] += 1
+                    self.counters['wait_seconds'] += now - start
+                    return
+    
+    def _release(self, latency: Optional[float] = None):
+        with self._condition:
+            self._in_flight -= 1
+            
+            if latency is not None:
+                self._latencies.append(latency)
+                self._consecutive_backoffs = 0
+                self._window_successes += 1
+                
+                # One window = as many successes as requests allowed in flight
+                if self._window_successes >= self._limit:
+                    self._window_successes = 0
+                    if self._p95() <= self.latency_target:
+                        self._limit = min(self.max_concurrency, self._limit + 1)
+                        self._rate = min(MAX_RATE, self._rate + RATE_STEP)
+                    elif self._limit > MIN_CONCURRENCY:
+                        self._limit = max(MIN_CONCURRENCY, self._limit * SLOW_DECREASE)
+                        self._record_backoff('slow', None, 0.0)
+            
+            self._condition.notify_all()
+    
+    def _back_off(self, reason: str, status: Optional[int], retry_after: Optional[float]):
+        with self._condition:
+            self._in_flight -= 1
+            self._window_successes = 0
+            self._limit = max(MIN_CONCURRENCY, self._limit * BACKOFF_DECREASE)
+            self._rate = max(MIN_RATE, self._rate * BACKOFF_DECREASE)
+            self._tokens = min(self._tokens, 0.0)
+            
+            delay = retry_after if retry_after is not None else \
+                min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** self._consecutive_backoffs)
+            self._consecutive_backoffs += 1
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            self.counters['throttled' if reason == 'throttled' else 'errors'] += 1
+            self._record_backoff(reason, status, delay)
+            rate, limit = self._rate, int(self._limit)
+            
+            self._condition.notify_all()
+        
+        logger.warning(f"⏳ Backing off {delay:.1f}s after {reason} response ({status or 'no status'}): "
+                       f"{rate:.1f} req/s, {limit} in flight")
+    
+    def _record_backoff(self, reason: str, status: Optional[int], delay: float):
+        self.counters['backoff_events'] += 1
+        self._backoffs.append({
+            'time': time.time(),
+            'reason': reason,
+            'status': status,
+            'delay_seconds': round(delay, 3),
+            'rate_per_second': round(self._rate, 1),
+            'concurrency_limit': int(self._limit)
+        })
+    
+    def _p95(self) -> float:
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                **self.counters,
+                'wait_seconds': round(self.counters['wait_seconds'], 3),
+                'rate_per_second': round(self._rate, 1),
+                'concurrency_limit': int(self._limit),
+                'in_flight': self._in_flight,
+                'p95_latency_ms': round(self._p95() * 1000, 1),
+                'backing_off': time.monotonic() < self._resume_at,
+                'recent_backoffs': list(self._backoffs)
+            }
+
+class PassThroughLimiter:
+    # Same interface as AdaptiveRateLimiter, without pacing or concurrency limit
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.requests = 0
+    
+    @property
+    def last_latency(self) -> float:
+        return getattr(self._local, 'latency', 0.0)
+    
+    def execute(self, query):
+        with self._lock:
+            self.requests += 1
+        start = time.perf_counter()
+        try:
+            return query.execute()
+        finally:
+            self._local.latency = time.perf_counter() - start
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'requests': self.requests, 'paced': False}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Law Reference Extractor
+=======================
+
+Single cross-reference extractor shared by the PDF parser (ingest) and the
+navigation system (render-time link generation).
+
+Features:
+- One compiled pattern with named groups for the cue ("voir", "see", "selon"...),
+  the reference kind (article, law, section) and the law number
+- Deduplicated, position-sorted spans: a cued reference and its bare keyword
+  are reported once, starting at the keyword
+- Results memoized by content hash, so the same law text is scanned once
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+REFERENCE_CACHE_SIZE = 4096
+
+REFERENCE_PATTERN = re.compile(r"""
+    (?:(?<!\w)(?P<cue>voir|see|cf\.?|selon|per|conformément\s+à|according\s+to|as\s+per)\s*(?:l')?)?
+    (?<!\w)
+    (?:
+        (?P<article>article|art\.?)
+      | (?P<law>loi|law|rule|règle)
+      | (?P<section>section|§)
+    )
+    \s*
+    (?P<number>\d+(?:\.\d+)*(?:[A-Z])?)
+""", re.IGNORECASE | re.VERBOSE)
+
+REFERENCE_KINDS = ('article', 'law', 'section')
+
+@dataclass(frozen=True)
+class ReferenceSpan:
+    law_number: str
+    kind: str
+    start: int
+    end: int
+    text: str
+    cue: Optional[str] = None
+    
+    def context(self, content: str, radius: int) -> str:
+        return content[max(0, self.start - radius):min(len(content), self.end + radius)].strip()
+
+_cache: 'OrderedDict[bytes, Tuple[ReferenceSpan, ...]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _scan(text: str) -> Tuple[ReferenceSpan, ...]:
+    spans = {}
+    
+    for match in REFERENCE_PATTERN.finditer(text):
+        kind = next(name for name in REFERENCE_KINDS if match.group(name))
+        start = match.start(kind)
+        if start not in spans:
+            spans[start] = ReferenceSpan(
+                law_number=match.group('number'),
+                kind=kind,
+                start=start,
+                end=match.end(),
+                text=text[start:match.end()],
+                cue=match.group('cue')
+            )
+    
+    return tuple(spans[start] for start in sorted(spans))
+
+def extract_references(text: str) -> Tuple[ReferenceSpan, ...]:
+    key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+    
+    spans = _scan(text)
+    
+    with _cache_lock:
+        _cache[key] = spans
+        while len(_cache) > REFERENCE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    
+    return spans
+
+def clear_reference_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Stage Metrics
+=============
+
+Per-stage timers, histograms and counters for a parser run.
+
+Features:
+- Cumulative time and a latency histogram per stage (extract_text and parse
+  per page, validate and dedupe per law, insert per batch)
+- Counters for pages, bytes and HTTP requests
+- Timing wrappers for page iterators: producer time (extraction) and
+  consumer time (parsing, excluding whatever runs downstream of the parser)
+- Thread-safe, picklable (worker process results) and mergeable
+- Export as JSON or Prometheus text format
+
+Author: BridgeFacile Team
+Date: 2025-01-07
+"""
+
+import json
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, Callable
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_ORDER = ('extract_text', 'parse', 'validate', 'dedupe', 'insert')
+PROMETHEUS_SUFFIXES = ('.prom', '.txt')
+
+@dataclass
+class Histogram:
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    counts: List[int] = None
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    
+    def __post_init__(self):
+        if self.counts is None:
+            # One slot per bucket plus the +Inf overflow
+            self.counts = [0] * (len(self.buckets) + 1)
+    
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def merge(self, other: 'Histogram'):
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+    
+    def cumulative(self) -> List[Tuple[str, int]]:
+        bounds = [f"{bound:g}" for bound in self.buckets] + ['+Inf']
+        running = 0
+        result = []
+        for bound, count in zip(bounds, self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'seconds': round(self.total, 6),
+            'mean_seconds': round(self.total / self.count, 6) if self.count else 0.0,
+            'p50_seconds': round(self.quantile(0.5), 6),
+            'p95_seconds': round(self.quantile(0.95), 6),
+            'max_seconds': round(self.max, 6),
+            'buckets': dict(self.cumulative())
+        }
+
+class StageMetrics:
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = Histogram()
+            self.histograms[stage].observe(seconds)
+    
+    def count(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+    
+    def time_items(self, stage: str, items: Iterable[Any]) -> Iterator[Any]:
+        # Time spent producing each item
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(stage, time.perf_counter() - start)
+            yield item
+    
+    def time_transform(self, stage: str, items: Iterable[Any],
+                       transform: Callable[[Iterator[Any]], Iterable[Any]]) -> Iterator[Any]:
+        # Time transform spends on each input item: from handing it over until the next one is
+        # requested, minus the time its outputs are out with the caller (database writes, queues)
+        clock = {'start': 0.0, 'downstream': 0.0}
+        
+        def feed() -> Iterator[Any]:
+            for item in items:
+                clock['start'] = time.perf_counter()
+                clock['downstream'] = 0.0
+                yield item
+                self.observe(stage, time.perf_counter() - clock['start'] - clock['downstream'])
+        
+        for output in transform(feed()):
+            paused = time.perf_counter()
+            yield output
+            clock['downstream'] += time.perf_counter() - paused
+    
+    def merge(self, other: 'StageMetrics'):
+        with self._lock:
+            for stage, histogram in other.histograms.items():
+                if stage not in self.histograms:
+                    self.histograms[stage] = Histogram(histogram.buckets)
+                self.histograms[stage].merge(histogram)
+            for name, value in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+    
+    def stage_names(self) -> List[str]:
+        known = [stage for stage in STAGE_ORDER if stage in self.histograms]
+        return known + sorted(stage for stage in self.histograms if stage not in STAGE_ORDER)
+    
+    def to_dict(self, extra_counters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'stages': {stage: self.histograms[stage].to_dict() for stage in self.stage_names()},
+                'counters': {**self.counters, **(extra_counters or {})}
+            }
+    
+    def to_prometheus(self, prefix: str = 'bridge_parser', extra_counters: Optional[Dict[str, float]] = None) -> str:
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per item in each processing stage",
+            f"# TYPE {prefix}_stage_seconds histogram"
+        ]
+        
+        with self._lock:
+            for stage in self.stage_names():
+                histogram = self.histograms[stage]
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram.total:.6f}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+            counters = {**self.counters, **(extra_counters or {})}
+        
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        
+        return '\n'.join(lines) + '\n'
+
+def write_metrics(path: str, metrics: StageMetrics, extra_counters: Optional[Dict[str, float]] = None):
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith(PROMETHEUS_SUFFIXES):
+            f.write(metrics.to_prometheus(extra_counters=extra_counters))
+        else:
+            json.dump(metrics.to_dict(extra_counters), f, indent=2)
+            f.write('\n')
@@ -10,6 +10,7 @@ Features:
 - Smart duplicate detection with multiple algorithms
 - Comprehensive data validation
 - Batch operations for efficient database inserts
+- Adaptive rate and concurrency limits, shared with the parser's writes
 - Transaction support for data consistency
 - Performance optimization with caching
 - Database health monitoring and optimization
@@ -19,21 +20,41 @@ Date: 2025-01-07
 """
 
 import hashlib
-import time
-from typing import List, Dict, Optional, Any, Tuple, Set
-from dataclasses import dataclass, asdict
+import sqlite3
+from collections import Counter
+from typing import List, Dict, Optional, Any, Tuple, Set, TYPE_CHECKING
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime
 import json
 import logging
+import importlib.util
 
-try:
-    from supabase import create_client, Client
-    HAS_SUPABASE = True
-except ImportError:
-    HAS_SUPABASE = False
+from law_tables import clear_law_tables, has_change_columns
+from local_store import create_storage_client, is_local_url
+from near_duplicates import MinHashLSH, INDEX_FINGERPRINT, word_shingles, jaccard
+from duplicate_snapshot import DuplicateSnapshot, SnapshotWatermark, snapshot_path
+from parse_cache import DEFAULT_CACHE_DIR
+from rate_limiter import PassThroughLimiter, RequestLimiter, shared_limiter
+
+# The supabase client is imported on first connection (create_storage_client), not at import time
+HAS_SUPABASE = importlib.util.find_spec('supabase') is not None
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_SCAN_PAGE_SIZE = 1000
+DUPLICATE_SCAN_COLUMNS = 'id, law_number, content, updated_at, deleted_at'
+# code_laws before migrations 20250715 (deleted_at) and 20250717 (updated_at)
+LEGACY_SCAN_COLUMNS = 'id, law_number, content'
+CONFIRM_FETCH_SIZE = 100
+CONTENT_SIMILARITY_THRESHOLD = 0.9
+TITLE_SIMILARITY_THRESHOLD = 0.95
+# Signature estimates have a standard error of ~0.03 near the threshold: candidates
+# estimated below this are never fetched for the exact comparison
+MIN_ESTIMATED_SIMILARITY = 0.75
+
 @dataclass
 class DuplicateCheckResult:
     is_duplicate: bool
@@ -56,6 +77,8 @@ class BatchInsertResult:
     duplicates_skipped: int
     errors: List[str]
     inserted_ids: List[int]
+    batch_seconds: List[float] = field(default_factory=list)
+    retried: int = 0
 
 class LawDataValidator:
     def __init__(self):
@@ -124,45 +147,216 @@ class LawDataValidator:
         return ValidationResult(is_valid, errors, warnings, cleaned_data)
 
 class DuplicateDetector:
-    def __init__(self, client: Client):
+    def __init__(self, client: 'Client', snapshot_file: Optional[str] = None,
+                 limiter: Optional[RequestLimiter] = None):
         self.client = client
-        self.content_hashes = {}
-        self.law_numbers = set()
+        self.limiter = limiter or PassThroughLimiter()
+        # Law id -> (law number, content hash); texts stay in the database and are fetched for confirmation
+        self.laws: Dict[int, Tuple[str, str]] = {}
+        self.content_hashes: Dict[str, int] = {}
+        self.law_numbers: Counter = Counter()
+        self.lsh_index = MinHashLSH()
+        self.watermark = SnapshotWatermark()
+        self.legacy_schema = False
+        
+        self.snapshot: Optional[DuplicateSnapshot] = None
+        self._saved_watermark = SnapshotWatermark()
+        self._changed_ids: Set[int] = set()
+        self._removed_ids: Set[int] = set()
+        self._replace_snapshot = False
+        if snapshot_file:
+            try:
+                self.snapshot = DuplicateSnapshot(snapshot_file, INDEX_FINGERPRINT)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"⚠️  Duplicate snapshot {snapshot_file} unavailable: {e}")
+        
         self._load_existing_data()
     
     def _load_existing_data(self):
         try:
-            result = self.client.table('code_laws').select('id, law_number, content, title').execute()
+            if not has_change_columns(self.client, self.limiter.execute):
+                # No soft deletes to filter and no delta query to catch up with: a full scan every time
+                self.legacy_schema = True
+                if self.snapshot is not None:
+                    self.snapshot.close()
+                    self.snapshot = None
+                self._scan(self._laws_query)
+                logger.info(f"🔍 Loaded {len(self.laws)} existing laws for duplicate detection")
+                return
             
-            for law in result.data or []:
-                self.law_numbers.add(law['law_number'])
-                content_hash = self._calculate_content_hash(law['content'])
-                self.content_hashes[content_hash] = law
+            if self._restore_snapshot():
+                fetched = self._load_changes()
+                live = self._count_live_laws()
+                if live == len(self.laws):
+                    logger.info(f"🔍 Loaded {len(self.laws)} existing laws from the duplicate snapshot "
+                                f"({fetched} rows fetched since)")
+                    self.save_snapshot()
+                    return
                 
-            logger.info(f"🔍 Loaded {len(self.law_numbers)} existing laws for duplicate detection")
+                # Hard deletes (or soft deletes without updated_at) are invisible to the delta query
+                logger.info(f"🔍 Duplicate snapshot out of date ({len(self.laws)} laws cached, {live} live), rescanning")
+                self._clear()
+            
+            self._scan(lambda: self._live(self._laws_query()))
+            logger.info(f"🔍 Loaded {len(self.laws)} existing laws for duplicate detection")
+            self.save_snapshot()
             
         except Exception as e:
             logger.warning(f"⚠️  Could not load existing data for duplicate detection: {e}")
     
+    def _laws_query(self):
+        return self.client.table('code_laws').select(LEGACY_SCAN_COLUMNS if self.legacy_schema else DUPLICATE_SCAN_COLUMNS)
+    
+    def _live(self, query):
+        return query if self.legacy_schema else query.is_('deleted_at', 'null')
+    
+    def _scan(self, build_query, after_id: Optional[int] = None) -> int:
+        # Keyset pagination on id: a page smaller than asked for (PostgREST max-rows) is
+        # not the end of the table, an empty one is
+        last_id = after_id
+        fetched = 0
+        
+        while True:
+            query = build_query()
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            page = self.limiter.execute(query.order('id').limit(DUPLICATE_SCAN_PAGE_SIZE)).data or []
+            if not page:
+                return fetched
+            
+            for row in page:
+                self._apply_row(row)
+            fetched += len(page)
+            last_id = page[-1]['id']
+    
+    def _load_changes(self) -> int:
+        # Rows inserted since the snapshot, then older rows updated since (soft deletes included)
+        max_id, max_updated_at = self.watermark.max_id, self.watermark.max_updated_at
+        fetched = self._scan(self._laws_query, after_id=max_id)
+        if max_updated_at is not None:
+            fetched += self._scan(lambda: self._laws_query().gt('updated_at', max_updated_at).lte('id', max_id))
+        elif max_id is not None:
+            # No row had updated_at when the snapshot was taken: any row with one has changed since
+            fetched += self._scan(lambda: self._laws_query().not_.is_('updated_at', 'null').lte('id', max_id))
+        return fetched
+    
+    def _count_live_laws(self) -> int:
+        result = self.limiter.execute(self._live(self.client.table('code_laws').select('id', count='exact')).limit(1))
+        return result.count or 0
+    
+    def _apply_row(self, row: Dict):
+        if self.watermark.max_id is None or row['id'] > self.watermark.max_id:
+            self.watermark.max_id = row['id']
+        updated_at = row.get('updated_at')
+        if updated_at and (self.watermark.max_updated_at is None or updated_at > self.watermark.max_updated_at):
+            self.watermark.max_updated_at = updated_at
+        
+        if row.get('deleted_at'):
+            self._forget(row['id'])
+        else:
+            self._remember(row['id'], row['law_number'], row['content'])
+    
+    def _restore_snapshot(self) -> bool:
+        if self.snapshot is None:
+            return False
+        
+        loaded = self.snapshot.load()
+        if loaded is None:
+            self._replace_snapshot = True
+            return False
+        
+        self.watermark, laws = loaded
+        self._saved_watermark = replace(self.watermark)
+        for law_id, law_number, content_hash, entry in laws:
+            self.laws[law_id] = (law_number, content_hash)
+            self.law_numbers[law_number] += 1
+            self.content_hashes.setdefault(content_hash, law_id)
+            if entry is not None:
+                self.lsh_index.restore(law_id, entry)
+        return True
+    
+    def save_snapshot(self):
+        if self.snapshot is None:
+            return
+        if not (self._changed_ids or self._removed_ids or self._replace_snapshot or self.watermark != self._saved_watermark):
+            return
+        
+        laws = [(law_id, *self.laws[law_id], self.lsh_index.entries.get(law_id)) for law_id in sorted(self._changed_ids)]
+        try:
+            self.snapshot.save(self.watermark, laws, self._removed_ids, replace=self._replace_snapshot)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Could not save duplicate snapshot {self.snapshot.path}: {e}")
+            return
+        
+        self._changed_ids.clear()
+        self._removed_ids.clear()
+        self._replace_snapshot = False
+        self._saved_watermark = replace(self.watermark)
+    
+    def _clear(self):
+        self.laws.clear()
+        self.content_hashes.clear()
+        self.law_numbers.clear()
+        self.lsh_index = MinHashLSH()
+        self.watermark = SnapshotWatermark()
+        self._changed_ids.clear()
+        self._removed_ids.clear()
+        self._replace_snapshot = True
+    
+    def reset(self):
+        # The table was emptied: nothing to scan
+        self._clear()
+        self.save_snapshot()
+    
     def _calculate_content_hash(self, content: str) -> str:
         normalized = ''.join(content.lower().split())
         return hashlib.md5(normalized.encode()).hexdigest()
     
+    def _remember(self, law_id: int, law_number: str, content: str):
+        content_hash = self._calculate_content_hash(content)
+        known = self.laws.get(law_id)
+        if known == (law_number, content_hash):
+            return
+        if known is not None:
+            self._forget(law_id)
+        
+        self.laws[law_id] = (law_number, content_hash)
+        self.law_numbers[law_number] += 1
+        self.content_hashes.setdefault(content_hash, law_id)
+        self.lsh_index.add(law_id, word_shingles(content))
+        self._changed_ids.add(law_id)
+        self._removed_ids.discard(law_id)
+    
+    def _forget(self, law_id: int):
+        known = self.laws.pop(law_id, None)
+        if known is None:
+            return
+        
+        law_number, content_hash = known
+        self.law_numbers[law_number] -= 1
+        if not self.law_numbers[law_number]:
+            del self.law_numbers[law_number]
+        if self.content_hashes.get(content_hash) == law_id:
+            del self.content_hashes[content_hash]
+        self.lsh_index.remove(law_id)
+        self._changed_ids.discard(law_id)
+        self._removed_ids.add(law_id)
+    
+    def _fetch_laws(self, law_ids: List[int]) -> List[Dict]:
+        laws = []
+        try:
+            for start in range(0, len(law_ids), CONFIRM_FETCH_SIZE):
+                result = self.limiter.execute(self._live(self.client.table('code_laws').select('id, law_number, content, title')
+                    .in_('id', law_ids[start:start + CONFIRM_FETCH_SIZE])))
+                laws.extend(result.data or [])
+        except Exception as e:
+            logger.warning(f"⚠️  Could not fetch duplicate candidates {law_ids}: {e}")
+        return sorted(laws, key=lambda law: law['id'])
+    
     def _calculate_similarity(self, text1: str, text2: str) -> float:
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union) if union else 0.0
+        return jaccard(word_shingles(text1), word_shingles(text2))
     
     def check_duplicate(self, law_data: Dict) -> DuplicateCheckResult:
-        reasons = []
-        
         if law_data['law_number'] in self.law_numbers:
             return DuplicateCheckResult(
                 is_duplicate=True,
@@ -174,20 +368,62 @@ class DuplicateDetector:
         
         content_hash = self._calculate_content_hash(law_data['content'])
         if content_hash in self.content_hashes:
-            existing = self.content_hashes[content_hash]
             return DuplicateCheckResult(
                 is_duplicate=True,
                 confidence=1.0,
-                existing_id=existing['id'],
+                existing_id=self.content_hashes[content_hash],
                 similarity_reasons=['Identical content hash'],
-                existing_data=existing
+                existing_data=None
             )
         
+        # Exact similarity only for the laws sharing an LSH band with this one and
+        # close enough by signature estimate
+        words = word_shingles(law_data['content'])
+        candidates = self.lsh_index.candidates(words, MIN_ESTIMATED_SIMILARITY)
+        return self._best_match(law_data, words, self._fetch_laws(sorted(candidates)))
+    
+    def check_batch(self, laws: List[Dict]) -> List[DuplicateCheckResult]:
+        # Each law against the cache, then against the laws kept before it in the same batch
+        # (not inserted yet, so compared on the texts at hand)
+        results = []
+        kept: List[Dict] = []
+        kept_numbers: Set[str] = set()
+        kept_hashes: Dict[str, int] = {}
+        kept_index = self.lsh_index.scratch()
+        
+        for law_data in laws:
+            result = self.check_duplicate(law_data)
+            content_hash = self._calculate_content_hash(law_data['content'])
+            words = word_shingles(law_data['content'])
+            
+            if not result.is_duplicate:
+                if law_data['law_number'] in kept_numbers:
+                    result = DuplicateCheckResult(True, 1.0, None, ['Exact law number match in batch'])
+                elif content_hash in kept_hashes:
+                    result = DuplicateCheckResult(True, 1.0, None, ['Identical content hash in batch'],
+                                                  kept[kept_hashes[content_hash]])
+                else:
+                    candidates = kept_index.candidates(words, MIN_ESTIMATED_SIMILARITY)
+                    in_batch = self._best_match(law_data, words, [kept[position] for position in sorted(candidates)])
+                    if in_batch.is_duplicate:
+                        result = in_batch
+            
+            if not result.is_duplicate:
+                kept_numbers.add(law_data['law_number'])
+                kept_hashes.setdefault(content_hash, len(kept))
+                kept_index.add(len(kept), words)
+                kept.append(law_data)
+            results.append(result)
+        
+        return results
+    
+    def _best_match(self, law_data: Dict, words: Set[str], candidate_laws: List[Dict]) -> DuplicateCheckResult:
+        reasons = []
         max_similarity = 0.0
         most_similar = None
         
-        for existing_hash, existing_law in self.content_hashes.items():
-            similarity = self._calculate_similarity(law_data['content'], existing_law['content'])
+        for existing_law in candidate_laws:
+            similarity = jaccard(words, word_shingles(existing_law['content']))
             
             if similarity > max_similarity:
                 max_similarity = similarity
@@ -200,12 +436,12 @@ class DuplicateDetector:
         is_duplicate = False
         confidence = 0.0
         
-        if max_similarity > 0.9:
+        if max_similarity > CONTENT_SIMILARITY_THRESHOLD:
             is_duplicate = True
             confidence = max_similarity
             reasons.append(f'High content similarity ({max_similarity:.2%})')
         
-        if title_similarity > 0.95:
+        if title_similarity > TITLE_SIMILARITY_THRESHOLD:
             is_duplicate = True
             confidence = max(confidence, title_similarity)
             reasons.append(f'Very similar title ({title_similarity:.2%})')
@@ -213,29 +449,27 @@ class DuplicateDetector:
         return DuplicateCheckResult(
             is_duplicate=is_duplicate,
             confidence=confidence,
-            existing_id=most_similar['id'] if most_similar else None,
+            existing_id=most_similar.get('id') if most_similar else None,
             similarity_reasons=reasons,
             existing_data=most_similar
         )
     
     def add_to_cache(self, law_data: Dict, law_id: int):
-        self.law_numbers.add(law_data['law_number'])
-        content_hash = self._calculate_content_hash(law_data['content'])
-        self.content_hashes[content_hash] = {
-            'id': law_id,
-            'law_number': law_data['law_number'],
-            'content': law_data['content'],
-            'title': law_data['title']
-        }
+        # The watermark only moves with rows read back from the table, so laws inserted
+        # concurrently by other writers below this id are still fetched next time
+        self._remember(law_id, law_data['law_number'], law_data['content'])
 
 class EnhancedSupabaseManager:
-    def __init__(self, supabase_url: str, supabase_key: str):
-        if not HAS_SUPABASE:
+    def __init__(self, supabase_url: str, supabase_key: str, snapshot_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        if not HAS_SUPABASE and not is_local_url(supabase_url):
             raise ImportError("Supabase client not available. Install with: pip install supabase")
         
-        self.client: Client = create_client(supabase_url, supabase_key)
+        self.client: 'Client' = create_storage_client(supabase_url, supabase_key)
+        self.limiter = shared_limiter(supabase_url)
         self.validator = LawDataValidator()
-        self.duplicate_detector = DuplicateDetector(self.client)
+        self.duplicate_detector = DuplicateDetector(self.client,
+                                                    snapshot_path(snapshot_dir, supabase_url) if snapshot_dir else None,
+                                                    self.limiter)
         
         self.stats = {
             'total_inserts': 0,
@@ -251,51 +485,37 @@ class EnhancedSupabaseManager:
             logger.warning("⚠️  Table clearing requires confirmation")
             return {}
         
-        results = {}
+        try:
+            results = clear_law_tables(self.client, table_names)
+        except Exception as e:
+            logger.error(f"❌ Error clearing {', '.join(table_names)}: {e}")
+            return {table_name: 0 for table_name in table_names}
         
-        for table_name in table_names:
-            try:
-                count_result = self.client.table(table_name).select('id', count='exact').execute()
-                original_count = count_result.count if hasattr(count_result, 'count') else 0
-                
-                delete_result = self.client.table(table_name).delete().neq('id', 0).execute()
-                
-                results[table_name] = original_count
-                logger.info(f"🗑️  Cleared {original_count} records from {table_name}")
-                
-                if table_name == 'code_laws':
-                    self.duplicate_detector = DuplicateDetector(self.client)
-                
-            except Exception as e:
-                logger.error(f"❌ Error clearing {table_name}: {e}")
-                results[table_name] = 0
+        for table_name, count in results.items():
+            logger.info(f"🗑️  Cleared {count} records from {table_name}")
+        
+        if 'code_laws' in results:
+            self.duplicate_detector.reset()
         
         return results
     
-    def insert_law_with_validation(self, law_data: Dict, skip_duplicates: bool = True) -> Optional[int]:
+    def _validate(self, law_data: Dict) -> ValidationResult:
         validation = self.validator.validate_law_data(law_data)
         
         if not validation.is_valid:
             logger.error(f"❌ Validation failed for law {law_data.get('law_number', 'unknown')}: {validation.errors}")
             self.stats['validation_errors'] += 1
-            return None
+            return validation
         
         if validation.warnings:
             for warning in validation.warnings:
                 logger.warning(f"⚠️  {warning}")
         
-        cleaned_data = validation.cleaned_data
-        
-        if skip_duplicates:
-            duplicate_check = self.duplicate_detector.check_duplicate(cleaned_data)
-            
-            if duplicate_check.is_duplicate:
-                logger.info(f"🔄 Skipping duplicate law {cleaned_data['law_number']} (confidence: {duplicate_check.confidence:.2%})")
-                self.stats['duplicates_prevented'] += 1
-                return duplicate_check.existing_id
-        
+        return validation
+    
+    def _insert_one(self, cleaned_data: Dict) -> Optional[int]:
         try:
-            result = self.client.table('code_laws').insert(cleaned_data).execute()
+            result = self.limiter.execute(self.client.table('code_laws').insert(cleaned_data))
             
             if result.data:
                 law_id = result.data[0]['id']
@@ -310,30 +530,103 @@ class EnhancedSupabaseManager:
         
         return None
     
-    def batch_insert_laws(self, laws_data: List[Dict], skip_duplicates: bool = True, batch_size: int = 50) -> BatchInsertResult:
-        result = BatchInsertResult(0, 0, 0, [], [])
+    def insert_law_with_validation(self, law_data: Dict, skip_duplicates: bool = True) -> Optional[int]:
+        validation = self._validate(law_data)
+        if not validation.is_valid:
+            return None
         
-        logger.info(f"📦 Starting batch insert of {len(laws_data)} laws (batch size: {batch_size})")
+        cleaned_data = validation.cleaned_data
         
-        for i in range(0, len(laws_data), batch_size):
-            batch = laws_data[i:i + batch_size]
+        if skip_duplicates:
+            duplicate_check = self.duplicate_detector.check_duplicate(cleaned_data)
             
-            logger.info(f"📊 Processing batch {i//batch_size + 1}/{(len(laws_data) + batch_size - 1)//batch_size}")
+            if duplicate_check.is_duplicate:
+                logger.info(f"🔄 Skipping duplicate law {cleaned_data['law_number']} (confidence: {duplicate_check.confidence:.2%})")
+                self.stats['duplicates_prevented'] += 1
+                return duplicate_check.existing_id
+        
+        return self._insert_one(cleaned_data)
+    
+    def _send_batch(self, rows: List[Dict]) -> Tuple[Any, Optional[Exception], float]:
+        # Runs on the executor threads; cache updates and retries stay on the caller's thread
+        try:
+            response = self.limiter.execute(self.client.table('code_laws').insert(rows))
+        except Exception as e:
+            return None, e, self.limiter.last_latency
+        return response, None, self.limiter.last_latency
+    
+    def _record_batch(self, rows: List[Dict], outcome: Tuple[Any, Optional[Exception], float], result: BatchInsertResult):
+        response, error, seconds = outcome
+        result.batch_seconds.append(seconds)
+        
+        if error is not None:
+            logger.warning(f"⚠️  Batch of {len(rows)} laws rejected ({error}), retrying one by one")
+            result.retried += len(rows)
             
-            for law_data in batch:
-                law_id = self.insert_law_with_validation(law_data, skip_duplicates)
-                
-                if law_id:
+            for row in rows:
+                law_id = self._insert_one(row)
+                if law_id is None:
+                    result.failed += 1
+                    result.errors.append(f"Insert failed for law {row['law_number']}")
+                else:
                     result.successful += 1
                     result.inserted_ids.append(law_id)
+            return
+        
+        # Rows come back in insertion order
+        inserted = response.data or []
+        for row, inserted_row in zip(rows, inserted):
+            self.duplicate_detector.add_to_cache(row, inserted_row['id'])
+            result.inserted_ids.append(inserted_row['id'])
+        
+        result.successful += len(inserted)
+        self.stats['total_inserts'] += len(inserted)
+        for row in rows[len(inserted):]:
+            result.failed += 1
+            result.errors.append(f"No id returned for law {row['law_number']}")
+    
+    def batch_insert_laws(self, laws_data: List[Dict], skip_duplicates: bool = True, batch_size: int = 50) -> BatchInsertResult:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        result = BatchInsertResult(0, 0, 0, [], [])
+        
+        logger.info(f"📦 Starting batch insert of {len(laws_data)} laws (batch size: {batch_size})")
+        
+        rows = []
+        for law_data in laws_data:
+            validation = self._validate(law_data)
+            if validation.is_valid:
+                rows.append(validation.cleaned_data)
+            else:
+                result.failed += 1
+                result.errors.append(f"Law {law_data.get('law_number', 'unknown')}: {'; '.join(validation.errors)}")
+        
+        if skip_duplicates and rows:
+            # Against the cache and against each other, before any batch is sent
+            unique_rows = []
+            for row, duplicate_check in zip(rows, self.duplicate_detector.check_batch(rows)):
+                if duplicate_check.is_duplicate:
+                    logger.info(f"🔄 Skipping duplicate law {row['law_number']} (confidence: {duplicate_check.confidence:.2%})")
+                    result.duplicates_skipped += 1
                 else:
-                    result.failed += 1
-            
-            time.sleep(0.1)
+                    unique_rows.append(row)
+            rows = unique_rows
+        
+        batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+        
+        # As many batches in flight as the shared rate limiter allows
+        with ThreadPoolExecutor(max_workers=self.limiter.max_concurrency) as executor:
+            for batch_number, (batch, outcome) in enumerate(zip(batches, executor.map(self._send_batch, batches)), 1):
+                logger.info(f"📊 Processed batch {batch_number}/{len(batches)} ({len(batch)} laws)")
+                self._record_batch(batch, outcome, result)
         
-        result.duplicates_skipped = self.stats['duplicates_prevented']
+        self.stats['duplicates_prevented'] += result.duplicates_skipped
+        self.duplicate_detector.save_snapshot()
         
-        logger.info(f"📊 Batch insert complete: {result.successful} successful, {result.failed} failed, {result.duplicates_skipped} duplicates skipped")
+        average_ms = sum(result.batch_seconds) / len(result.batch_seconds) * 1000 if result.batch_seconds else 0.0
+        logger.info(f"📊 Batch insert complete: {result.successful} successful, {result.failed} failed, "
+                    f"{result.duplicates_skipped} duplicates skipped, {len(result.batch_seconds)} insert requests "
+                    f"({average_ms:.0f} ms average)")
         
         return result
     
@@ -350,7 +643,7 @@ class EnhancedSupabaseManager:
                     'position': ref['position']
                 }
                 
-                result = self.client.table('law_references').insert(ref_data).execute()
+                result = self.limiter.execute(self.client.table('law_references').insert(ref_data))
                 
                 if result.data:
                     inserted_count += 1
@@ -367,13 +660,13 @@ class EnhancedSupabaseManager:
         
         for table in tables:
             try:
-                result = self.client.table(table).select('*', count='exact').limit(1).execute()
+                result = self.limiter.execute(self.client.table(table).select('*', count='exact').limit(1))
                 count = result.count if hasattr(result, 'count') else 0
                 
                 stats[table] = {'count': count}
                 
                 if table == 'code_laws':
-                    category_result = self.client.table(table).select('category').execute()
+                    category_result = self.limiter.execute(self.client.table(table).select('category'))
                     categories = {}
                     for row in category_result.data or []:
                         cat = row['category']
@@ -382,7 +675,7 @@ class EnhancedSupabaseManager:
                     stats[table]['categories'] = categories
                     
                     if count > 0:
-                        content_result = self.client.table(table).select('char_count').execute()
+                        content_result = self.limiter.execute(self.client.table(table).select('char_count'))
                         if content_result.data:
                             total_chars = sum(row.get('char_count', 0) for row in content_result.data)
                             stats[table]['avg_content_length'] = total_chars // len(content_result.data)
@@ -403,11 +696,11 @@ class EnhancedSupabaseManager:
         }
         
         try:
-            duplicate_refs = self.client.rpc('remove_duplicate_references').execute()
+            duplicate_refs = self.limiter.execute(self.client.rpc('remove_duplicate_references'))
             if duplicate_refs.data:
                 optimization_results['duplicate_references_removed'] = duplicate_refs.data
             
-            orphaned_refs = self.client.rpc('remove_orphaned_references').execute()
+            orphaned_refs = self.limiter.execute(self.client.rpc('remove_orphaned_references'))
             if orphaned_refs.data:
                 optimization_results['orphaned_references_removed'] = orphaned_refs.data
             
@@ -425,12 +718,16 @@ class EnhancedSupabaseManager:
         return {
             **self.stats,
             'cache_size': len(self.duplicate_detector.content_hashes),
-            'known_law_numbers': len(self.duplicate_detector.law_numbers)
+            'known_law_numbers': len(self.duplicate_detector.law_numbers),
+            'lsh_indexed_laws': self.duplicate_detector.lsh_index.size,
+            'duplicate_snapshot': self.duplicate_detector.snapshot.path if self.duplicate_detector.snapshot else None,
+            'rate_limiter': self.limiter.get_stats()
         }
 
 
-def create_enhanced_manager(supabase_url: str, supabase_key: str) -> EnhancedSupabaseManager:
-    return EnhancedSupabaseManager(supabase_url, supabase_key)
+def create_enhanced_manager(supabase_url: str, supabase_key: str,
+                            snapshot_dir: Optional[str] = DEFAULT_CACHE_DIR) -> EnhancedSupabaseManager:
+    return EnhancedSupabaseManager(supabase_url, supabase_key, snapshot_dir)
 
 
 if __name__ == "__main__":
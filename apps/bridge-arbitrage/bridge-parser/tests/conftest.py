@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_text_pdf(path, pages):
+    # Minimal PDF: one Helvetica text line per line of each page, enough for pdfplumber and PyPDF2
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        lines = ''.join(f'({_escape(line)}) Tj 0 -14 Td ' for line in text.splitlines())
+        stream = f'BT /F1 11 Tf 50 780 Td {lines}ET'.encode('latin-1')
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream.decode("latin-1")}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+    
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(data)
+    data += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    data += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    data += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+LAW_PAGES = [
+    "REGLEMENT NATIONAL\n"
+    "Article 1: Le present reglement s'applique a toutes les competitions.\n"
+    "Les joueurs en acceptent les dispositions en s'inscrivant.\n"
+    "Article 2: L'arbitre est designe par l'organisateur du tournoi.\n"
+    "Il veille au respect de l'Article 1 et des lois du bridge.",
+    "Il peut deleguer ses fonctions a un arbitre adjoint qualifie.\n"
+    "Article 3: Les resultats sont publies a la fin de chaque seance.\n"
+    "Toute contestation est adressee a l'arbitre dans les trente minutes.",
+]
+
+
+@pytest.fixture
+def pdf_directory(tmp_path):
+    directory = tmp_path / 'pdfs'
+    directory.mkdir()
+    write_text_pdf(str(directory / 'reglement.pdf'), LAW_PAGES)
+    return directory
@@ -0,0 +1,67 @@
+from supabase_integration import EnhancedSupabaseManager
+
+
+def law_data(law_number, topic=None):
+    topic = topic or f'sujet{law_number}'
+    return {'law_number': law_number, 'title': f'Loi {law_number}', 'category': 'general',
+            'content': ' '.join(f'{topic}_{word}' for word in range(30))}
+
+
+class RejectingClient:
+    # Stands in for a constraint violation: any insert containing the given law is refused
+    def __init__(self, client, law_number):
+        self.client = client
+        self.law_number = law_number
+    
+    def table(self, name):
+        query = self.client.table(name)
+        insert = query.insert
+        
+        def checked_insert(rows, **kwargs):
+            if any(row.get('law_number') == self.law_number for row in (rows if isinstance(rows, list) else [rows])):
+                raise ValueError(f'new row for law {self.law_number} violates check constraint')
+            return insert(rows, **kwargs)
+        
+        query.insert = checked_insert
+        return query
+    
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def make_manager(tmp_path):
+    return EnhancedSupabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key', snapshot_dir=None)
+
+
+def test_each_batch_is_one_insert_request(tmp_path):
+    manager = make_manager(tmp_path)
+    requests = manager.client.get_stats()['requests']
+    
+    result = manager.batch_insert_laws([law_data(str(number)) for number in range(1, 13)], batch_size=5)
+    
+    assert (result.successful, result.failed, result.retried) == (12, 0, 0)
+    assert len(result.batch_seconds) == 3
+    assert manager.client.get_stats()['requests'] - requests == 3
+    rows = manager.client.table('code_laws').select('id, law_number').order('id').execute().data
+    assert result.inserted_ids == [row['id'] for row in rows]
+
+
+def test_duplicates_within_the_call_are_skipped_not_counted(tmp_path):
+    manager = make_manager(tmp_path)
+    
+    result = manager.batch_insert_laws([law_data('1'), law_data('2'), law_data('1', 'autre'), law_data('3', 'sujet2')])
+    
+    assert (result.successful, result.duplicates_skipped) == (2, 2)
+
+
+def test_rejected_batch_is_retried_row_by_row(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.client = RejectingClient(manager.client, '3')
+    
+    result = manager.batch_insert_laws([law_data(str(number)) for number in range(1, 9)], batch_size=4)
+    
+    assert (result.successful, result.failed, result.retried) == (7, 1, 4)
+    assert result.errors == ['Insert failed for law 3']
+    assert len(result.inserted_ids) == 7
+    assert not manager.duplicate_detector.check_duplicate(law_data('3')).is_duplicate
+    assert manager.duplicate_detector.check_duplicate(law_data('9', 'sujet4')).is_duplicate
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from enhanced_bridge_parser import DatabaseManager, LawReference, ParsedLaw
+
+
+def make_law(law_number, targets=()):
+    content = f'Texte de la loi {law_number}.'
+    references = [LawReference(law_number, target, None, content, 0) for target in targets]
+    return ParsedLaw(law_number=law_number, title=f'Loi {law_number}', content=content, category='general',
+                     subcategory=None, source_file='a.pdf', page_number=1, references=references,
+                     char_count=len(content), created_at=datetime.now())
+
+
+class RejectingClient:
+    # Stands in for a constraint violation: any insert containing the given law is refused
+    def __init__(self, client, law_number):
+        self.client = client
+        self.law_number = law_number
+    
+    def table(self, name):
+        query = self.client.table(name)
+        insert = query.insert
+        
+        def checked_insert(rows, **kwargs):
+            if any(row.get('law_number') == self.law_number for row in rows):
+                raise ValueError(f'new row for law {self.law_number} violates check constraint')
+            return insert(rows, **kwargs)
+        
+        query.insert = checked_insert
+        return query
+    
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def stored_rows(db_manager, table, columns):
+    return db_manager.client.table(table).select(columns).order('id').execute().data
+
+
+def test_batch_is_one_request_for_laws_and_one_for_references(tmp_path):
+    db_manager = DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key')
+    laws = [make_law(str(number), targets=[str(number + 1), str(number + 2)]) for number in range(1, 6)]
+    
+    report = db_manager.insert_laws(laws)
+    
+    assert report.requests == 2
+    assert report.failures == [] and report.references_inserted == 10
+    ids = {row['law_number']: row['id'] for row in stored_rows(db_manager, 'code_laws', 'id, law_number')}
+    assert report.law_ids == [ids[law.law_number] for law in laws]
+    references = stored_rows(db_manager, 'law_references', 'source_law_id, target_law_number')
+    assert {(row['source_law_id'], row['target_law_number']) for row in references} == \
+        {(ids[law.law_number], ref.target_law_number) for law in laws for ref in law.references}
+
+
+def test_rejected_row_is_isolated_and_reported(tmp_path):
+    db_manager = DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key')
+    db_manager.client = RejectingClient(db_manager.client, '5')
+    laws = [make_law(str(number), targets=['1']) for number in range(1, 9)]
+    
+    report = db_manager.insert_laws(laws)
+    
+    assert [(failure.table, failure.index, failure.law_number) for failure in report.failures] == [('code_laws', 4, '5')]
+    assert report.law_ids[4] is None and None not in report.law_ids[:4] + report.law_ids[5:]
+    assert report.references_inserted == 7
+    assert [row['law_number'] for row in stored_rows(db_manager, 'code_laws', 'law_number')] == \
+        ['1', '2', '3', '4', '6', '7', '8']
@@ -0,0 +1,30 @@
+from enhanced_bridge_parser import LawParser
+
+TEXTS = [
+    "Le déclarant joue la carte du mort, puis le pli est rendu.",
+    "Une pénalité ou une sanction suit l'enchère insuffisante.",
+    "Une enchère, une pénalité.",
+    "Le tournoi se déroule selon la procédure habituelle du tournoi.",
+    "Aucun mot-clé ici.",
+]
+
+
+def test_best_score_wins_and_ties_keep_keyword_order():
+    parser = LawParser()
+    
+    assert [parser.categorize(text).category for text in TEXTS] == \
+        ['play', 'penalties', 'bidding', 'tournament', 'general']
+    assert parser.categorize(TEXTS[1]).scores == {'penalties': 2, 'bidding': 1}
+
+
+def test_batch_matches_single_law_categorization():
+    parser = LawParser()
+    
+    assert parser.categorize_batch(TEXTS) == [parser.categorize(text) for text in TEXTS]
+
+
+def test_runner_up_category_is_not_a_subcategory():
+    law = LawParser().build_law('12', TEXTS[1] * 2, 'a.pdf', 1)
+    
+    assert law.category == 'penalties'
+    assert law.subcategory is None
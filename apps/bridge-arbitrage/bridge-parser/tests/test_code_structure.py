@@ -0,0 +1,62 @@
+import re
+
+from code_structure import parse_code_structure
+
+TOC_THEN_BODY = """TABLE DES MATIÈRES
+LOI 1 - Les cartes ........ 5
+LOI 2 - Les étuis ........ 5
+A. Numérotation ........ 5
+LOI 1 - Les cartes
+Un jeu de bridge est composé de 52 cartes.
+LOI 2 - Les étuis
+A. Numérotation
+1. Chaque étui est numéroté.
+"""
+
+
+def test_toc_followed_directly_by_the_body():
+    structure = parse_code_structure([(1, TOC_THEN_BODY)])
+    
+    assert [law.reference for law in structure.laws()] == ['1', '2']
+    assert structure.get('1').content == 'Un jeu de bridge est composé de 52 cartes.'
+    assert structure.get('2A').chapter_name == 'Numérotation'
+    assert structure.get('2A1').content == 'Chaque étui est numéroté.'
+    assert 'Un jeu de bridge' not in structure.get('TABLE DES MATIÈRES').content
+
+
+def test_wrapped_toc_entry_stays_in_the_toc():
+    structure = parse_code_structure([(1, "TABLE DES MATIÈRES\n"
+                                          "LOI 40 - Accords de partenaires et\n"
+                                          "conventions ........ 45\n")])
+    
+    assert structure.laws() == []
+
+
+def test_edition_headings_follow_the_year_in_the_text():
+    structure = parse_code_structure([(1, "PRÉFACE AUX LOIS DE 2027\nTexte.\n"
+                                          "Code International du Bridge 2027 - 3 -\n"
+                                          "INDEX CODE 2027\n")])
+    
+    assert [section.reference for section in structure.sections()] == \
+        ['PRÉFACE AUX LOIS DE 2027', 'INDEX Code 2027']
+    assert structure.get('PRÉFACE AUX LOIS DE 2027').content == 'Texte.'
+
+
+def test_custom_footer_pattern():
+    structure = parse_code_structure([(1, "LOI 1 - Les cartes\nLaws of Duplicate Bridge - 4\nUn jeu.\n")],
+                                     footer_pattern=re.compile(r'^Laws of Duplicate Bridge - \d+$'))
+    
+    assert structure.get('1').content == 'Un jeu.'
+
+
+def test_toc_with_split_leaders_and_words():
+    # PyPDF2 output of the same table: spaces inside words, dot leaders and page numbers
+    structure = parse_code_structure([(1, "TABLE DES MATIÈRES\n"
+                                          "LOI 46 - Désignation d’une c arte ...... ..... 59\n"
+                                          "A. Manière correcte de dés igner ...... ....... 5 9\n"
+                                          "LOI 46 - DÉSIGNATION D’UNE CARTE\n"
+                                          "A. Manière correcte de désigner\n"
+                                          "1. Le déclarant énonce la carte.\n")])
+    
+    assert structure.get('46').law_name == 'Désignation d’une c arte'
+    assert structure.get('46A1').content == 'Le déclarant énonce la carte.'
@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime
+
+from duplicate_snapshot import DuplicateSnapshot, SnapshotWatermark
+from enhanced_bridge_parser import DatabaseManager, ParsedLaw
+from supabase_integration import EnhancedSupabaseManager
+
+
+def make_law(law_number, content):
+    return ParsedLaw(law_number=law_number, title=f'Loi {law_number}', content=content, category='general',
+                     subcategory=None, source_file='a.pdf', page_number=1, references=[],
+                     char_count=len(content), created_at=datetime.now())
+
+
+def law_text(prefix, index):
+    return f'{prefix} {index} ' + ' '.join(f'mot{index}_{word}' for word in range(30))
+
+
+def test_snapshot_sees_upserted_and_soft_deleted_rows(tmp_path):
+    url = f"local://{tmp_path / 'store.sqlite'}"
+    snapshot_dir = str(tmp_path / 'snapshot')
+    db_manager = DatabaseManager(url, 'key')
+    laws = [make_law(str(index), law_text('Texte de la loi', index)) for index in range(1, 21)]
+    db_manager.insert_laws(laws, with_hash=True)
+    EnhancedSupabaseManager(url, 'key', snapshot_dir=snapshot_dir)
+    
+    # Law 3 rewritten in place: the next snapshot load must pick up the new text
+    rewritten = make_law('3', law_text('Contenu entièrement réécrit', 3))
+    assert db_manager.begin_sync(['a.pdf']).apply([rewritten]).updated == 1
+    detector = EnhancedSupabaseManager(url, 'key', snapshot_dir=snapshot_dir).duplicate_detector
+    
+    assert detector.check_duplicate({'law_number': 'X', 'content': rewritten.content, 'title': 't'}).is_duplicate
+    assert not detector.check_duplicate({'law_number': 'X', 'content': laws[2].content, 'title': 't'}).is_duplicate
+    
+    # Laws 19 and 20 no longer seen: soft-deleted, and gone from the next snapshot load
+    session = db_manager.begin_sync(['a.pdf'])
+    session.apply(laws[:2] + [rewritten] + laws[3:18])
+    assert session.finish(['a.pdf']).soft_deleted == 2
+    detector = EnhancedSupabaseManager(url, 'key', snapshot_dir=snapshot_dir).duplicate_detector
+    
+    assert len(detector.laws) == 18
+
+
+def test_warm_start_fetches_only_new_rows(tmp_path, caplog):
+    url = f"local://{tmp_path / 'store.sqlite'}"
+    snapshot_dir = str(tmp_path / 'snapshot')
+    db_manager = DatabaseManager(url, 'key')
+    db_manager.insert_laws([make_law(str(index), law_text('Texte', index)) for index in range(1, 11)], with_hash=True)
+    EnhancedSupabaseManager(url, 'key', snapshot_dir=snapshot_dir)
+    added = make_law('11', law_text('Texte', 11))
+    db_manager.insert_laws([added], with_hash=True)
+    
+    with caplog.at_level(logging.INFO, logger='supabase_integration'):
+        detector = EnhancedSupabaseManager(url, 'key', snapshot_dir=snapshot_dir).duplicate_detector
+    
+    assert 'from the duplicate snapshot (1 rows fetched since)' in caplog.text
+    assert len(detector.laws) == 11
+    assert detector.check_duplicate({'law_number': 'X', 'content': added.content, 'title': 't'}).is_duplicate
+
+
+def test_hard_delete_triggers_a_rescan(tmp_path, caplog):
+    url = f"local://{tmp_path / 'store.sqlite'}"
+    snapshot_dir = str(tmp_path / 'snapshot')
+    db_manager = DatabaseManager(url, 'key')
+    db_manager.insert_laws([make_law(str(index), law_text('Texte', index)) for index in range(1, 6)], with_hash=True)
+    EnhancedSupabaseManager(url, 'key', snapshot_dir=snapshot_dir)
+    db_manager.client.table('code_laws').delete().eq('law_number', '5').execute()
+    
+    with caplog.at_level(logging.INFO, logger='supabase_integration'):
+        detector = EnhancedSupabaseManager(url, 'key', snapshot_dir=snapshot_dir).duplicate_detector
+    
+    assert 'Duplicate snapshot out of date (5 laws cached, 4 live)' in caplog.text
+    assert sorted(number for number, _ in detector.laws.values()) == ['1', '2', '3', '4']
+
+
+def test_snapshot_from_other_signature_parameters_is_ignored(tmp_path):
+    path = str(tmp_path / 'snapshot.sqlite3')
+    snapshot = DuplicateSnapshot(path, 'bands=16')
+    snapshot.save(SnapshotWatermark(max_id=1), [(1, '1', 'hash', None)])
+    snapshot.close()
+    
+    assert DuplicateSnapshot(path, 'bands=16').load()[0] == SnapshotWatermark(max_id=1)
+    assert DuplicateSnapshot(path, 'bands=32').load() is None
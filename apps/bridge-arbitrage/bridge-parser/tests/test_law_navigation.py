@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+import enhanced_bridge_parser
+from enhanced_bridge_parser import DatabaseManager, ParsedLaw
+from law_navigation_system import LawSearchEngine, LawNavigationAPI
+from local_store import create_storage_client
+
+
+def make_law(law_number, content):
+    return ParsedLaw(law_number=law_number, title=f'Loi {law_number}', content=content, category='general',
+                     subcategory=None, source_file='a.pdf', page_number=1, references=[],
+                     char_count=len(content), created_at=datetime.now())
+
+
+def test_navigation_queries_run_without_a_rate_limiter(tmp_path):
+    db_manager = DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key')
+    db_manager.limiter = None
+    law_id = db_manager.insert_laws([make_law('12', "L'entame est faite face cachée par le joueur.")]).law_ids[0]
+    
+    search = LawSearchEngine(db_manager)
+    assert [law['law_number'] for law in search.search_laws('entame')] == ['12']
+    assert [law['law_number'] for law in search.get_law_suggestions('1')] == ['12']
+    assert LawNavigationAPI(db_manager).navigate_to_law('session', law_id)['law']['law_number'] == '12'
+    assert db_manager.metrics.counters['http_requests'] >= 4
+
+
+class UndefinedColumn(Exception):
+    code = '42703'
+
+
+class LegacyQuery:
+    # code_laws as it was before the deleted_at/updated_at migrations
+    def __init__(self, query):
+        self.query = query
+        self.error = None
+    
+    def select(self, columns, **kwargs):
+        return self._check(columns).chain('select', columns, **kwargs)
+    
+    def is_(self, column, value):
+        return self._check(column).chain('is_', column, value)
+    
+    def chain(self, name, *args, **kwargs):
+        self.query = getattr(self.query, name)(*args, **kwargs)
+        return self
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.chain(name, *args, **kwargs)
+    
+    def execute(self):
+        if self.error:
+            raise UndefinedColumn(self.error)
+        return self.query.execute()
+    
+    def _check(self, columns):
+        if 'deleted_at' in columns or 'updated_at' in columns:
+            self.error = f'column code_laws.{columns} does not exist'
+        return self
+
+
+class LegacyClient:
+    def __init__(self, client):
+        self.client = client
+    
+    def table(self, name):
+        return LegacyQuery(self.client.table(name))
+
+
+def test_queries_skip_soft_delete_filters_on_a_legacy_schema(tmp_path, monkeypatch):
+    monkeypatch.setattr(enhanced_bridge_parser, 'create_storage_client',
+                        lambda url, key: LegacyClient(create_storage_client(url, key)))
+    db_manager = DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key')
+    db_manager.insert_laws([make_law('7', 'Le mort étale ses cartes après l\'entame.')])
+    
+    assert db_manager.legacy_schema
+    assert db_manager.get_law_by_number('7')['law_number'] == '7'
+    assert [law['law_number'] for law in LawSearchEngine(db_manager).search_laws('mort')] == ['7']
+    with pytest.raises(RuntimeError):
+        db_manager.begin_sync(['a.pdf'])
@@ -0,0 +1,13 @@
+from enhanced_bridge_parser import LawParser
+
+
+def test_mid_line_article_reference_does_not_split():
+    text = ("Article 4: Le déclarant joue les cartes du mort.\n"
+            "Il respecte l'Article 5: ce qui suit reste dans l'article 4.\n"
+            "Article 6 - Le mort ne participe pas au jeu.\n")
+    
+    segments = LawParser()._segment_text(text)
+    
+    assert [law_number for law_number, _ in segments] == ['4', '6']
+    assert "l'Article 5: ce qui suit" in segments[0][1]
+
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from enhanced_bridge_parser import DatabaseManager, EnhancedBridgePDFParser, PageSelection, ParsedLaw
+
+
+def make_law(law_number, content, source_file='a.pdf'):
+    return ParsedLaw(law_number=law_number, title=f'Loi {law_number}', content=content, category='general',
+                     subcategory=None, source_file=source_file, page_number=1, references=[],
+                     char_count=len(content), created_at=datetime.now())
+
+
+def live_laws(db_manager, source_file):
+    rows = db_manager.client.table('code_laws').select('law_number').eq('source_file', source_file) \
+        .is_('deleted_at', 'null').execute().data
+    return sorted(row['law_number'] for row in rows)
+
+
+def test_sync_inserts_updates_and_soft_deletes(tmp_path):
+    db_manager = DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key')
+    laws = [make_law(str(number), f'Texte initial de la loi {number}.') for number in range(1, 5)]
+    session = db_manager.begin_sync(['a.pdf'])
+    session.apply(laws)
+    assert session.finish(['a.pdf']).inserted == 4
+    
+    session = db_manager.begin_sync(['a.pdf'])
+    session.apply([laws[0], make_law('2', 'Texte révisé de la loi 2.'), laws[2], make_law('5', 'Nouvelle loi 5.')])
+    report = session.finish(['a.pdf'])
+    
+    assert report.counts() == {'inserted': 1, 'updated': 1, 'unchanged': 2, 'soft_deleted': 1}
+    assert live_laws(db_manager, 'a.pdf') == ['1', '2', '3', '5']
+
+
+def test_failed_file_keeps_its_rows_without_shielding_similar_names(tmp_path):
+    url = f"local://{tmp_path / 'store.sqlite'}"
+    parser = EnhancedBridgePDFParser(url, 'key', write_mode='upsert')
+    session = parser.db_manager.begin_sync(['a.pdf', 'ba.pdf'])
+    session.apply([make_law('1', 'Loi 1 du fichier a.'), make_law('2', 'Loi 2 du fichier a.'),
+                   make_law('1', 'Loi 1 du fichier ba.', 'ba.pdf'), make_law('2', 'Loi 2 du fichier ba.', 'ba.pdf')])
+    session.finish(['a.pdf', 'ba.pdf'])
+    
+    # Second run: law 2 is gone from both files, but ba.pdf failed to parse
+    parser._sync = parser.db_manager.begin_sync(['a.pdf', 'ba.pdf'])
+    parser._sync.apply([make_law('1', 'Loi 1 du fichier a.'), make_law('1', 'Loi 1 du fichier ba.', 'ba.pdf')])
+    parser.stats.errors.append('Error processing ba.pdf: truncated file')
+    parser.stats.failed_files.add('ba.pdf')
+    parser._finish_sync(['a.pdf', 'ba.pdf'], PageSelection())
+    
+    assert parser.stats.sync['soft_deleted'] == 1
+    assert live_laws(parser.db_manager, 'a.pdf') == ['1']
+    assert live_laws(parser.db_manager, 'ba.pdf') == ['1', '2']
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+from enhanced_bridge_parser import DatabaseManager, LawReference, ParsedLaw
+from law_tables import clear_law_tables
+
+
+def make_law(law_number):
+    content = f'Texte de la loi {law_number}, voir la loi 1.'
+    return ParsedLaw(law_number=law_number, title=f'Loi {law_number}', content=content, category='general',
+                     subcategory=None, source_file='a.pdf', page_number=1,
+                     references=[LawReference(law_number, '1', None, content, 0)],
+                     char_count=len(content), created_at=datetime.now())
+
+
+class NoRpcClient:
+    # A project where the clear_law_tables migration was never applied
+    def __init__(self, client):
+        self.client = client
+        self.deletes = []
+    
+    def rpc(self, name, params=None):
+        raise RuntimeError(f'Could not find the function public.{name}')
+    
+    def table(self, name):
+        query = self.client.table(name)
+        delete = query.delete
+        
+        def recorded_delete(**kwargs):
+            self.deletes.append((name, kwargs))
+            return delete(**kwargs)
+        
+        query.delete = recorded_delete
+        return query
+
+
+def count_rows(db_manager, table):
+    return db_manager.client.table(table).select('id', count='exact').execute().count
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_manager = DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key')
+    db_manager.insert_laws([make_law(str(number)) for number in range(1, 4)])
+    return db_manager
+
+
+def test_clear_tables_returns_counts_only(db_manager):
+    assert db_manager.clear_tables(['code_laws', 'law_references']) == {'law_references': 3, 'code_laws': 3}
+    assert count_rows(db_manager, 'code_laws') == count_rows(db_manager, 'law_references') == 0
+
+
+def test_fallback_deletes_children_first_without_returning_rows(db_manager):
+    client = NoRpcClient(db_manager.client)
+    
+    assert clear_law_tables(client, ['code_laws', 'law_references']) == {'law_references': 3, 'code_laws': 3}
+    assert client.deletes == [('law_references', {'count': 'exact', 'returning': 'minimal'}),
+                              ('code_laws', {'count': 'exact', 'returning': 'minimal'})]
+
+
+def test_unknown_tables_are_refused(db_manager):
+    with pytest.raises(ValueError):
+        clear_law_tables(db_manager.client, ['code_laws', 'users'])
+    assert count_rows(db_manager, 'code_laws') == 3
@@ -0,0 +1,65 @@
+import pytest
+
+from local_store import LocalStoreClient, LocalStoreError, create_storage_client
+
+
+@pytest.fixture
+def client():
+    client = LocalStoreClient()
+    client.table('code_laws').insert([
+        {'law_number': '12', 'title': 'Entame', 'char_count': 120},
+        {'law_number': '16', 'title': 'Information non autorisée', 'char_count': 900},
+        {'law_number': '40', 'title': 'Accords de partenaires', 'char_count': 1500, 'deleted_at': '2025-01-07'},
+    ]).execute()
+    return client
+
+
+def numbers(response):
+    return [row['law_number'] for row in response.data]
+
+
+def test_filters_order_and_paging(client):
+    laws = lambda: client.table('code_laws').select('law_number, title')
+    
+    assert numbers(laws().is_('deleted_at', 'null').order('law_number', desc=True).execute()) == ['16', '12']
+    assert numbers(laws().ilike('title', '%ACCORDS%').execute()) == ['40']
+    assert numbers(laws().or_('law_number.eq.12,title.ilike.*accords*').order('id').execute()) == ['12', '40']
+    assert numbers(laws().not_.in_('law_number', ['12', '16']).execute()) == ['40']
+    assert numbers(laws().order('id').range(1, 2).execute()) == ['16', '40']
+    
+    response = client.table('code_laws').select('id', count='exact').gt('char_count', 100).limit(1).execute()
+    assert (len(response.data), response.count) == (1, 3)
+
+
+def test_embedded_resource_with_inner_filter(client):
+    ids = {row['law_number']: row['id'] for row in client.table('code_laws').select('id, law_number').execute().data}
+    client.table('law_references').insert([
+        {'source_law_id': ids['12'], 'target_law_number': '16'},
+        {'source_law_id': ids['40'], 'target_law_number': '16'},
+    ]).execute()
+    
+    response = client.table('law_references').select('source_law_id, code_laws!inner(law_number)') \
+        .eq('target_law_number', '16').is_('code_laws.deleted_at', 'null').execute()
+    
+    assert response.data == [{'source_law_id': ids['12'], 'code_laws': {'law_number': '12'}}]
+
+
+def test_upsert_single_and_schemaless_columns(client):
+    client.table('code_laws').upsert([{'law_number': '12', 'title': 'Entame face cachée', 'content_hash': 'abc'},
+                                      {'law_number': '13', 'title': 'Nombre de cartes'}],
+                                     on_conflict='law_number').execute()
+    
+    row = client.table('code_laws').select('title, content_hash').eq('law_number', '12').single().execute().data
+    assert row == {'title': 'Entame face cachée', 'content_hash': 'abc'}
+    assert client.table('code_laws').select('id', count='exact').execute().count == 4
+    with pytest.raises(LocalStoreError):
+        client.table('code_laws').select('*').gt('char_count', 0).single().execute()
+
+
+def test_local_urls_share_one_store(tmp_path):
+    url = f"local://{tmp_path / 'store.sqlite'}?latency_ms=5"
+    create_storage_client(url, 'key').table('conventions').insert({'name': 'Stayman'}).execute()
+    
+    client = create_storage_client(url, 'key')
+    assert client.table('conventions').select('name').execute().data == [{'name': 'Stayman'}]
+    assert client.get_stats()['requests'] == 2 and client.get_stats()['latency_ms'] == 5
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from enhanced_bridge_parser import DatabaseManager, ParsedLaw
+from near_duplicates import MinHashLSH, jaccard, word_shingles
+from supabase_integration import DuplicateDetector
+
+BASE_TEXT = ' '.join(f'mot{index}' for index in range(60))
+NEAR_TEXT = BASE_TEXT.replace('mot59', 'autre')
+OTHER_TEXT = ' '.join(f'terme{index}' for index in range(60))
+
+
+def make_law(law_number, content):
+    return ParsedLaw(law_number=law_number, title=f'Loi {law_number}', content=content, category='general',
+                     subcategory=None, source_file='a.pdf', page_number=1, references=[],
+                     char_count=len(content), created_at=datetime.now())
+
+
+def test_similar_texts_share_a_band_and_unrelated_ones_do_not():
+    index = MinHashLSH()
+    index.add('base', word_shingles(BASE_TEXT))
+    index.add('other', word_shingles(OTHER_TEXT))
+    
+    candidates = index.candidates(word_shingles(NEAR_TEXT))
+    
+    assert list(candidates) == ['base']
+    assert abs(candidates['base'] - jaccard(word_shingles(BASE_TEXT), word_shingles(NEAR_TEXT))) < 0.15
+
+
+def test_entries_restore_into_another_index_and_can_be_removed():
+    index = MinHashLSH()
+    entry = index.add('base', word_shingles(BASE_TEXT))
+    
+    restored = MinHashLSH()
+    restored.restore('base', entry)
+    assert list(restored.candidates(word_shingles(NEAR_TEXT))) == ['base']
+    
+    restored.remove('base')
+    assert restored.candidates(word_shingles(NEAR_TEXT)) == {} and restored.size == 0
+
+
+def test_detector_confirms_lsh_candidates_with_the_exact_similarity(tmp_path):
+    db_manager = DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key')
+    db_manager.insert_laws([make_law('1', BASE_TEXT), make_law('2', OTHER_TEXT)], with_hash=True)
+    detector = DuplicateDetector(db_manager.client)
+    
+    near = detector.check_duplicate({'law_number': 'X', 'content': NEAR_TEXT, 'title': 'Autre titre'})
+    assert near.is_duplicate and near.existing_data['law_number'] == '1'
+    
+    half = ' '.join(BASE_TEXT.split()[:30] + OTHER_TEXT.split()[:30])
+    assert not detector.check_duplicate({'law_number': 'Y', 'content': half, 'title': 'Autre titre'}).is_duplicate
+
+
+def test_batch_catches_near_duplicates_of_laws_kept_earlier_in_it(tmp_path):
+    detector = DuplicateDetector(DatabaseManager(f"local://{tmp_path / 'store.sqlite'}", 'key').client)
+    
+    results = detector.check_batch([{'law_number': '1', 'content': BASE_TEXT, 'title': 'Premier'},
+                                    {'law_number': '2', 'content': OTHER_TEXT, 'title': 'Second'},
+                                    {'law_number': '3', 'content': NEAR_TEXT, 'title': 'Troisième'}])
+    
+    assert [result.is_duplicate for result in results] == [False, False, True]
+    assert results[2].existing_data['law_number'] == '1'
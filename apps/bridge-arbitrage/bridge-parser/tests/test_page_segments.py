@@ -0,0 +1,35 @@
+from enhanced_bridge_parser import EnhancedBridgePDFParser, LawParser
+
+
+def test_law_carries_over_to_the_next_page():
+    pages = [
+        (1, "Préambule\nArticle 1: Le début du texte de la loi"),
+        (2, "se poursuit sur la page suivante.\nArticle 2: Une autre loi commence ici."),
+    ]
+    
+    segments = list(LawParser().iter_page_segments(pages))
+    
+    assert [(law_number, page_number) for law_number, page_number, _ in segments] == [(None, 1), ('1', 1), ('2', 2)]
+    assert 'Le début du texte de la loi\nse poursuit sur la page suivante.' in segments[1][2]
+    assert 'Article 2' not in segments[1][2]
+
+
+def test_law_spans_a_page_without_heading():
+    pages = [
+        (1, "Article 7: Première partie"),
+        (2, "deuxième partie"),
+        (3, "troisième partie\nArticle 8: Suite"),
+    ]
+    
+    segments = list(LawParser().iter_page_segments(pages))
+    
+    assert [(law_number, page_number) for law_number, page_number, _ in segments] == [(None, 1), ('7', 1), ('8', 3)]
+    assert 'Première partie\ndeuxième partie\ntroisième partie' in segments[1][2]
+
+
+def test_parsed_pdf_keeps_the_carried_over_text(pdf_directory):
+    laws = EnhancedBridgePDFParser().parse_pdf_file(str(pdf_directory / 'reglement.pdf'))
+    
+    assert [(law.law_number, law.page_number) for law in laws] == [('1', 1), ('2', 1), ('3', 2)]
+    assert 'arbitre adjoint qualifie' in laws[1].content
+    assert 'arbitre adjoint' not in laws[2].content
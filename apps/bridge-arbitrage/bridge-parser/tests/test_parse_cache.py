@@ -0,0 +1,78 @@
+import shutil
+import time
+
+from enhanced_bridge_parser import EnhancedBridgePDFParser
+from parse_cache import ParseCache, PageTextStore
+
+
+def store_document(store, file_sha256, pages):
+    writer = store.open_writer(file_sha256, 'pdfplumber', f'{file_sha256}.pdf', len(pages))
+    for page_number, text in enumerate(pages, 1):
+        writer.add(page_number, text)
+    writer.close()
+
+
+def test_parse_cache_is_keyed_on_content_rules_and_pages(tmp_path, pdf_directory):
+    cache = ParseCache(str(tmp_path / 'cache'))
+    original = str(pdf_directory / 'reglement.pdf')
+    renamed = str(tmp_path / 'copie.pdf')
+    shutil.copy(original, renamed)
+    
+    laws = EnhancedBridgePDFParser(parse_cache=cache).parse_pdf_file(original)
+    cached = EnhancedBridgePDFParser(parse_cache=cache).parse_pdf_file(renamed)
+    
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert [(law.law_number, law.content) for law in cached] == [(law.law_number, law.content) for law in laws]
+    
+    EnhancedBridgePDFParser(parse_cache=cache).parse_pdf_file(original, pages='1')
+    parser = EnhancedBridgePDFParser(parse_cache=cache)
+    parser.law_parser.category_keywords = {'arbitrage': ['arbitre']}
+    parser.parse_pdf_file(original)
+    
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_parse_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ParseCache(str(tmp_path), max_bytes=10 ** 9)
+    records = [{'law_number': str(number), 'content': f'Texte {number} ' * 50} for number in range(20)]
+    cache.put('old', 'key', 'old.pdf', 1, records)
+    cache.put('new', 'key', 'new.pdf', 1, records)
+    
+    cache.max_bytes = cache.get_stats()['bytes'] - 1
+    cache.put('new', 'key', 'new.pdf', 1, records)
+    
+    assert not cache.contains('old', 'key')
+    assert cache.contains('new', 'key')
+
+
+def test_page_store_evicts_by_size_after_each_write(tmp_path):
+    store = PageTextStore(str(tmp_path), max_bytes=2500)
+    store_document(store, 'first', ['a' * 1000])
+    time.sleep(0.01)
+    store_document(store, 'second', ['b' * 1000])
+    time.sleep(0.01)
+    store_document(store, 'third', ['c' * 1000])
+    
+    assert [document['file_sha256'] for document in store.iter_documents()] == ['second', 'third']
+    assert store.get_stats()['bytes'] == 2000
+
+
+def test_page_store_evicts_by_age(tmp_path):
+    store = PageTextStore(str(tmp_path), max_age_days=1)
+    store_document(store, 'stale', ['a' * 100])
+    store.connection.execute("UPDATE page_documents SET last_used = ?", (time.time() - 2 * 86400,))
+    
+    store_document(store, 'fresh', ['b' * 100])
+    
+    assert [document['file_sha256'] for document in store.iter_documents()] == ['fresh']
+
+
+def test_page_store_never_evicts_a_document_being_written(tmp_path):
+    store = PageTextStore(str(tmp_path), max_bytes=50)
+    writer = store.open_writer('open', 'pdfplumber', 'open.pdf', 1)
+    writer.add(1, 'x' * 100)
+    
+    store_document(store, 'other', ['y' * 100])
+    
+    assert [document['file_sha256'] for document in store.iter_documents()] == ['open']
+    writer.close()
@@ -0,0 +1,38 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from enhanced_bridge_parser import EnhancedBridgePDFParser, LawParser, ParserConfig, PageSelection, _parse_shard_in_worker
+
+
+class ArticleOnlyParser(LawParser):
+    def __init__(self):
+        super().__init__()
+        self.law_patterns = [r'Article\s*(\d+)']
+
+
+class SameRulesParser(ArticleOnlyParser):
+    def build_law(self, law_number, content, source_file, page_number):
+        return None
+
+
+def test_worker_processes_parse_with_the_planning_parser_rules(pdf_directory):
+    parser = EnhancedBridgePDFParser(backend='pdfplumber')
+    parser.law_parser = ArticleOnlyParser()
+    parser.law_parser.category_keywords = {'arbitrage': ['arbitre']}
+    shards = parser.plan_shards([str(pdf_directory / 'reglement.pdf')], PageSelection())
+    
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        results = list(executor.map(_parse_shard_in_worker, shards))
+    
+    # The last law of a shard stays open, for the next shard or the parent to close
+    laws = [law for result in results for law in result.laws]
+    assert [law.law_number for law in laws] == ['1', '2']
+    assert [law.category for law in laws] == ['general', 'arbitrage']
+    assert results[-1].open_segment[0] == '3'
+
+
+def test_worker_parser_cache_tells_subclasses_apart():
+    first, second = ArticleOnlyParser(), SameRulesParser()
+    
+    assert first.fingerprint() == second.fingerprint()
+    assert ParserConfig('auto', first).key() != ParserConfig('auto', second).key()
+    assert ParserConfig('auto', first).key() == ParserConfig('auto', ArticleOnlyParser()).key()
@@ -0,0 +1,45 @@
+from enhanced_bridge_parser import PageSelection
+from pdf_backends import BACKEND_CLASSES, AdaptiveExtractor, BackendSample, PyPDF2Backend, choose_backend, sample_page_numbers
+
+
+class BlankSecondPageBackend(PyPDF2Backend):
+    name = 'blank'
+    
+    def extract(self, page_num: int) -> str:
+        return '' if page_num == 2 else super().extract(page_num)
+
+
+def test_fastest_backend_with_acceptable_text_wins():
+    samples = {
+        'fast': BackendSample('fast', pages=4, seconds=0.1, chars=4000),
+        'slow': BackendSample('slow', pages=4, seconds=1.0, chars=4400),
+    }
+    assert choose_backend(samples) == 'fast'
+    
+    samples['fast'].chars = 2000
+    assert choose_backend(samples) == 'slow'
+    
+    samples['fast'].chars, samples['fast'].empty_pages = 4000, 2
+    assert choose_backend(samples) == 'slow'
+
+
+def test_backends_that_failed_on_samples_are_not_chosen():
+    samples = {'broken': BackendSample('broken', pages=4, seconds=0.1, chars=4000, errors=1)}
+    
+    assert choose_backend(samples) is None
+
+
+def test_sample_pages_spread_over_the_document():
+    assert sample_page_numbers(list(range(1, 101)), 4) == [13, 38, 63, 88]
+    assert sample_page_numbers([1, 2], 4) == [1, 2]
+
+
+def test_empty_page_is_retried_with_another_backend(monkeypatch, pdf_directory):
+    monkeypatch.setitem(BACKEND_CLASSES, 'blank', BlankSecondPageBackend)
+    
+    with AdaptiveExtractor(str(pdf_directory / 'reglement.pdf'), ['blank', 'pdfplumber'], preferred='blank') as extractor:
+        pages = dict(extractor.iter_pages(PageSelection()))
+    
+    assert 'Article 3' in pages[2]
+    assert extractor.report.fallback_pages == {'pdfplumber': 1}
+    assert extractor.report.pages == 2
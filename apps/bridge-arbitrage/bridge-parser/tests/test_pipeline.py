@@ -0,0 +1,33 @@
+import pytest
+
+from enhanced_bridge_parser import EnhancedBridgePDFParser, PDF_LIBS
+from parse_cache import ParseCache, PageTextStore
+
+pytestmark = pytest.mark.skipif(not PDF_LIBS, reason='needs a PDF library')
+
+
+def run_pipeline(pdf_directory, cache_dir, page_store=False):
+    parser = EnhancedBridgePDFParser(parse_cache=ParseCache(str(cache_dir)),
+                                     page_store=PageTextStore(str(cache_dir)) if page_store else None)
+    return parser.process_directory(str(pdf_directory), pipeline=True, max_pages=10)
+
+
+@pytest.mark.parametrize('page_store', [False, True])
+def test_pipeline_with_cache(tmp_path, pdf_directory, page_store):
+    cold = run_pipeline(pdf_directory, tmp_path / 'cache', page_store)
+    warm = run_pipeline(pdf_directory, tmp_path / 'cache', page_store)
+    
+    assert cold.errors == [] and warm.errors == []
+    assert cold.total_laws == warm.total_laws == 3
+    assert warm.processed_files == cold.processed_files == 1
+
+
+def test_pipeline_matches_sequential_run(tmp_path, pdf_directory):
+    (pdf_directory / 'broken.pdf').write_bytes(b'not a pdf')
+    
+    sequential = EnhancedBridgePDFParser().process_directory(str(pdf_directory))
+    pipelined = EnhancedBridgePDFParser().process_directory(str(pdf_directory), pipeline=True)
+    
+    assert pipelined.total_laws == sequential.total_laws == 3
+    assert pipelined.processed_files == sequential.processed_files == 1
+    assert pipelined.failed_files == sequential.failed_files == {'broken.pdf'}
@@ -0,0 +1,80 @@
+import pytest
+
+from rate_limiter import AdaptiveRateLimiter, PassThroughLimiter, shared_limiter
+
+
+class Response:
+    data = []
+
+
+class Throttled(Exception):
+    code = 429
+    
+    def __init__(self):
+        super().__init__('Too Many Requests')
+        self.response = type('HTTPResponse', (), {'headers': {'Retry-After': '0'}})()
+
+
+class Query:
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    def execute(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return Response()
+
+
+def test_local_stores_are_not_paced():
+    assert isinstance(shared_limiter('local:///tmp/store.sqlite'), PassThroughLimiter)
+    assert isinstance(shared_limiter('https://example.supabase.co'), AdaptiveRateLimiter)
+    assert shared_limiter('https://example.supabase.co') is shared_limiter('https://example.supabase.co')
+
+
+def test_fast_window_increases_rate_and_concurrency():
+    limiter = AdaptiveRateLimiter(rate=100.0, concurrency=2)
+    
+    for _ in range(2):
+        limiter.execute(Query())
+    
+    stats = limiter.get_stats()
+    assert stats['concurrency_limit'] == 3
+    assert stats['rate_per_second'] == 102.0
+
+
+def test_slow_window_decreases_concurrency():
+    limiter = AdaptiveRateLimiter(rate=100.0, concurrency=4, latency_target=-1.0)
+    
+    for _ in range(4):
+        limiter.execute(Query())
+    
+    assert limiter.get_stats()['concurrency_limit'] == 3
+    assert limiter.get_stats()['recent_backoffs'][-1]['reason'] == 'slow'
+
+
+def test_throttled_request_halves_limits_and_is_retried():
+    limiter = AdaptiveRateLimiter(rate=100.0, concurrency=4)
+    query = Query(Throttled())
+    
+    limiter.execute(query)
+    
+    stats = limiter.get_stats()
+    assert query.calls == 2
+    assert stats['throttled'] == 1 and stats['retries'] == 1
+    assert stats['concurrency_limit'] == 2
+    assert stats['rate_per_second'] == 50.0
+    assert stats['in_flight'] == 0
+
+
+def test_client_errors_are_raised_without_retry():
+    limiter = AdaptiveRateLimiter(rate=100.0)
+    query = Query(ValueError('bad filter'))
+    
+    with pytest.raises(ValueError):
+        limiter.execute(query)
+    
+    assert query.calls == 1
+    assert limiter.get_stats()['in_flight'] == 0
+    assert limiter.get_stats()['backoff_events'] == 0
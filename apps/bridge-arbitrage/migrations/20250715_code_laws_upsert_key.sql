@@ -0,0 +1,16 @@
+-- Natural key and soft delete for idempotent (upsert) ingest of code_laws
+ALTER TABLE code_laws
+ADD COLUMN IF NOT EXISTS content_hash TEXT NULL,
+ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE NULL;
+
+-- One live row per law number, source file and content
+CREATE UNIQUE INDEX IF NOT EXISTS idx_code_laws_natural_key
+ON code_laws(source_file, law_number, content_hash)
+WHERE deleted_at IS NULL;
+
+-- Readers only look at live rows
+CREATE INDEX IF NOT EXISTS idx_code_laws_live ON code_laws(law_number) WHERE deleted_at IS NULL;
+
+-- View for clients that cannot add the deleted_at filter themselves
+CREATE OR REPLACE VIEW live_code_laws AS
+SELECT * FROM code_laws WHERE deleted_at IS NULL;
@@ -0,0 +1,25 @@
+-- Server-side clear of the parser tables: one transaction, only counts go back to the client
+CREATE OR REPLACE FUNCTION clear_law_tables(table_names TEXT[])
+RETURNS JSONB AS $$
+DECLARE
+    -- Children before parents so foreign keys never block a delete
+    clear_order CONSTANT TEXT[] := ARRAY['law_references', 'code_laws', 'rnc_articles', 'conventions'];
+    table_name TEXT;
+    deleted BIGINT;
+    counts JSONB := '{}'::JSONB;
+BEGIN
+    IF NOT table_names <@ clear_order THEN
+        RAISE EXCEPTION 'clear_law_tables: unsupported table in %', table_names;
+    END IF;
+
+    FOREACH table_name IN ARRAY clear_order LOOP
+        IF table_name = ANY(table_names) THEN
+            EXECUTE format('DELETE FROM %I', table_name);
+            GET DIAGNOSTICS deleted = ROW_COUNT;
+            counts := counts || jsonb_build_object(table_name, deleted);
+        END IF;
+    END LOOP;
+
+    RETURN counts;
+END;
+$$ language 'plpgsql';
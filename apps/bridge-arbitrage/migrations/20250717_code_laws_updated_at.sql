@@ -0,0 +1,22 @@
+-- updated_at follows every change to code_laws: the parser's duplicate snapshot
+-- only reads the rows changed since its last run (updated_at > watermark)
+ALTER TABLE code_laws
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- Also fires for upserts (INSERT ... ON CONFLICT DO UPDATE) and soft deletes
+DROP TRIGGER IF EXISTS update_code_laws_updated_at ON code_laws;
+CREATE TRIGGER update_code_laws_updated_at
+    BEFORE UPDATE ON code_laws
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Delta query of the duplicate snapshot
+CREATE INDEX IF NOT EXISTS idx_code_laws_updated_at ON code_laws(updated_at);